@@ -59,6 +59,11 @@ from .stage_instance import *
 from .interactions import *
 from .components import *
 from .threads import *
+from .ratelimits import *
+from .metrics import *
+from .cache import *
+from .pool import *
+from .retry import *
 
 
 class VersionInfo(NamedTuple):
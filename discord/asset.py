@@ -26,7 +26,7 @@ from __future__ import annotations
 
 import io
 import os
-from typing import Any, Literal, Optional, TYPE_CHECKING, Tuple, Union
+from typing import Any, AsyncIterator, Literal, Optional, TYPE_CHECKING, Tuple, Union
 from .errors import DiscordException
 from .errors import InvalidArgument
 from . import utils
@@ -74,11 +74,59 @@ class AssetMixin:
 
         return await self._state.http.get_from_cdn(self.url)
 
-    async def save(self, fp: Union[str, bytes, os.PathLike, io.BufferedIOBase], *, seek_begin: bool = True) -> int:
+    async def iter_chunks(self, *, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+        """Retrieves the content of this asset in chunks, without holding all of it in memory.
+
+        The download starts when the iterator is first advanced.
+
+        .. versionadded:: 2.0
+
+        Examples
+        ---------
+
+        Usage ::
+
+            async for chunk in asset.iter_chunks():
+                hasher.update(chunk)
+
+        Parameters
+        -----------
+        chunk_size: :class:`int`
+            The maximum number of bytes in each chunk.
+
+        Raises
+        ------
+        DiscordException
+            There was no internal connection state.
+        HTTPException
+            Downloading the asset failed.
+        NotFound
+            The asset was deleted.
+
+        Yields
+        -------
+        :class:`bytes`
+            A chunk of the content of the asset.
+        """
+        if self._state is None:
+            raise DiscordException("Invalid state (no ConnectionState provided)")
+
+        async for chunk in self._state.http.stream_from_cdn(self.url, chunk_size=chunk_size):
+            yield chunk
+
+    async def save(
+        self,
+        fp: Union[str, bytes, os.PathLike, io.BufferedIOBase],
+        *,
+        seek_begin: bool = True,
+        chunk_size: int = 65536,
+    ) -> int:
         """|coro|
 
         Saves this asset into a file-like object.
 
+        The asset is written as it is downloaded, so it is never held in memory as a whole.
+
         Parameters
         ----------
         fp: Union[:class:`io.BufferedIOBase`, :class:`os.PathLike`]
@@ -88,6 +136,10 @@ class AssetMixin:
         seek_begin: :class:`bool`
             Whether to seek to the beginning of the file after saving is
             successfully done.
+        chunk_size: :class:`int`
+            The maximum number of bytes downloaded before being written.
+
+            .. versionadded:: 2.0
 
         Raises
         ------
@@ -104,15 +156,7 @@ class AssetMixin:
             The number of bytes written.
         """
 
-        data = await self.read()
-        if isinstance(fp, io.BufferedIOBase):
-            written = fp.write(data)
-            if seek_begin:
-                fp.seek(0)
-            return written
-        else:
-            with open(fp, "wb") as f:
-                return f.write(data)
+        return await utils._save_chunks(self.iter_chunks(chunk_size=chunk_size), fp, seek_begin=seek_begin)
 
 
 class Asset(AssetMixin):
@@ -0,0 +1,657 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import itertools
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generic, Iterable, Iterator, Optional, Tuple, TypeVar
+
+from . import utils
+
+if TYPE_CHECKING:
+    from .message import Message
+    from .state import ConnectionState
+
+__all__ = (
+    "MessageCache",
+    "CacheStore",
+    "MemoryStore",
+    "DisabledStore",
+    "LRUStore",
+    "SQLiteStore",
+    "TieredStore",
+)
+
+V = TypeVar("V")
+
+
+class MessageCache:
+    """A bounded cache of messages indexed by their ID.
+
+    Messages are kept in the order they were added, and the oldest one is evicted
+    once the cache holds ``maxlen`` messages. Looking up, adding, removing and evicting
+    a message all take constant time.
+
+    Optional quotas limit how many of these messages a single channel or guild can
+    take up, so that a busy channel only evicts its own older messages, and messages
+    older than an age limit are evicted as well.
+
+    .. versionadded:: 2.0
+    """
+
+    __slots__ = ("maxlen", "max_per_channel", "max_per_guild", "max_age", "_messages", "_channels", "_guilds")
+
+    def __init__(
+        self,
+        maxlen: int,
+        *,
+        max_per_channel: Optional[int] = None,
+        max_per_guild: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ) -> None:
+        self.maxlen: int = maxlen
+        self.max_per_channel: Optional[int] = max_per_channel
+        self.max_per_guild: Optional[int] = max_per_guild
+        self.max_age: Optional[float] = max_age
+        # an OrderedDict, unlike a dict, evicts its oldest item in constant time
+        self._messages: OrderedDict[int, Message] = OrderedDict()
+        # the same messages grouped by channel and guild ID, only kept when there is a quota
+        self._channels: Dict[int, OrderedDict[int, Message]] = {}
+        self._guilds: Dict[int, OrderedDict[int, Message]] = {}
+
+    def __repr__(self) -> str:
+        return f"<MessageCache maxlen={self.maxlen} len={len(self._messages)}>"
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __iter__(self) -> Iterator[Message]:
+        return iter(self._messages.values())
+
+    def __reversed__(self) -> Iterator[Message]:
+        return reversed(self._messages.values())
+
+    def __contains__(self, message: Message) -> bool:
+        return self._messages.get(message.id) is message
+
+    def get(self, message_id: Optional[int]) -> Optional[Message]:
+        if self.max_age is not None:
+            self._expire()
+        return self._messages.get(message_id)  # type: ignore
+
+    def append(self, message: Message) -> None:
+        messages = self._messages
+        # a message added again, e.g. when events are replayed, becomes the newest
+        if message.id in messages:
+            self._discard(messages[message.id])
+        messages[message.id] = message
+
+        if self.max_per_channel is not None:
+            self._add_to_group(self._channels, message.channel.id, message, self.max_per_channel)
+        if self.max_per_guild is not None and message.guild is not None:
+            self._add_to_group(self._guilds, message.guild.id, message, self.max_per_guild)
+
+        if len(messages) > self.maxlen:
+            self._discard(next(iter(messages.values())))
+        if self.max_age is not None:
+            self._expire()
+
+    def extend(self, messages: Iterable[Message]) -> None:
+        for message in messages:
+            self.append(message)
+
+    def remove(self, message: Message) -> None:
+        if self._messages.get(message.id) is None:
+            raise ValueError(f"Message ID {message.id} is not cached")
+        self._discard(message)
+
+    def pop(self, message_id: int) -> Optional[Message]:
+        message = self._messages.get(message_id)
+        if message is not None:
+            self._discard(message)
+        return message
+
+    def remove_guild(self, guild_id: int) -> None:
+        """Removes every message sent in a guild."""
+        group = self._guilds.get(guild_id)
+        candidates = list(group.values()) if group is not None else list(self._messages.values())
+        for message in candidates:
+            if message.guild is not None and message.guild.id == guild_id:
+                self._discard(message)
+
+    def clear(self) -> None:
+        self._messages.clear()
+        self._channels.clear()
+        self._guilds.clear()
+
+    def _add_to_group(
+        self, groups: Dict[int, OrderedDict[int, Message]], key: int, message: Message, limit: int
+    ) -> None:
+        try:
+            group = groups[key]
+        except KeyError:
+            group = groups[key] = OrderedDict()
+        group[message.id] = message
+        if len(group) > limit:
+            self._discard(next(iter(group.values())))
+
+    def _discard(self, message: Message) -> None:
+        message_id = message.id
+        del self._messages[message_id]
+        if self.max_per_channel is not None:
+            self._discard_from_group(self._channels, message.channel.id, message_id)
+        if self.max_per_guild is not None and message.guild is not None:
+            self._discard_from_group(self._guilds, message.guild.id, message_id)
+
+    def _discard_from_group(self, groups: Dict[int, OrderedDict[int, Message]], key: int, message_id: int) -> None:
+        group = groups.get(key)
+        if group is not None:
+            group.pop(message_id, None)
+            if not group:
+                del groups[key]
+
+    def _expire(self) -> None:
+        # snowflakes start with their creation time, so the oldest messages are compared without a datetime
+        cutoff = int((time.time() - self.max_age) * 1000 - utils.DISCORD_EPOCH) << 22  # type: ignore
+        messages = self._messages
+        while messages:
+            message = next(iter(messages.values()))
+            if message.id >= cutoff:
+                break
+            self._discard(message)
+
+
+class CacheStore(MutableMapping, Generic[V]):
+    """The interface of the mappings the library caches Discord models in, keyed by their ID.
+
+    The caches of :class:`Client` use :class:`MemoryStore` by default. A different
+    store can be used for each kind of model through the ``cache_stores`` option
+    of :class:`Client`, for example to bound the number of users kept in memory,
+    or to move the members of large guilds out of the Python heap.
+
+    Subclasses implement :meth:`__getitem__`, :meth:`__setitem__`, :meth:`__delitem__`,
+    :meth:`__iter__` and :meth:`__len__` like a :class:`dict` would. Every other
+    mapping method is derived from them.
+
+    .. versionadded:: 2.0
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: int) -> V:
+        raise NotImplementedError
+
+    def __setitem__(self, key: int, value: V) -> None:
+        raise NotImplementedError
+
+    def __delitem__(self, key: int) -> None:
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[int]:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # stores are saved as plain mappings, the connection state sets up its own stores when loading them
+        return (MemoryStore, (dict(self.items()),))
+
+    def _bind(self, state: ConnectionState) -> None:
+        # called by the connection state once it creates the store
+        pass
+
+    def _release(self, key: int) -> None:
+        # called by the connection state once no member refers to the user with this ID anymore
+        pass
+
+
+class MemoryStore(dict, CacheStore[V]):
+    """A :class:`CacheStore` that keeps every model in memory, with no limit.
+
+    This is a :class:`dict` and is as fast as one. It is the default store of every cache.
+
+    .. versionadded:: 2.0
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (MemoryStore, (dict(self),))
+
+
+class DisabledStore(CacheStore[V]):
+    """A :class:`CacheStore` that never keeps anything.
+
+    Models are still created when Discord sends them, but getting them from
+    the cache afterwards, e.g. through :meth:`Client.get_user`, returns ``None``.
+
+    .. versionadded:: 2.0
+    """
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<DisabledStore>"
+
+    def __getitem__(self, key: int) -> V:
+        raise KeyError(key)
+
+    def __setitem__(self, key: int, value: V) -> None:
+        pass
+
+    def __delitem__(self, key: int) -> None:
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(())
+
+    def __len__(self) -> int:
+        return 0
+
+
+class LRUStore(CacheStore[V]):
+    """A :class:`CacheStore` that keeps up to a number of models in memory,
+    evicting the least recently used one once it's full.
+
+    Getting or storing a model marks it as recently used. Iterating over the
+    store doesn't.
+
+    With ``pin_referenced``, which is meant for the ``'users'`` cache, users that
+    a member refers to, such as those of cached members or the authors of cached
+    guild messages, are pinned instead of being evicted and don't count towards
+    ``max_size``. They are evicted once the last of these members is gone.
+    This keeps a single object per user, as evicting a user still in use means
+    another copy of it gets created the next time it's seen.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    max_size: :class:`int`
+        The maximum number of models to keep, not counting pinned ones.
+    pin_referenced: :class:`bool`
+        Whether to pin the users that members refer to. Defaults to ``False``.
+
+    Attributes
+    -----------
+    max_size: :class:`int`
+        The maximum number of models to keep, not counting pinned ones.
+    hits: :class:`int`
+        The number of lookups that found a model.
+    misses: :class:`int`
+        The number of lookups that didn't find a model.
+    evicted: :class:`int`
+        The total number of models that have been evicted.
+    """
+
+    __slots__ = ("max_size", "hits", "misses", "evicted", "_data", "_pinned", "_pin_referenced", "_refs")
+
+    def __init__(self, max_size: int, *, pin_referenced: bool = False) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than 0")
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evicted: int = 0
+        self._data: OrderedDict[int, V] = OrderedDict()
+        self._pinned: Dict[int, V] = {}
+        self._pin_referenced: bool = pin_referenced
+        # the number of members referring to each user, shared with the connection state once bound
+        self._refs: Dict[int, int] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} size={len(self)} max_size={self.max_size} pinned={len(self._pinned)}"
+            f" hits={self.hits} misses={self.misses} evicted={self.evicted}>"
+        )
+
+    @property
+    def pinned(self) -> int:
+        """:class:`int`: The number of models currently pinned."""
+        return len(self._pinned)
+
+    @property
+    def hit_ratio(self) -> float:
+        """:class:`float`: The ratio of lookups that found a model, between ``0`` and ``1``."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __getitem__(self, key: int) -> V:
+        try:
+            value = self._data[key]
+        except KeyError:
+            try:
+                value = self._pinned[key]
+            except KeyError:
+                self.misses += 1
+                raise KeyError(key) from None
+        else:
+            self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key: int, value: V) -> None:
+        data = self._data
+        if self._pinned:
+            self._pinned.pop(key, None)
+        data[key] = value
+        data.move_to_end(key)
+        if len(data) > self.max_size:
+            self._shrink()
+
+    def __delitem__(self, key: int) -> None:
+        try:
+            del self._data[key]
+        except KeyError:
+            del self._pinned[key]
+
+    def __iter__(self) -> Iterator[int]:
+        if self._pinned:
+            return itertools.chain(list(self._pinned), list(self._data))
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data) + len(self._pinned)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._data or key in self._pinned
+
+    def get(self, key: int, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key: int, default: Any = utils.MISSING) -> Any:
+        # unlike a lookup, this isn't counted as a hit or a miss
+        try:
+            return self._data.pop(key)
+        except KeyError:
+            pass
+        try:
+            return self._pinned.pop(key)
+        except KeyError:
+            if default is utils.MISSING:
+                raise
+            return default
+
+    # the views of the mixin look every value up, which would reorder the store while iterating over it
+    def keys(self):
+        if self._pinned:
+            return list(self)
+        return self._data.keys()
+
+    def values(self):
+        if self._pinned:
+            return list(itertools.chain(self._pinned.values(), self._data.values()))
+        return self._data.values()
+
+    def items(self):
+        if self._pinned:
+            return list(itertools.chain(self._pinned.items(), self._data.items()))
+        return self._data.items()
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._pinned.clear()
+
+    def _bind(self, state: ConnectionState) -> None:
+        if self._pin_referenced:
+            self._refs = state._track_user_refs()
+
+    def _release(self, key: int) -> None:
+        try:
+            value = self._pinned.pop(key)
+        except KeyError:
+            return
+        # back to the least recently used end, where it's the next one to be evicted once full
+        data = self._data
+        data[key] = value
+        data.move_to_end(key, last=False)
+        if len(data) > self.max_size:
+            self._shrink()
+
+    def _shrink(self) -> None:
+        data = self._data
+        refs = self._refs
+        while len(data) > self.max_size:
+            key, value = data.popitem(last=False)
+            if key in refs:
+                self._pinned[key] = value
+                continue
+            self.evicted += 1
+            self._evict(key, value)
+
+    def _evict(self, key: int, value: V) -> None:
+        # an evicted user might outlive its eviction, it mustn't remove a newer copy of itself when collected
+        if getattr(value, "_stored", False):
+            value._stored = False  # type: ignore
+
+
+class SQLiteStore(CacheStore[V]):
+    """A :class:`CacheStore` that keeps models in an SQLite database instead of the Python heap.
+
+    Models are pickled when stored and unpickled whenever they're looked up,
+    so each lookup returns a new object. References to other cached models, such as
+    the guild of a member or the user it wraps, are stored as IDs and resolved
+    again when unpickling. Changing a model after storing it doesn't change the
+    stored copy, which is why this store is meant to be used as the ``cold`` store
+    of a :class:`TieredStore` rather than on its own. It suits small models such as
+    members and users, while a guild would be stored along with all of its members.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    connection: Optional[:class:`sqlite3.Connection`]
+        The database to store the models in. It can be shared by the stores of
+        a process, but not between processes. It should be opened in autocommit mode,
+        i.e. with ``isolation_level=None``, as the store doesn't commit its writes.
+        Defaults to a temporary database on disk shared by every store created without
+        a connection, which is deleted when the process exits.
+    """
+
+    __slots__ = ("_connection", "_namespace", "_dumps", "_loads")
+
+    _namespaces = itertools.count()
+    _shared_connection: Optional[sqlite3.Connection] = None
+
+    def __init__(self, connection: Optional[sqlite3.Connection] = None) -> None:
+        if connection is None:
+            connection = SQLiteStore._shared_connection
+            if connection is None:
+                # an empty path is a private database in a temporary file
+                connection = SQLiteStore._shared_connection = sqlite3.connect(
+                    "", isolation_level=None, check_same_thread=False
+                )
+        self._connection: sqlite3.Connection = connection
+        self._namespace: int = next(self._namespaces)
+        self._dumps: Callable[[Any], bytes] = pickle.dumps
+        self._loads: Callable[[bytes], Any] = pickle.loads
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS discord_cache "
+            "(namespace INTEGER, id INTEGER, value BLOB, PRIMARY KEY (namespace, id)) WITHOUT ROWID"
+        )
+        # rows left behind by a previous process are outdated
+        self.clear()
+
+    def __repr__(self) -> str:
+        return f"<SQLiteStore namespace={self._namespace} size={len(self)}>"
+
+    def _bind(self, state: ConnectionState) -> None:
+        self._dumps = state._dump_model
+        self._loads = state._load_model
+
+    def __getitem__(self, key: int) -> V:
+        row = self._connection.execute(
+            "SELECT value FROM discord_cache WHERE namespace = ? AND id = ?", (self._namespace, key)
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return self._loads(row[0])
+
+    def __setitem__(self, key: int, value: V) -> None:
+        self._connection.execute(
+            "INSERT OR REPLACE INTO discord_cache VALUES (?, ?, ?)", (self._namespace, key, self._dumps(value))
+        )
+
+    def __delitem__(self, key: int) -> None:
+        cursor = self._connection.execute(
+            "DELETE FROM discord_cache WHERE namespace = ? AND id = ?", (self._namespace, key)
+        )
+        if not cursor.rowcount:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[int]:
+        rows = self._connection.execute("SELECT id FROM discord_cache WHERE namespace = ?", (self._namespace,))
+        return (row[0] for row in rows.fetchall())
+
+    def __len__(self) -> int:
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM discord_cache WHERE namespace = ?", (self._namespace,)
+        ).fetchone()[0]
+
+    def __contains__(self, key: Any) -> bool:
+        return (
+            self._connection.execute(
+                "SELECT 1 FROM discord_cache WHERE namespace = ? AND id = ?", (self._namespace, key)
+            ).fetchone()
+            is not None
+        )
+
+    def values(self):
+        rows = self._connection.execute("SELECT value FROM discord_cache WHERE namespace = ?", (self._namespace,))
+        return [self._loads(row[0]) for row in rows.fetchall()]
+
+    def items(self):
+        rows = self._connection.execute("SELECT id, value FROM discord_cache WHERE namespace = ?", (self._namespace,))
+        return [(row[0], self._loads(row[1])) for row in rows.fetchall()]
+
+    def clear(self) -> None:
+        self._connection.execute("DELETE FROM discord_cache WHERE namespace = ?", (self._namespace,))
+
+    def __del__(self) -> None:
+        try:
+            self.clear()
+        except Exception:
+            pass
+
+
+class TieredStore(LRUStore[V]):
+    """A :class:`CacheStore` that keeps the most recently used models in memory
+    and moves the others to another store, usually a :class:`SQLiteStore`.
+
+    A model looked up from the ``cold`` store is moved back into memory.
+    This bounds the memory taken up by a large cache, such as the members of
+    a huge guild, while the active part of it stays as fast as a :class:`dict`.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    cold: :class:`CacheStore`
+        The store to move the least recently used models to.
+    max_size: :class:`int`
+        The maximum number of models to keep in memory.
+
+    Attributes
+    -----------
+    cold: :class:`CacheStore`
+        The store the least recently used models are moved to.
+    """
+
+    __slots__ = ("cold",)
+
+    def __init__(self, cold: CacheStore[V], *, max_size: int) -> None:
+        super().__init__(max_size)
+        self.cold: CacheStore[V] = cold
+
+    def _bind(self, state: ConnectionState) -> None:
+        self.cold._bind(state)
+
+    def __getitem__(self, key: int) -> V:
+        try:
+            return super().__getitem__(key)
+        except KeyError:
+            value = self.cold.pop(key)
+            self[key] = value
+            return value
+
+    def __setitem__(self, key: int, value: V) -> None:
+        if key not in self._data:
+            # drop the copy that might have been moved out before, it's outdated now
+            try:
+                del self.cold[key]
+            except KeyError:
+                pass
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: int) -> None:
+        try:
+            del self._data[key]
+        except KeyError:
+            del self.cold[key]
+
+    def __iter__(self) -> Iterator[int]:
+        return itertools.chain(list(self._data), self.cold)
+
+    def pop(self, key: int, default: Any = utils.MISSING) -> Any:
+        try:
+            return self._data.pop(key)
+        except KeyError:
+            pass
+        try:
+            return self.cold.pop(key)
+        except KeyError:
+            if default is utils.MISSING:
+                raise
+            return default
+
+    def __len__(self) -> int:
+        return len(self._data) + len(self.cold)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._data or key in self.cold
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return list(itertools.chain(self._data.values(), self.cold.values()))
+
+    def items(self):
+        return list(itertools.chain(self._data.items(), self.cold.items()))
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.cold.clear()
+
+    def _evict(self, key: int, value: V) -> None:
+        self.cold[key] = value
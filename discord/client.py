@@ -26,6 +26,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
 import signal
 import sys
 import traceback
@@ -38,6 +39,7 @@ from typing import (
     List,
     Optional,
     Sequence,
+    Set,
     TYPE_CHECKING,
     Tuple,
     TypeVar,
@@ -57,11 +59,16 @@ from .enums import ChannelType
 from .mentions import AllowedMentions
 from .errors import *
 from .enums import Status, VoiceRegion
-from .flags import ApplicationFlags, Intents
+from .flags import ApplicationFlags, Intents, _EVENT_INTENTS
 from .gateway import *
 from .activity import ActivityTypes, BaseActivity, create_activity
 from .voice_client import VoiceClient
 from .http import HTTPClient
+from .cache import CacheStore
+from .metrics import GatewayStats, HTTPMetrics
+from .pool import ConnectionPoolConfig, ConnectionPoolStats
+from .ratelimits import RatelimitBackend
+from .retry import RetryPolicy
 from .state import ConnectionState
 from . import utils
 from .utils import MISSING
@@ -139,6 +146,52 @@ class Client:
 
         .. versionchanged:: 1.3
             Allow disabling the message cache and change the default size to ``1000``.
+    max_messages_per_channel: Optional[:class:`int`]
+        The maximum number of messages from a single channel to store in the internal
+        message cache. Once reached, a new message from the channel evicts the channel's
+        oldest message instead of the oldest message of the whole cache, so that a busy
+        channel can't evict the messages of every other channel. Defaults to ``None``,
+        in which case only ``max_messages`` applies.
+
+        .. versionadded:: 2.0
+    max_messages_per_guild: Optional[:class:`int`]
+        The same as ``max_messages_per_channel``, but for the messages of a single guild.
+        Defaults to ``None``.
+
+        .. versionadded:: 2.0
+    max_message_age: Optional[:class:`float`]
+        The number of seconds after which a message, based on its creation time,
+        is evicted from the internal message cache. Defaults to ``None``, which
+        keeps messages regardless of their age.
+
+        .. versionadded:: 2.0
+    cache_stores: Dict[:class:`str`, Callable[[Optional[:class:`int`]], :class:`CacheStore`]]
+        The stores to keep cached models in, instead of a :class:`MemoryStore`,
+        keyed by the name of the cache: ``'users'``, ``'guilds'``, ``'emojis'``, ``'stickers'``,
+        ``'members'`` or ``'channels'``. Each value is called to create a store,
+        with the ID of the guild for ``'members'`` and ``'channels'`` as these are
+        kept per guild, or ``None`` otherwise. For example, to keep only the 10,000
+        most recently used members of each guild in memory and the others on disk: ::
+
+            client = discord.Client(
+                intents=intents,
+                cache_stores={
+                    'members': lambda guild_id: discord.TieredStore(discord.SQLiteStore(), max_size=10000),
+                },
+            )
+
+        The message cache is configured with ``max_messages`` instead.
+
+        .. versionadded:: 2.0
+    max_users: Optional[:class:`int`]
+        The maximum number of users to cache that no member refers to, such as
+        a cached member or the author of a cached guild message. The least recently used
+        of these users are evicted once there are more, see :attr:`user_cache` for statistics.
+        This is a shortcut for an :class:`LRUStore` with ``pin_referenced`` for the
+        ``'users'`` cache, and is ignored if ``cache_stores`` has one. Defaults to ``None``,
+        in which case every user that has been seen is kept.
+
+        .. versionadded:: 2.0
     loop: Optional[:class:`asyncio.AbstractEventLoop`]
         The :class:`asyncio.AbstractEventLoop` to use for asynchronous operations.
         Defaults to ``None``, in which case the default event loop is used via
@@ -199,6 +252,110 @@ class Client:
         sync your system clock to Google's NTP server.
 
         .. versionadded:: 1.3
+    global_rate_limit: Optional[:class:`int`]
+        The maximum number of REST requests per second to send across all routes.
+        Requests exceeding this are delayed before being sent rather than risking a
+        global rate limit from Discord. Bots that have had their global rate limit
+        raised can increase this. Passing ``None`` disables the pre-emptive limit.
+        Defaults to ``50``.
+
+        This is ignored if ``ratelimit_backend`` is given.
+
+        .. versionadded:: 2.0
+    ratelimit_backend: Optional[:class:`RatelimitBackend`]
+        Where to keep the REST rate limit state. Defaults to a :class:`MemoryRatelimitBackend`
+        local to this client. Use a :class:`SocketRatelimitBackend` to share rate limits
+        between several processes of the same bot.
+
+        .. versionadded:: 2.0
+    coalesce_requests: :class:`bool`
+        Whether identical ``GET`` requests made while one is already in flight should
+        share its response instead of being sent again. This saves rate limits when many
+        handlers fetch the same object at once. Defaults to ``False``.
+
+        .. versionadded:: 2.0
+    response_cache_ttls: Optional[Dict[:class:`str`, :class:`float`]]
+        A mapping of REST route paths to the number of seconds their ``GET`` responses
+        should be cached for. Any other request sent to the same URL, a URL nested
+        under it or one of its parents drops the cached response. For example:
+
+        .. code-block:: python3
+
+            response_cache_ttls={
+                '/guilds/{guild_id}': 60,
+                '/oauth2/applications/@me': 300,
+                '/guilds/templates/{code}': 300,
+                '/sticker-packs': 3600,
+                '/channels/{channel_id}/webhooks': 60,
+                '/guilds/{guild_id}/webhooks': 60,
+            }
+
+        Cache hits and misses are counted in ``Client.http.response_cache``.
+        Defaults to ``None``, which disables the cache.
+
+        .. versionadded:: 2.0
+    response_cache_size: :class:`int`
+        The maximum number of responses kept by the cache configured through
+        ``response_cache_ttls``. Defaults to ``1024``.
+
+        .. versionadded:: 2.0
+    connection_pool: Optional[:class:`ConnectionPoolConfig`]
+        The limits, keep-alive, DNS caching and timeouts of the pool of connections
+        used for REST requests. The timeouts are applied even if ``connector`` is given,
+        but the rest of the settings are then ignored in favour of the connector's.
+        Defaults to ``None``, which uses aiohttp's defaults.
+
+        .. versionadded:: 2.0
+    retry_policy: Optional[:class:`RetryPolicy`]
+        Decides whether and when failed REST requests are retried.
+        Defaults to ``None``, which uses a :class:`RetryPolicy` with its default settings.
+
+        .. versionadded:: 2.0
+    api_base: Optional[:class:`str`]
+        The base URL of the REST API, e.g. ``http://127.0.0.1:8080/api/v9``.
+        Defaults to ``None``, which uses Discord's. This is mostly useful to test
+        against a :class:`~discord.testing.MockDiscordServer`.
+
+        .. versionadded:: 2.0
+    gateway_url: Optional[:class:`str`]
+        The URL of the gateway to connect to instead of the one given by Discord.
+
+        .. versionadded:: 2.0
+    gateway_compression: Optional[:class:`str`]
+        The compression of the gateway connection, one of ``'zlib-stream'``,
+        ``'zstd-stream'`` or ``None`` to disable it. ``'zstd-stream'`` decompresses
+        faster but requires the `zstandard <https://pypi.org/project/zstandard/>`_
+        package, falling back to ``'zlib-stream'`` if it isn't installed.
+        Defaults to ``'zlib-stream'``.
+
+        .. versionadded:: 2.0
+    gateway_encoding: :class:`str`
+        The encoding of the gateway payloads, either ``'json'`` or ``'etf'``
+        (the Erlang external term format). ETF payloads are smaller, and are decoded
+        with `erlpack <https://pypi.org/project/erlpack/>`_ if a compatible version
+        is installed, or a pure Python decoder otherwise. Defaults to ``'json'``.
+
+        .. versionadded:: 2.0
+    session_file: Optional[:class:`str`]
+        The path of a file to save the gateway sessions and the internal cache to
+        when the client is closed, so that the next process starting with the same
+        options resumes the sessions instead of identifying and receiving every guild again.
+        :func:`on_ready` is then dispatched as soon as the sessions are resumed.
+        If a session can't be resumed anymore the client identifies as usual.
+        Defaults to ``None``, which disables this.
+
+        .. warning::
+
+            The file is a :mod:`pickle`, so it must not be writable by anyone else.
+
+        .. versionadded:: 2.0
+    lazy_dispatch: :class:`bool`
+        Whether to skip processing gateway events that nothing listens to, either through
+        an event handler or :meth:`wait_for`, such as typing, presence or reaction events.
+        The internal cache is still kept up to date, so a skipped presence update still
+        updates the member's status. Defaults to ``False``.
+
+        .. versionadded:: 2.0
     enable_debug_events: :class:`bool`
         Whether to enable events that are useful only for debugging gateway related information.
 
@@ -236,15 +393,56 @@ class Client:
         proxy: Optional[str] = options.pop("proxy", None)
         proxy_auth: Optional[aiohttp.BasicAuth] = options.pop("proxy_auth", None)
         unsync_clock: bool = options.pop("assume_unsync_clock", True)
+        global_rate_limit: Optional[int] = options.pop("global_rate_limit", 50)
+        ratelimit_backend: Optional[RatelimitBackend] = options.pop("ratelimit_backend", None)
+        coalesce_requests: bool = options.pop("coalesce_requests", False)
+        response_cache_ttls: Optional[Dict[str, float]] = options.pop("response_cache_ttls", None)
+        response_cache_size: int = options.pop("response_cache_size", 1024)
+        connection_pool: Optional[ConnectionPoolConfig] = options.pop("connection_pool", None)
+        retry_policy: Optional[RetryPolicy] = options.pop("retry_policy", None)
+        api_base: Optional[str] = options.pop("api_base", None)
+        gateway_url: Optional[str] = options.pop("gateway_url", None)
+        gateway_compression: Optional[str] = options.pop("gateway_compression", "zlib-stream")
+        if gateway_compression not in ("zlib-stream", "zstd-stream", None):
+            raise InvalidArgument(f"Unknown gateway compression {gateway_compression!r}")
+        if gateway_compression == "zstd-stream" and not utils.HAS_ZSTD:
+            _log.warning("zstandard is not installed, falling back to zlib-stream gateway compression")
+            gateway_compression = "zlib-stream"
+        gateway_encoding: str = options.pop("gateway_encoding", "json")
+        if gateway_encoding not in ("json", "etf"):
+            raise InvalidArgument(f"Unknown gateway encoding {gateway_encoding!r}")
+        for name in options.get("cache_stores") or ():
+            if name not in ("users", "guilds", "emojis", "stickers", "members", "channels"):
+                raise InvalidArgument(f"Unknown cache {name!r}")
         self.http: HTTPClient = HTTPClient(
-            connector, proxy=proxy, proxy_auth=proxy_auth, unsync_clock=unsync_clock, loop=self.loop
+            connector,
+            proxy=proxy,
+            proxy_auth=proxy_auth,
+            unsync_clock=unsync_clock,
+            global_rate_limit=global_rate_limit,
+            ratelimit_backend=ratelimit_backend,
+            coalesce_requests=coalesce_requests,
+            response_cache_ttls=response_cache_ttls,
+            response_cache_size=response_cache_size,
+            connection_pool=connection_pool,
+            retry_policy=retry_policy,
+            api_base=api_base,
+            gateway_url=gateway_url,
+            gateway_compression=gateway_compression,
+            gateway_encoding=gateway_encoding,
+            loop=self.loop,
         )
 
+        self._gateway_stats: Dict[int, GatewayStats] = {}
+        # the number of event handlers scheduled and wait_for futures completed, to count fan-out
+        self._handlers_scheduled: int = 0
+
         self._handlers: Dict[str, Callable] = {"ready": self._handle_ready}
 
         self._hooks: Dict[str, Callable] = {"before_identify": self._call_before_identify_hook}
 
         self._enable_debug_events: bool = options.pop("enable_debug_events", False)
+        self._session_file: Optional[str] = options.pop("session_file", None)
         self._connection: ConnectionState = self._get_state(**options)
         self._connection.shard_count = self.shard_count
         self._closed: bool = False
@@ -295,6 +493,103 @@ class Client:
             return self.ws.is_ratelimited()
         return False
 
+    @property
+    def http_metrics(self) -> HTTPMetrics:
+        """:class:`HTTPMetrics`: The metrics gathered about the REST requests sent by this client.
+
+        .. versionadded:: 2.0
+        """
+        return self.http.metrics
+
+    @property
+    def gateway_stats(self) -> Dict[int, GatewayStats]:
+        """Dict[:class:`int`, :class:`GatewayStats`]: The statistics of the gateway connection of every shard, keyed by shard ID.
+
+        A client that isn't sharded has a single entry for shard ``0``.
+
+        .. versionadded:: 2.0
+        """
+        return dict(self._gateway_stats)
+
+    def _restore_sessions(self) -> Dict[Optional[int], Tuple[str, int]]:
+        path = self._session_file
+        if path is None or self._connection.user is None:
+            return {}
+
+        try:
+            with open(path, "rb") as fp:
+                data = fp.read()
+        except FileNotFoundError:
+            return {}
+
+        # the sequence moves on once resumed, so a snapshot can only be used once
+        os.remove(path)
+        try:
+            sessions = self._connection._load_session(data)
+        except Exception:
+            _log.exception("Failed to load the session snapshot %s, identifying instead.", path)
+            return {}
+
+        _log.info("Restored %d gateway session(s) from %s.", len(sessions), path)
+        return sessions
+
+    def _save_sessions(self, sessions: Dict[Optional[int], Tuple[str, int]]) -> None:
+        path = self._session_file
+        if path is None or not sessions:
+            return
+
+        try:
+            data = self._connection._dump_session(sessions)
+        except Exception:
+            _log.exception("Failed to snapshot the gateway sessions.")
+            return
+
+        temp = path + ".tmp"
+        with open(temp, "wb") as fp:
+            fp.write(data)
+        os.replace(temp, path)
+        _log.info("Saved %d gateway session(s) to %s.", len(sessions), path)
+
+    def _get_gateway_stats(self, shard_id: Optional[int]) -> GatewayStats:
+        shard_id = shard_id or 0
+        try:
+            return self._gateway_stats[shard_id]
+        except KeyError:
+            stats = self._gateway_stats[shard_id] = GatewayStats()
+            return stats
+
+    @property
+    def user_cache(self) -> CacheStore[User]:
+        """:class:`CacheStore`: The store the users seen by this client are cached in.
+
+        When ``max_users`` is set this is an :class:`LRUStore`, whose
+        :attr:`~LRUStore.hits`, :attr:`~LRUStore.misses` and :attr:`~LRUStore.evicted`
+        counters show how well the cache is sized.
+
+        .. versionadded:: 2.0
+        """
+        return self._connection._users
+
+    @property
+    def connection_pool_stats(self) -> ConnectionPoolStats:
+        """:class:`ConnectionPoolStats`: A snapshot of the utilisation of the pool of connections used for REST requests.
+
+        .. versionadded:: 2.0
+        """
+        return self.http.pool_stats()
+
+    @property
+    def http_session(self) -> Optional[aiohttp.ClientSession]:
+        """Optional[:class:`aiohttp.ClientSession`]: The session used for REST requests, or ``None`` before logging in.
+
+        This can be passed to :meth:`Webhook.from_url` or :meth:`Webhook.partial`
+        so that webhooks share the client's connection pool. It is managed by the
+        client and must not be closed.
+
+        .. versionadded:: 2.0
+        """
+        return self.http.session
+
     @property
     def user(self) -> Optional[ClientUser]:
         """Optional[:class:`.ClientUser`]: Represents the connected client. ``None`` if not logged in."""
@@ -324,7 +619,7 @@ class Client:
 
         .. versionadded:: 1.1
         """
-        return utils.SequenceProxy(self._connection._messages or [])
+        return utils.SequenceProxy(list(self._connection._messages or ()))
 
     @property
     def private_channels(self) -> List[PrivateChannel]:
@@ -385,10 +680,75 @@ class Client:
     def _schedule_event(
         self, coro: Callable[..., Coroutine[Any, Any, Any]], event_name: str, *args: Any, **kwargs: Any
     ) -> asyncio.Task:
+        self._handlers_scheduled += 1
         wrapped = self._run_event(coro, event_name, *args, **kwargs)
         # Schedules the task
         return asyncio.create_task(wrapped, name=f"discord.py: {event_name}")
 
+    def _is_listening(self, event: str) -> bool:
+        return event in self._listeners or hasattr(self, "on_" + event)
+
+    def _listened_events(self) -> Set[str]:
+        events = set(self._listeners)
+        for attr in dir(self):
+            if attr.startswith("on_") and attr != "on_error" and asyncio.iscoroutinefunction(getattr(self, attr)):
+                events.add(attr[3:])
+        return events
+
+    def _required_intents(self) -> Intents:
+        intents = Intents.from_events(*self._listened_events())
+        # the guilds intent is needed for the cache to work at all
+        intents.guilds = True
+
+        state = self._connection
+        if state._member_cache_flags_given:
+            intents.members |= state.member_cache_flags.joined
+            intents.voice_states |= state.member_cache_flags.voice
+        if state._chunk_guilds_given and state._chunk_guilds:
+            intents.members = True
+        return intents
+
+    def minimal_intents(self, *, apply: bool = False) -> Tuple[Intents, List[str]]:
+        """Computes the smallest :class:`Intents` needed by the client.
+
+        These are the intents needed to receive the events with a registered
+        event handler or listener, or currently waited for with :meth:`wait_for`,
+        as well as those needed by an explicitly passed ``member_cache_flags``
+        or ``chunk_guilds_at_startup`` and by the commands of a :class:`~discord.ext.commands.Bot`.
+        Subscribing to fewer intents means Discord sends fewer events to every shard.
+
+        Events waited for later on with :meth:`wait_for` can't be known in advance,
+        so the events that the client would stop receiving are returned as well.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        apply: :class:`bool`
+            Whether to use the computed intents when connecting. This must be done
+            before the client connects.
+
+        Raises
+        -------
+        ClientException
+            The intents were applied after the client connected.
+
+        Returns
+        --------
+        Tuple[:class:`Intents`, List[:class:`str`]]
+            The minimal intents and the names of the events the current intents
+            receive that they would not.
+        """
+        intents = self._required_intents()
+        current = self._connection.intents
+        lost = sorted(event for event in _EVENT_INTENTS if current._receives(event) and not intents._receives(event))
+
+        if apply:
+            if self.ws is not None or self.is_ready():
+                raise ClientException("Intents cannot be changed once the client is connected")
+            self._connection._set_intents(intents)
+        return intents, lost
+
     def dispatch(self, event: str, *args: Any, **kwargs: Any) -> None:
         _log.debug("Dispatching event %s", event)
         method = "on_" + event
@@ -408,6 +768,7 @@ class Client:
                     removed.append(i)
                 else:
                     if result:
+                        self._handlers_scheduled += 1
                         if len(args) == 0:
                             future.set_result(None)
                         elif len(args) == 1:
@@ -530,6 +891,11 @@ class Client:
             "initial": True,
             "shard_id": self.shard_id,
         }
+        sessions = self._restore_sessions()
+        if self.shard_id in sessions:
+            session, sequence = sessions[self.shard_id]
+            ws_params.update(session=session, sequence=sequence, resume=True)
+
         while not self.is_closed():
             try:
                 coro = DiscordWebSocket.from_client(self, **ws_params)
@@ -604,7 +970,12 @@ class Client:
                 pass
 
         if self.ws is not None and self.ws.open:
-            await self.ws.close(code=1000)
+            if self._session_file is not None and self.ws.session_id is not None:
+                # closing with any code but 1000 keeps the session resumable
+                await self.ws.close(code=4000)
+                self._save_sessions({self.shard_id: (self.ws.session_id, self.ws.sequence)})
+            else:
+                await self.ws.close(code=1000)
 
         await self.http.close()
         self._ready.clear()
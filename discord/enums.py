@@ -63,6 +63,8 @@ def _create_value_cls(name, comparable):
     cls = namedtuple("_EnumValue_" + name, "name value")
     cls.__repr__ = lambda self: f"<{name}.{self.name}: {self.value!r}>"
     cls.__str__ = lambda self: f"{name}.{self.name}"
+    # the value classes aren't importable, so values are pickled as a lookup of their enum
+    cls.__reduce__ = lambda self: (try_enum, (self._actual_enum_cls_, self.value))
     if comparable:
         cls.__le__ = lambda self, other: isinstance(other, self.__class__) and self.value <= other.value
         cls.__ge__ = lambda self, other: isinstance(other, self.__class__) and self.value >= other.value
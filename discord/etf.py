@@ -0,0 +1,273 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from typing import Any, Callable, Dict, List, Tuple
+
+try:
+    import erlpack
+except ModuleNotFoundError:
+    HAS_ERLPACK = False
+else:
+    HAS_ERLPACK = True
+
+__all__ = (
+    "encode",
+    "decode",
+)
+
+# An implementation of the Erlang external term format, restricted to the terms Discord uses.
+# https://www.erlang.org/doc/apps/erts/erl_ext_dist.html
+
+FORMAT_VERSION = 131
+
+NEW_FLOAT_EXT = 70
+COMPRESSED = 80
+SMALL_INTEGER_EXT = 97
+INTEGER_EXT = 98
+FLOAT_EXT = 99
+ATOM_EXT = 100
+SMALL_TUPLE_EXT = 104
+LARGE_TUPLE_EXT = 105
+NIL_EXT = 106
+STRING_EXT = 107
+LIST_EXT = 108
+BINARY_EXT = 109
+SMALL_BIG_EXT = 110
+LARGE_BIG_EXT = 111
+SMALL_ATOM_EXT = 115
+MAP_EXT = 116
+ATOM_UTF8_EXT = 118
+SMALL_ATOM_UTF8_EXT = 119
+
+_ATOMS: Dict[str, Any] = {"nil": None, "null": None, "true": True, "false": False}
+
+_unpack_u16 = struct.Struct(">H").unpack_from
+_unpack_u32 = struct.Struct(">I").unpack_from
+_unpack_i32 = struct.Struct(">i").unpack_from
+_unpack_f64 = struct.Struct(">d").unpack_from
+
+
+class ETFError(ValueError):
+    pass
+
+
+def _atom(name: str) -> Any:
+    try:
+        return _ATOMS[name]
+    except KeyError:
+        return name
+
+
+def _binary(data: bytes) -> Any:
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data
+
+
+def _decode_term(data: bytes, pos: int) -> Tuple[Any, int]:
+    tag = data[pos]
+    pos += 1
+
+    # ordered roughly by how often Discord sends each of them
+    if tag == BINARY_EXT:
+        (length,) = _unpack_u32(data, pos)
+        pos += 4
+        return _binary(data[pos : pos + length]), pos + length
+    if tag == SMALL_ATOM_UTF8_EXT or tag == SMALL_ATOM_EXT:
+        length = data[pos]
+        pos += 1
+        return _atom(data[pos : pos + length].decode("utf-8")), pos + length
+    if tag == MAP_EXT:
+        (arity,) = _unpack_u32(data, pos)
+        pos += 4
+        result: Dict[Any, Any] = {}
+        for _ in range(arity):
+            # keys are almost always short atoms or binaries, decoded here without recursing
+            tag = data[pos]
+            if tag == SMALL_ATOM_UTF8_EXT:
+                end = pos + 2 + data[pos + 1]
+                key = data[pos + 2 : end].decode("utf-8")
+                pos = end
+            elif tag == BINARY_EXT:
+                end = pos + 5 + _unpack_u32(data, pos + 1)[0]
+                key = data[pos + 5 : end].decode("utf-8")
+                pos = end
+            else:
+                key, pos = _decode_term(data, pos)
+            result[key], pos = _decode_term(data, pos)
+        return result, pos
+    if tag == SMALL_INTEGER_EXT:
+        return data[pos], pos + 1
+    if tag == INTEGER_EXT:
+        return _unpack_i32(data, pos)[0], pos + 4
+    if tag == SMALL_BIG_EXT or tag == LARGE_BIG_EXT:
+        if tag == SMALL_BIG_EXT:
+            length = data[pos]
+            pos += 1
+        else:
+            (length,) = _unpack_u32(data, pos)
+            pos += 4
+        sign = data[pos]
+        value = int.from_bytes(data[pos + 1 : pos + 1 + length], "little")
+        return -value if sign else value, pos + 1 + length
+    if tag == LIST_EXT:
+        (length,) = _unpack_u32(data, pos)
+        pos += 4
+        items: List[Any] = []
+        append = items.append
+        for _ in range(length):
+            item, pos = _decode_term(data, pos)
+            append(item)
+        # proper lists end with an empty list as their tail
+        tail, pos = _decode_term(data, pos)
+        if tail != []:
+            append(tail)
+        return items, pos
+    if tag == NIL_EXT:
+        return [], pos
+    if tag == ATOM_UTF8_EXT or tag == ATOM_EXT:
+        (length,) = _unpack_u16(data, pos)
+        pos += 2
+        return _atom(data[pos : pos + length].decode("utf-8")), pos + length
+    if tag == STRING_EXT:
+        # Erlang sends lists of bytes this way
+        (length,) = _unpack_u16(data, pos)
+        pos += 2
+        return list(data[pos : pos + length]), pos + length
+    if tag == NEW_FLOAT_EXT:
+        return _unpack_f64(data, pos)[0], pos + 8
+    if tag == FLOAT_EXT:
+        return float(data[pos : pos + 31].split(b"\0", 1)[0]), pos + 31
+    if tag == SMALL_TUPLE_EXT or tag == LARGE_TUPLE_EXT:
+        if tag == SMALL_TUPLE_EXT:
+            arity = data[pos]
+            pos += 1
+        else:
+            (arity,) = _unpack_u32(data, pos)
+            pos += 4
+        elements: List[Any] = []
+        for _ in range(arity):
+            element, pos = _decode_term(data, pos)
+            elements.append(element)
+        return tuple(elements), pos
+
+    raise ETFError(f"Unsupported ETF tag {tag} at position {pos - 1}")
+
+
+def _decode(data: bytes) -> Any:
+    if not data or data[0] != FORMAT_VERSION:
+        raise ETFError("Invalid ETF version")
+
+    if data[1] == COMPRESSED:
+        (size,) = _unpack_u32(data, 2)
+        data = bytes([FORMAT_VERSION]) + zlib.decompress(data[6:])
+        if len(data) != size + 1:
+            raise ETFError("Compressed ETF term has the wrong size")
+
+    try:
+        term, _ = _decode_term(data, 1)
+    except (IndexError, struct.error) as exc:
+        raise ETFError("Truncated ETF term") from exc
+    return term
+
+
+def _encode_term(obj: Any, out: bytearray) -> None:
+    if obj is None:
+        out += b"\x77\x03nil"
+    elif obj is True:
+        out += b"\x77\x04true"
+    elif obj is False:
+        out += b"\x77\x05false"
+    elif isinstance(obj, str):
+        encoded = obj.encode("utf-8")
+        out.append(BINARY_EXT)
+        out += struct.pack(">I", len(encoded))
+        out += encoded
+    elif isinstance(obj, int):
+        if 0 <= obj <= 255:
+            out.append(SMALL_INTEGER_EXT)
+            out.append(obj)
+        elif -(2 ** 31) <= obj < 2 ** 31:
+            out.append(INTEGER_EXT)
+            out += struct.pack(">i", obj)
+        else:
+            magnitude = abs(obj)
+            encoded = magnitude.to_bytes((magnitude.bit_length() + 7) // 8, "little")
+            if len(encoded) < 256:
+                out.append(SMALL_BIG_EXT)
+                out.append(len(encoded))
+            else:
+                out.append(LARGE_BIG_EXT)
+                out += struct.pack(">I", len(encoded))
+            out.append(1 if obj < 0 else 0)
+            out += encoded
+    elif isinstance(obj, float):
+        out.append(NEW_FLOAT_EXT)
+        out += struct.pack(">d", obj)
+    elif isinstance(obj, dict):
+        out.append(MAP_EXT)
+        out += struct.pack(">I", len(obj))
+        for key, value in obj.items():
+            _encode_term(key, out)
+            _encode_term(value, out)
+    elif isinstance(obj, (list, tuple)):
+        if obj:
+            out.append(LIST_EXT)
+            out += struct.pack(">I", len(obj))
+            for item in obj:
+                _encode_term(item, out)
+        out.append(NIL_EXT)
+    elif isinstance(obj, (bytes, bytearray)):
+        out.append(BINARY_EXT)
+        out += struct.pack(">I", len(obj))
+        out += obj
+    else:
+        raise TypeError(f"Object of type {obj.__class__.__name__} cannot be encoded as ETF")
+
+
+def _encode(obj: Any) -> bytes:
+    out = bytearray([FORMAT_VERSION])
+    _encode_term(obj, out)
+    return bytes(out)
+
+
+def _erlpack_compatible() -> bool:
+    # some builds of erlpack return binaries and atoms as bytes, which the rest of the library can't use
+    try:
+        term = erlpack.unpack(_encode({"a": "b", "c": None, "d": [1, 2 ** 40]}))
+    except Exception:
+        return False
+    return term == {"a": "b", "c": None, "d": [1, 2 ** 40]}
+
+
+encode: Callable[[Any], bytes] = _encode
+decode: Callable[[bytes], Any] = _decode
+
+if HAS_ERLPACK and _erlpack_compatible():
+    decode = erlpack.unpack
@@ -51,6 +51,7 @@ from typing import (
     TypeVar,
     Type,
     Union,
+    Set,
 )
 
 import discord
@@ -62,7 +63,7 @@ from discord.types.interactions import (
 )
 
 from .core import GroupMixin
-from .converter import Greedy
+from .converter import EmojiConverter, Greedy, GuildStickerConverter
 from .view import StringView, supported_quotes
 from .context import Context
 from .flags import FlagConverter
@@ -95,6 +96,17 @@ CFT = TypeVar("CFT", bound="CoroFunc")
 CXT = TypeVar("CXT", bound="Context")
 
 
+def _flatten_converters(annotation: Any) -> Iterable[Any]:
+    # unwraps Greedy, Optional and Union annotations into the converters they contain
+    if isinstance(annotation, Greedy):
+        yield from _flatten_converters(annotation.converter)
+    elif getattr(annotation, "__origin__", None) is Union:
+        for arg in annotation.__args__:
+            yield from _flatten_converters(arg)
+    else:
+        yield annotation
+
+
 class _FakeSlashMessage(discord.PartialMessage):
     activity = application = edited_at = reference = webhook_id = None
     attachments = components = reactions = stickers = []
@@ -271,6 +283,25 @@ class BotBase(GroupMixin):
 
     # internal helpers
 
+    def _is_listening(self, event: str) -> bool:
+        return super()._is_listening(event) or bool(self.extra_events.get("on_" + event))  # type: ignore
+
+    def _listened_events(self) -> Set[str]:
+        events = super()._listened_events()  # type: ignore
+        events.update(name[3:] for name, listeners in self.extra_events.items() if listeners)
+        return events
+
+    def _required_intents(self) -> discord.Intents:
+        intents = super()._required_intents()  # type: ignore
+        # emoji and sticker arguments are only looked up in the cache
+        cached = (discord.Emoji, discord.GuildSticker, EmojiConverter, GuildStickerConverter)
+        for command in self.walk_commands():
+            for param in command.clean_params.values():
+                if any(converter in cached for converter in _flatten_converters(param.annotation)):
+                    intents.emojis_and_stickers = True
+                    return intents
+        return intents
+
     def dispatch(self, event_name: str, *args: Any, **kwargs: Any) -> None:
         # super() will resolve to Client
         super().dispatch(event_name, *args, **kwargs)  # type: ignore
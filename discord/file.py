@@ -23,30 +23,54 @@ DEALINGS IN THE SOFTWARE.
 """
 
 from __future__ import annotations
-from typing import Optional, TYPE_CHECKING, Union
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Optional, TYPE_CHECKING, Union
 
+import asyncio
+import mmap
 import os
 import io
 
+from aiohttp import payload as aiohttp_payload
+
+if TYPE_CHECKING:
+    from aiohttp.abc import AbstractStreamWriter
+
 __all__ = ("File",)
 
+_CHUNK_SIZE = 1 << 16
+
+StreamFactory = Callable[[], AsyncIterable[bytes]]
+
 
 class File:
     r"""A parameter object used for :meth:`abc.Messageable.send`
     for sending file objects.
 
+    Uploads are streamed in chunks rather than being read into memory
+    as a whole, so large files can be sent with a bounded amount of memory.
+    If a request has to be retried, the file is read again from the start.
+
     .. note::
 
         File objects are single use and are not meant to be reused in
         multiple :meth:`abc.Messageable.send`\s.
 
+    .. versionchanged:: 2.0
+
+        Memory-mapped files and asynchronous iterables of bytes are now supported.
+
     Attributes
     -----------
-    fp: Union[:class:`os.PathLike`, :class:`io.BufferedIOBase`]
+    fp: Optional[Union[:class:`os.PathLike`, :class:`io.BufferedIOBase`, :class:`mmap.mmap`]]
         A file-like object opened in binary mode and read mode
         or a filename representing a file in the hard drive to
         open.
 
+        This may also be an :term:`asynchronous iterable` of :class:`bytes`,
+        or a function returning one. Since an iterable can only be consumed once,
+        passing a function allows the upload to be retried, as it is called again
+        for every attempt. In both cases, this attribute is ``None``.
+
         .. note::
 
             If the file-like object passed is opened via ``open`` then the
@@ -62,37 +86,50 @@ class File:
         Whether the attachment is a spoiler.
     """
 
-    __slots__ = ("fp", "filename", "spoiler", "_original_pos", "_owner", "_closer")
+    __slots__ = ("fp", "filename", "spoiler", "_original_pos", "_owner", "_closer", "_stream")
 
     if TYPE_CHECKING:
-        fp: io.BufferedIOBase
+        fp: Optional[io.BufferedIOBase]
         filename: Optional[str]
         spoiler: bool
 
     def __init__(
         self,
-        fp: Union[str, bytes, os.PathLike, io.BufferedIOBase],
+        fp: Union[str, bytes, os.PathLike, io.BufferedIOBase, mmap.mmap, AsyncIterable[bytes], StreamFactory],
         filename: Optional[str] = None,
         *,
         spoiler: bool = False,
     ):
+        self._stream: Optional[StreamFactory] = None
+        self._closer: Optional[Callable[[], None]] = None
+        self._original_pos = 0
+        self._owner = False
+
         if isinstance(fp, io.IOBase):
             if not (fp.seekable() and fp.readable()):
                 raise ValueError(f"File buffer {fp!r} must be seekable and readable")
             self.fp = fp
             self._original_pos = fp.tell()
-            self._owner = False
+        elif isinstance(fp, mmap.mmap):
+            self.fp = fp  # type: ignore
+            self._original_pos = fp.tell()
+        elif isinstance(fp, AsyncIterable):
+            self.fp = None
+            self._stream = _once(fp)
+        elif callable(fp):
+            self.fp = None
+            self._stream = fp
         else:
             self.fp = open(fp, "rb")
-            self._original_pos = 0
             self._owner = True
 
-        # aiohttp only uses two methods from IOBase
-        # read and close, since I want to control when the files
-        # close, I need to stub it so it doesn't close unless
-        # I tell it to
-        self._closer = self.fp.close
-        self.fp.close = lambda: None
+        if isinstance(self.fp, io.IOBase):
+            # aiohttp only uses two methods from IOBase
+            # read and close, since I want to control when the files
+            # close, I need to stub it so it doesn't close unless
+            # I tell it to
+            self._closer = self.fp.close
+            self.fp.close = lambda: None
 
         if filename is None:
             if isinstance(fp, str):
@@ -116,10 +153,85 @@ class File:
         # is 0, and thus false, then this prevents an
         # unnecessary seek since it's the first request
         # done.
-        if seek:
+        if seek and self.fp is not None:
             self.fp.seek(self._original_pos)
 
     def close(self) -> None:
-        self.fp.close = self._closer
-        if self._owner:
-            self._closer()
+        if self._closer is not None:
+            self.fp.close = self._closer  # type: ignore
+            if self._owner:
+                self._closer()
+
+    async def _chunks(self) -> AsyncIterator[bytes]:
+        if self._stream is not None:
+            async for chunk in self._stream():
+                yield chunk
+            return
+
+        fp = self.fp
+        assert fp is not None
+        fp.seek(self._original_pos)
+        if isinstance(fp, io.BytesIO):
+            read = None
+        else:
+            # reading from the disk blocks, so push it off the event loop
+            read = asyncio.get_running_loop().run_in_executor
+
+        while True:
+            chunk = fp.read(_CHUNK_SIZE) if read is None else await read(None, fp.read, _CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def _size(self) -> Optional[int]:
+        fp = self.fp
+        if fp is None:
+            return None
+        if isinstance(fp, mmap.mmap):
+            return len(fp) - self._original_pos
+        try:
+            return os.fstat(fp.fileno()).st_size - self._original_pos
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            pass
+        position = fp.tell()
+        try:
+            return fp.seek(0, io.SEEK_END) - self._original_pos
+        finally:
+            fp.seek(position)
+
+
+def _once(iterable: AsyncIterable[bytes]) -> StreamFactory:
+    consumed = False
+
+    def factory() -> AsyncIterable[bytes]:
+        nonlocal consumed
+        if consumed:
+            raise RuntimeError(
+                "Asynchronous iterables can only be uploaded once, pass a function returning one to retry"
+            )
+        consumed = True
+        return iterable
+
+    return factory
+
+
+class _FilePayload(aiohttp_payload.Payload):
+    # Streams the contents of a File into a request body, used by aiohttp
+    # whenever a File is passed as the value of a form field. A new payload
+    # is created every time the form is rebuilt, so retries start over.
+
+    _value: File
+
+    def __init__(self, value: File, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault("content_type", "application/octet-stream")
+        super().__init__(value, *args, **kwargs)
+        self._size = value._size()
+
+    async def write(self, writer: AbstractStreamWriter) -> None:
+        async for chunk in self._value._chunks():
+            # the writer waits for the transport to drain once its buffer
+            # fills up, keeping at most a few chunks in memory at a time
+            await writer.write(chunk)
+
+
+aiohttp_payload.PAYLOAD_REGISTRY.register(_FilePayload, File)
@@ -415,6 +415,72 @@ class PublicUserFlags(BaseFlags):
         return [public_flag for public_flag in UserFlags if self._has_flag(public_flag.value)]
 
 
+_GUILD_AND_DM_MESSAGES = ("guild_messages", "dm_messages")
+_GUILD_AND_DM_REACTIONS = ("guild_reactions", "dm_reactions")
+
+# The intents needed to receive every occurrence of an event, used by Intents.from_events.
+# Events missing from here, such as on_ready or on_interaction, don't need any.
+_EVENT_INTENTS: Dict[str, Tuple[str, ...]] = {
+    "guild_join": ("guilds",),
+    "guild_remove": ("guilds",),
+    "guild_available": ("guilds",),
+    "guild_unavailable": ("guilds",),
+    "guild_update": ("guilds",),
+    "guild_channel_create": ("guilds",),
+    "guild_channel_update": ("guilds",),
+    "guild_channel_delete": ("guilds",),
+    "guild_channel_pins_update": ("guilds",),
+    "guild_role_create": ("guilds",),
+    "guild_role_update": ("guilds",),
+    "guild_role_delete": ("guilds",),
+    "thread_join": ("guilds",),
+    "thread_update": ("guilds",),
+    "thread_remove": ("guilds",),
+    "thread_delete": ("guilds",),
+    "thread_member_join": ("guilds", "members"),
+    "thread_member_remove": ("guilds", "members"),
+    "stage_instance_create": ("guilds",),
+    "stage_instance_update": ("guilds",),
+    "stage_instance_delete": ("guilds",),
+    "member_join": ("members",),
+    "member_remove": ("members",),
+    "member_update": ("members",),
+    "user_update": ("members",),
+    "member_ban": ("bans",),
+    "member_unban": ("bans",),
+    "guild_emojis_update": ("emojis_and_stickers",),
+    "guild_stickers_update": ("emojis_and_stickers",),
+    "guild_integrations_update": ("integrations",),
+    "integration_create": ("integrations",),
+    "integration_update": ("integrations",),
+    "raw_integration_delete": ("integrations",),
+    "webhooks_update": ("webhooks",),
+    "invite_create": ("invites",),
+    "invite_delete": ("invites",),
+    "voice_state_update": ("voice_states",),
+    "presence_update": ("presences",),
+    "message": _GUILD_AND_DM_MESSAGES,
+    "message_edit": _GUILD_AND_DM_MESSAGES,
+    "message_delete": _GUILD_AND_DM_MESSAGES,
+    "bulk_message_delete": _GUILD_AND_DM_MESSAGES,
+    "raw_message_edit": _GUILD_AND_DM_MESSAGES,
+    "raw_message_delete": _GUILD_AND_DM_MESSAGES,
+    "raw_bulk_message_delete": _GUILD_AND_DM_MESSAGES,
+    "private_channel_pins_update": ("dm_messages",),
+    # the rich reaction events need the message to be cached
+    "reaction_add": _GUILD_AND_DM_MESSAGES + _GUILD_AND_DM_REACTIONS,
+    "reaction_remove": _GUILD_AND_DM_MESSAGES + _GUILD_AND_DM_REACTIONS,
+    "reaction_clear": _GUILD_AND_DM_MESSAGES + _GUILD_AND_DM_REACTIONS,
+    "reaction_clear_emoji": _GUILD_AND_DM_MESSAGES + _GUILD_AND_DM_REACTIONS,
+    "raw_reaction_add": _GUILD_AND_DM_REACTIONS,
+    "raw_reaction_remove": _GUILD_AND_DM_REACTIONS,
+    "raw_reaction_clear": _GUILD_AND_DM_REACTIONS,
+    "raw_reaction_clear_emoji": _GUILD_AND_DM_REACTIONS,
+    "typing": ("guild_typing", "dm_typing"),
+    "raw_typing": ("guild_typing", "dm_typing"),
+}
+
+
 @fill_with_flags()
 class Intents(BaseFlags):
     r"""Wraps up a Discord gateway intent flag.
@@ -480,6 +546,28 @@ class Intents(BaseFlags):
         self.value = self.DEFAULT_VALUE
         return self
 
+    @classmethod
+    def from_events(cls: Type[Intents], *events: str) -> Intents:
+        r"""A factory method that creates a :class:`Intents` with only the intents
+        needed to receive the given events.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        \*events: :class:`str`
+            The names of the events, with or without the ``on_`` prefix,
+            e.g. ``'message'`` or ``'on_raw_reaction_add'``.
+        """
+        self = cls.none()
+        for event in events:
+            for name in _EVENT_INTENTS.get(event[3:] if event.startswith("on_") else event, ()):
+                setattr(self, name, True)
+        return self
+
+    def _receives(self, event: str) -> bool:
+        return all(getattr(self, name) for name in _EVENT_INTENTS.get(event, ()))
+
     @flag_value
     def guilds(self):
         """:class:`bool`: Whether guild related events are enabled.
@@ -37,6 +37,7 @@ from typing import (
     Coroutine,
     NamedTuple,
     Deque,
+    Union,
 )
 
 import asyncio
@@ -52,10 +53,11 @@ import zlib
 
 import aiohttp
 
-from . import utils
+from . import etf, utils
 from .activity import BaseActivity
 from .enums import SpeakingState
 from .errors import ConnectionClosed, InvalidArgument
+from .metrics import GatewayStats
 
 if TYPE_CHECKING:
     from .client import Client
@@ -232,6 +234,7 @@ class KeepAliveHandler:
         ack_time = time.perf_counter()
         self._last_ack = ack_time
         self.latency = ack_time - self._last_send
+        self.ws.stats.heartbeat_latencies.append(self.latency)
         if self.latency > 10:
             _log.warning(self.behind_msg, self.shard_id, self.latency)
 
@@ -330,7 +333,13 @@ class DiscordWebSocket:
         self.session_id: Optional[str] = None
         self.sequence: Optional[int] = None
         self._zlib = zlib.decompressobj()
+        self._zstd: Optional[Any] = None
+        self._inflate: bool = True
         self._buffer: bytearray = bytearray()
+        self.encoding: str = "json"
+        self._encode: Callable[[Any], Union[str, bytes]] = utils._to_json
+        self._decode: Callable[[Union[str, bytes]], Any] = utils._from_json
+        self.stats: GatewayStats = GatewayStats()
         self._close_code: Optional[int] = None
         self._rate_limiter: GatewayRatelimiter = GatewayRatelimiter()
 
@@ -354,6 +363,8 @@ class DiscordWebSocket:
         return self._rate_limiter.is_ratelimited()
 
     def debug_log_receive(self, data, /) -> None:
+        if type(data) is bytes and self.encoding == "json":
+            data = data.decode("utf-8")
         self._dispatch("socket_raw_receive", data)
 
     def log_receive(self, _, /) -> None:
@@ -387,6 +398,15 @@ class DiscordWebSocket:
         ws._discord_parsers = client._connection.parsers
         ws._dispatch = client.dispatch
         ws.gateway = gateway
+        if "compress=zstd-stream" in gateway:
+            ws._zstd = utils.zstandard.ZstdDecompressor().decompressobj()
+        elif "compress=zlib-stream" not in gateway:
+            ws._inflate = False
+        if "encoding=etf" in gateway:
+            ws.encoding = "etf"
+            ws._encode = etf.encode
+            ws._decode = etf.decode
+        ws.stats = client._get_gateway_stats(shard_id)
         ws.call_hooks = client._connection.call_hooks
         ws._initial_identify = initial
         ws.shard_id = shard_id
@@ -470,6 +490,7 @@ class DiscordWebSocket:
 
         await self.call_hooks("before_identify", self.shard_id, initial=self._initial_identify)
         await self.send_as_json(payload)
+        self.stats.identifies += 1
         _log.info("Shard ID %s has sent the IDENTIFY payload.", self.shard_id)
 
     async def resume(self) -> None:
@@ -477,20 +498,40 @@ class DiscordWebSocket:
         payload = {"op": self.RESUME, "d": {"seq": self.sequence, "session_id": self.session_id, "token": self.token}}
 
         await self.send_as_json(payload)
+        self.stats.resumes += 1
         _log.info("Shard ID %s has sent the RESUME payload.", self.shard_id)
 
     async def received_message(self, msg, /) -> None:
+        stats = self.stats
+        started = time.perf_counter()
         if type(msg) is bytes:
-            self._buffer.extend(msg)
-
-            if len(msg) < 4 or msg[-4:] != b"\x00\x00\xff\xff":
-                return
-            msg = self._zlib.decompress(self._buffer)
-            msg = msg.decode("utf-8")
-            self._buffer = bytearray()
+            stats.bytes_received += len(msg)
+            if self._zstd is not None:
+                # with zstd-stream every frame is flushed, so each one holds a whole message
+                msg = self._zstd.decompress(msg)
+            elif self._inflate:
+                complete = msg[-4:] == b"\x00\x00\xff\xff"
+                if self._buffer or not complete:
+                    # a message split over several frames is gathered into a buffer that is reused
+                    self._buffer += msg
+                    if not complete:
+                        return
+                    msg = self._zlib.decompress(self._buffer)
+                    self._buffer.clear()
+                else:
+                    # the usual case of a whole message in one frame is inflated without copying it first
+                    msg = self._zlib.decompress(msg)
+        else:
+            stats.bytes_received += len(msg)
 
+        # the JSON decoder accepts the UTF-8 bytes directly, skipping an intermediate str
+        stats.bytes_inflated += len(msg)
+        stats.messages_received += 1
+        decoding = time.perf_counter()
+        stats.inflate_time += decoding - started
         self.log_receive(msg)
-        msg = utils._from_json(msg)
+        msg = self._decode(msg)
+        stats.decode_time += time.perf_counter() - decoding
 
         _log.debug("For Shard ID %s: WebSocket Event: %s", self.shard_id, msg)
         event = msg.get("t")
@@ -577,7 +618,11 @@ class DiscordWebSocket:
         except KeyError:
             _log.debug("Unknown event %s.", event)
         else:
+            client = self._connection._get_client()
+            scheduled = client._handlers_scheduled
+            started = time.perf_counter()
             func(data)
+            stats.record_event(event, time.perf_counter() - started, client._handlers_scheduled - scheduled)
 
         # remove the dispatched listeners
         removed = []
@@ -655,15 +700,21 @@ class DiscordWebSocket:
     async def debug_send(self, data, /) -> None:
         await self._rate_limiter.block()
         self._dispatch("socket_raw_send", data)
-        await self.socket.send_str(data)
+        await self._send_frame(data)
 
     async def send(self, data, /) -> None:
         await self._rate_limiter.block()
-        await self.socket.send_str(data)
+        await self._send_frame(data)
+
+    async def _send_frame(self, data: Union[str, bytes]) -> None:
+        if type(data) is bytes:
+            await self.socket.send_bytes(data)
+        else:
+            await self.socket.send_str(data)  # type: ignore
 
     async def send_as_json(self, data) -> None:
         try:
-            await self.send(utils._to_json(data))
+            await self.send(self._encode(data))
         except RuntimeError as exc:
             if not self._can_handle_close():
                 raise ConnectionClosed(self.socket, shard_id=self.shard_id) from exc
@@ -671,7 +722,7 @@ class DiscordWebSocket:
     async def send_heartbeat(self, data: Heartbeat) -> None:
         # This bypasses the rate limit handling code since it has a higher priority
         try:
-            await self.socket.send_str(utils._to_json(data))
+            await self._send_frame(self._encode(data))
         except RuntimeError as exc:
             if not self._can_handle_close():
                 raise ConnectionClosed(self.socket, shard_id=self.shard_id) from exc
@@ -691,7 +742,7 @@ class DiscordWebSocket:
 
         payload = {"op": self.PRESENCE, "d": {"activities": activities, "afk": False, "since": since, "status": status}}
 
-        sent = utils._to_json(payload)
+        sent = self._encode(payload)
         _log.debug('Sending "%s" to change status', sent)
         await self.send(sent)
 
@@ -95,6 +95,7 @@ if TYPE_CHECKING:
     from .webhook import Webhook
     from .state import ConnectionState
     from .voice_client import VoiceProtocol
+    from .cache import CacheStore
 
     import datetime
 
@@ -303,8 +304,9 @@ class Guild(Hashable):
     }
 
     def __init__(self, *, data: GuildPayload, state: ConnectionState):
-        self._channels: Dict[int, GuildChannel] = {}
-        self._members: Dict[int, Member] = {}
+        guild_id = int(data["id"])
+        self._channels: CacheStore[GuildChannel] = state._create_store("channels", guild_id)
+        self._members: CacheStore[Member] = state._create_store("members", guild_id)
         self._voice_states: Dict[int, VoiceState] = {}
         self._threads: Dict[int, Thread] = {}
         self._state: ConnectionState = state
@@ -25,11 +25,14 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import asyncio
+import copy
 import json
 import logging
 import sys
+import time
 from typing import (
     Any,
+    AsyncIterator,
     ClassVar,
     Coroutine,
     Dict,
@@ -37,14 +40,14 @@ from typing import (
     List,
     Optional,
     Sequence,
+    Set,
     TYPE_CHECKING,
     Tuple,
-    Type,
     TypeVar,
     Union,
 )
+from collections import OrderedDict
 from urllib.parse import quote as _uriquote
-import weakref
 
 import aiohttp
 
@@ -58,6 +61,10 @@ from .errors import (
     InvalidArgument,
 )
 from .gateway import DiscordClientWebSocketResponse
+from .metrics import HTTPMetrics, RequestRecord
+from .pool import ConnectionPoolConfig, ConnectionPoolStats
+from .ratelimits import GlobalRatelimit, MemoryRatelimitBackend, RatelimitBackend, RatelimitHeaders
+from .retry import RetryPolicy
 from . import __version__, utils
 from .utils import MISSING
 
@@ -95,11 +102,7 @@ if TYPE_CHECKING:
     )
     from .types.snowflake import Snowflake, SnowflakeList
 
-    from types import TracebackType
-
     T = TypeVar("T")
-    BE = TypeVar("BE", bound=BaseException)
-    MU = TypeVar("MU", bound="MaybeUnlock")
     Response = Coroutine[Any, Any, T]
 
 
@@ -131,32 +134,156 @@ class Route:
         self.guild_id: Optional[Snowflake] = parameters.get("guild_id")
         self.webhook_id: Optional[Snowflake] = parameters.get("webhook_id")
         self.webhook_token: Optional[str] = parameters.get("webhook_token")
+        self.interaction_token: Optional[str] = parameters.get("interaction_token")
+
+    @property
+    def key(self) -> str:
+        # used to look up the rate limit bucket hash Discord assigned to this route
+        return f"{self.method} {self.path}"
 
     @property
-    def bucket(self) -> str:
-        # the bucket is just method + path w/ major parameters
-        return f"{self.channel_id}:{self.guild_id}:{self.path}"
+    def major_parameters(self) -> str:
+        return "+".join(
+            str(p)
+            for p in (self.channel_id, self.guild_id, self.webhook_id, self.webhook_token, self.interaction_token)
+            if p is not None
+        )
 
 
-class MaybeUnlock:
-    def __init__(self, lock: asyncio.Lock) -> None:
-        self.lock: asyncio.Lock = lock
-        self._unlock: bool = True
+RequestKey = Tuple[str, Tuple[Tuple[str, str], ...]]
 
-    def __enter__(self: MU) -> MU:
-        return self
+# the default size of the chunks yielded when streaming a download from the CDN
+CDN_CHUNK_SIZE = 1 << 16
 
-    def defer(self) -> None:
-        self._unlock = False
 
-    def __exit__(
-        self,
-        exc_type: Optional[Type[BE]],
-        exc: Optional[BE],
-        traceback: Optional[TracebackType],
-    ) -> None:
-        if self._unlock:
-            self.lock.release()
+def _request_key(route: Route, params: Optional[Dict[str, Any]]) -> RequestKey:
+    return (route.url, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())))
+
+
+def _url_parents(url: str) -> List[str]:
+    # /guilds/1/webhooks -> [/guilds/1, /guilds]
+    parents = []
+    end = url.rfind("/")
+    while end > len(Route.BASE):
+        parents.append(url[:end])
+        end = url.rfind("/", 0, end)
+    return parents
+
+
+class ResponseCache:
+    """A bounded TTL cache of ``GET`` responses for selected routes.
+
+    Routes are selected by their path template, e.g. ``/guilds/{guild_id}``.
+    Any other request sent through the same client invalidates the cached
+    responses of its URL, the URLs nested under it and its parent URLs.
+
+    Attributes
+    -----------
+    ttls: Dict[:class:`str`, :class:`float`]
+        A mapping of route path templates to the number of seconds their responses are kept.
+    max_size: :class:`int`
+        The maximum number of responses kept.
+    hits: :class:`int`
+        The number of requests answered from the cache.
+    misses: :class:`int`
+        The number of cacheable requests that had to be sent.
+    """
+
+    def __init__(self, ttls: Dict[str, float], *, max_size: int = 1024) -> None:
+        self.ttls: Dict[str, float] = ttls
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._data: OrderedDict[RequestKey, Tuple[float, Any]] = OrderedDict()
+        # every URL prefix -> the keys cached under it, used for invalidation
+        self._index: Dict[str, Set[RequestKey]] = {}
+        # requests currently being fetched -> (the number of fetches, whether they were invalidated meanwhile)
+        self._fetching: Dict[RequestKey, Tuple[int, bool]] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def is_cacheable(self, route: Route) -> bool:
+        return route.method == "GET" and route.path in self.ttls
+
+    def get(self, key: RequestKey) -> Any:
+        # misses are counted by start_fetch, as a request coalesced with another one isn't sent
+        try:
+            expires, data = self._data[key]
+        except KeyError:
+            return MISSING
+
+        if expires <= time.monotonic():
+            self._remove(key)
+            return MISSING
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(data)
+
+    def start_fetch(self, key: RequestKey, *, coalesced: bool = False) -> None:
+        count, invalidated = self._fetching.get(key, (0, False))
+        self._fetching[key] = (count + 1, invalidated)
+        if not coalesced:
+            self.misses += 1
+
+    def _end_fetch(self, key: RequestKey) -> bool:
+        # the entry is shared by the concurrent fetches of the key, the last one to end removes it
+        count, invalidated = self._fetching.pop(key, (1, True))
+        if count > 1:
+            self._fetching[key] = (count - 1, invalidated)
+        return invalidated
+
+    def finish_fetch(self, route: Route, key: RequestKey, data: Any) -> None:
+        invalidated = self._end_fetch(key)
+        if invalidated:
+            # a write went through while this was in flight, so the data might be stale
+            return
+
+        if key in self._data:
+            self._remove(key)
+        elif len(self._data) >= self.max_size:
+            self._remove(next(iter(self._data)))
+
+        self._data[key] = (time.monotonic() + self.ttls[route.path], copy.deepcopy(data))
+        url = key[0]
+        for prefix in (url, *_url_parents(url)):
+            self._index.setdefault(prefix, set()).add(key)
+
+    def cancel_fetch(self, key: RequestKey) -> None:
+        self._end_fetch(key)
+
+    def _remove(self, key: RequestKey) -> None:
+        del self._data[key]
+        url = key[0]
+        for prefix in (url, *_url_parents(url)):
+            keys = self._index.get(prefix)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[prefix]
+
+    def invalidate(self, url: str) -> None:
+        """Drops the cached responses for ``url``, the URLs nested under it and its parent URLs."""
+        parents = _url_parents(url)
+        stale = set(self._index.get(url, ()))
+        for parent in parents:
+            stale.update(k for k in self._index.get(parent, ()) if k[0] == parent)
+
+        for key in stale:
+            self._remove(key)
+
+        if self._fetching:
+            for key, (count, _) in self._fetching.items():
+                fetched = key[0]
+                if fetched == url or fetched.startswith(url + "/") or fetched in parents:
+                    self._fetching[key] = (count, True)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._index.clear()
+        for key, (count, _) in self._fetching.items():
+            self._fetching[key] = (count, True)
 
 
 # For some reason, the Discord voice websocket expects this header to be
@@ -175,27 +302,137 @@ class HTTPClient:
         proxy_auth: Optional[aiohttp.BasicAuth] = None,
         loop: Optional[asyncio.AbstractEventLoop] = None,
         unsync_clock: bool = True,
+        global_rate_limit: Optional[int] = 50,
+        ratelimit_backend: Optional[RatelimitBackend] = None,
+        coalesce_requests: bool = False,
+        response_cache_ttls: Optional[Dict[str, float]] = None,
+        response_cache_size: int = 1024,
+        connection_pool: Optional[ConnectionPoolConfig] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        api_base: Optional[str] = None,
+        gateway_url: Optional[str] = None,
+        gateway_compression: Optional[str] = "zlib-stream",
+        gateway_encoding: str = "json",
     ) -> None:
         self.loop: asyncio.AbstractEventLoop = asyncio.get_event_loop() if loop is None else loop
         self.connector = connector
+        self.connection_pool: Optional[ConnectionPoolConfig] = connection_pool
+        self.connections_opened: int = 0
+        self.connections_reused: int = 0
+        # counted through the session's trace hooks, as aiohttp doesn't expose them
+        self.connections_active: int = 0
+        self.connections_waiting: int = 0
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy()
+        # overrides of Route.BASE and of the gateway URL Discord gives, e.g. to talk to a mock server
+        self.api_base: Optional[str] = api_base.rstrip("/") if api_base else None
+        self.gateway_url: Optional[str] = gateway_url
+        # the transport compression requested when connecting to the gateway
+        self.gateway_compression: Optional[str] = gateway_compression
+        self.gateway_encoding: str = gateway_encoding
         self.__session: aiohttp.ClientSession = MISSING  # filled in static_login
-        self._locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
-        self._global_over: asyncio.Event = asyncio.Event()
-        self._global_over.set()
+        self.ratelimiter: RatelimitBackend = ratelimit_backend or MemoryRatelimitBackend(
+            global_rate_limit=global_rate_limit, loop=self.loop
+        )
         self.token: Optional[str] = None
         self.bot_token: bool = False
         self.proxy: Optional[str] = proxy
         self.proxy_auth: Optional[aiohttp.BasicAuth] = proxy_auth
         self.use_clock: bool = not unsync_clock
+        self.coalesce_requests: bool = coalesce_requests
+        # (url, params) -> the in-flight GET request that identical requests wait on
+        self._inflight: Dict[RequestKey, asyncio.Task[Any]] = {}
+        self.coalesced: int = 0
+        self.metrics: HTTPMetrics = HTTPMetrics()
+        self.response_cache: Optional[ResponseCache] = (
+            ResponseCache(response_cache_ttls, max_size=response_cache_size) if response_cache_ttls else None
+        )
 
         u_agent = "DiscordBot (https://github.com/iDevision/enhanced-discord.py {0}) Python/{1[0]}.{1[1]} aiohttp/{2}"
         self.user_agent: str = u_agent.format(__version__, sys.version_info, aiohttp.__version__)
 
     def recreate(self) -> None:
         if self.__session.closed:
-            self.__session = aiohttp.ClientSession(
-                connector=self.connector, ws_response_class=DiscordClientWebSocketResponse
-            )
+            self.__session = self._create_session()
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        kwargs: Dict[str, Any] = {}
+        connector = self.connector
+        pool = self.connection_pool
+        if pool is not None:
+            if connector is None:
+                # owned by the session, so a new one is made whenever the session is recreated
+                connector = pool.create_connector()
+            kwargs["timeout"] = pool.create_timeout()
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_queued_start.append(self._on_connection_queued_start)
+        trace_config.on_connection_queued_end.append(self._on_connection_queued_end)
+        trace_config.on_connection_create_end.append(self._on_connection_create)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuse)
+        trace_config.on_request_redirect.append(self._on_connection_release)
+        trace_config.on_request_end.append(self._on_request_done)
+        trace_config.on_request_exception.append(self._on_request_done)
+        return aiohttp.ClientSession(
+            connector=connector,
+            ws_response_class=DiscordClientWebSocketResponse,
+            trace_configs=[trace_config],
+            **kwargs,
+        )
+
+    # the context is specific to each request, it records what was counted for it so that it's uncounted once
+
+    async def _on_connection_queued_start(self, session: aiohttp.ClientSession, context: Any, params: Any) -> None:
+        context.waiting = True
+        self.connections_waiting += 1
+
+    async def _on_connection_queued_end(self, session: aiohttp.ClientSession, context: Any, params: Any) -> None:
+        if getattr(context, "waiting", False):
+            context.waiting = False
+            self.connections_waiting -= 1
+
+    async def _on_connection_create(self, session: aiohttp.ClientSession, context: Any, params: Any) -> None:
+        self.connections_opened += 1
+        context.active = True
+        self.connections_active += 1
+
+    async def _on_connection_reuse(self, session: aiohttp.ClientSession, context: Any, params: Any) -> None:
+        self.connections_reused += 1
+        context.active = True
+        self.connections_active += 1
+
+    async def _on_connection_release(self, session: aiohttp.ClientSession, context: Any, params: Any) -> None:
+        if getattr(context, "active", False):
+            context.active = False
+            self.connections_active -= 1
+
+    async def _on_request_done(self, session: aiohttp.ClientSession, context: Any, params: Any) -> None:
+        # a request cancelled while waiting for a connection doesn't get to the end of the queue
+        await self._on_connection_queued_end(session, context, params)
+        await self._on_connection_release(session, context, params)
+
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        return self.__session or None
+
+    def pool_stats(self) -> ConnectionPoolStats:
+        connector = self.__session.connector if self.__session else None
+        # aiohttp neither exposes the idle connections nor reports them through trace hooks,
+        # so they're read from its internals, and reported as 0 if those change
+        idle = getattr(connector, "_conns", None)
+        try:
+            idle_count = sum(len(conns) for conns in idle.values())  # type: ignore
+        except (AttributeError, TypeError):
+            idle_count = 0
+
+        return ConnectionPoolStats(
+            limit=connector.limit if connector is not None else 0,
+            limit_per_host=connector.limit_per_host if connector is not None else 0,
+            active=self.connections_active,
+            idle=idle_count,
+            waiting=self.connections_waiting,
+            opened=self.connections_opened,
+            reused=self.connections_reused,
+        )
 
     async def ws_connect(self, url: str, *, compress: int = 0) -> Any:
         kwargs = {
@@ -212,23 +449,99 @@ class HTTPClient:
 
         return await self.__session.ws_connect(url, **kwargs)
 
+    @property
+    def bucket_count(self) -> int:
+        # the number of rate limit buckets currently tracked, idle ones are evicted over time
+        return self.ratelimiter.bucket_count
+
+    @property
+    def global_ratelimit(self) -> Optional[GlobalRatelimit]:
+        return getattr(self.ratelimiter, "global_ratelimit", None)
+
     async def request(
         self,
         route: Route,
         *,
         files: Optional[Sequence[File]] = None,
         form: Optional[Iterable[Dict[str, Any]]] = None,
+        priority: int = 0,
+        **kwargs: Any,
+    ) -> Any:
+        kwargs["priority"] = priority
+
+        cache = self.response_cache
+        if cache is not None:
+            if cache.is_cacheable(route):
+                return await self._cached_request(cache, route, **kwargs)
+            elif route.method != "GET":
+                try:
+                    return await self._request(route, files=files, form=form, **kwargs)
+                finally:
+                    cache.invalidate(route.url)
+
+        if self.coalesce_requests and route.method == "GET":
+            return await self._coalesced_request(route, **kwargs)
+
+        return await self._request(route, files=files, form=form, **kwargs)
+
+    async def _cached_request(self, cache: ResponseCache, route: Route, **kwargs: Any) -> Any:
+        key = _request_key(route, kwargs.get("params"))
+        data = cache.get(key)
+        if data is not MISSING:
+            return data
+
+        cache.start_fetch(key, coalesced=self.coalesce_requests and key in self._inflight)
+        try:
+            if self.coalesce_requests:
+                data = await self._coalesced_request(route, **kwargs)
+            else:
+                data = await self._request(route, **kwargs)
+        except BaseException:
+            cache.cancel_fetch(key)
+            raise
+
+        cache.finish_fetch(route, key, data)
+        return data
+
+    async def _coalesced_request(self, route: Route, **kwargs: Any) -> Any:
+        key = _request_key(route, kwargs.get("params"))
+        try:
+            task = self._inflight[key]
+        except KeyError:
+            task = self.loop.create_task(self._request(route, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._request_done(key, t))
+            follower = False
+        else:
+            self.coalesced += 1
+            follower = True
+
+        # the request carries on for the other callers if this one is cancelled
+        data = await asyncio.shield(task)
+        if follower:
+            # don't let callers mutate each other's payloads
+            return copy.deepcopy(data)
+        return data
+
+    def _request_done(self, key: RequestKey, task: asyncio.Task[Any]) -> None:
+        self._inflight.pop(key, None)
+        # every caller might have been cancelled, in which case nobody else retrieves it
+        if not task.cancelled():
+            task.exception()
+
+    async def _request(
+        self,
+        route: Route,
+        *,
+        files: Optional[Sequence[File]] = None,
+        form: Optional[Iterable[Dict[str, Any]]] = None,
+        priority: int = 0,
         **kwargs: Any,
     ) -> Any:
-        bucket = route.bucket
         method = route.method
         url = route.url
-
-        lock = self._locks.get(bucket)
-        if lock is None:
-            lock = asyncio.Lock()
-            if bucket is not None:
-                self._locks[bucket] = lock
+        if self.api_base is not None:
+            url = self.api_base + url[len(Route.BASE) :]
 
         # header creation
         headers: Dict[str, str] = {
@@ -258,15 +571,28 @@ class HTTPClient:
         if self.proxy_auth is not None:
             kwargs["proxy_auth"] = self.proxy_auth
 
-        if not self._global_over.is_set():
-            # wait until the global lock is complete
-            await self._global_over.wait()
-
         response: Optional[aiohttp.ClientResponse] = None
         data: Optional[Union[Dict[str, Any], str]] = None
-        await lock.acquire()
-        with MaybeUnlock(lock) as maybe_lock:
-            for tries in range(5):
+        ratelimiter = self.ratelimiter
+        metrics = self.metrics
+        loop = self.loop
+        route_key = route.key
+        retry_policy = self.retry_policy
+        if retry_policy.budget is not None:
+            retry_policy.budget.deposit()
+
+        # Discord doesn't apply the global rate limit to interaction endpoints,
+        # so interaction responses never wait behind other requests for it
+        global_limited = route.interaction_token is None
+
+        started = waiting_since = loop.time()
+        async with await ratelimiter.acquire(route_key, route.major_parameters) as lease:
+            for tries in range(retry_policy.max_attempts):
+                if tries:
+                    waiting_since = loop.time()
+                if global_limited:
+                    await ratelimiter.acquire_global(priority)
+
                 if files:
                     for f in files:
                         f.reset(seek=tries)
@@ -277,6 +603,8 @@ class HTTPClient:
                         form_data.add_field(**params)
                     kwargs["data"] = form_data
 
+                sent_at = loop.time()
+                recorded = False
                 try:
                     async with self.__session.request(method, url, **kwargs) as response:
                         _log.debug("%s %s with %s has returned %s", method, url, kwargs.get("data"), response.status)
@@ -284,14 +612,27 @@ class HTTPClient:
                         # even errors have text involved in them so this is safe to call
                         data = await json_or_text(response)
 
+                        scope = None
+                        if response.status == 429:
+                            scope = response.headers.get("X-RateLimit-Scope")
+                            if scope is None:
+                                scope = "global" if isinstance(data, dict) and data.get("global") else "user"
+                        metrics.record(
+                            RequestRecord(
+                                route=route_key,
+                                status=response.status,
+                                latency=loop.time() - sent_at,
+                                wait=sent_at - waiting_since,
+                                attempt=tries,
+                                ratelimit_scope=scope,
+                            )
+                        )
+                        recorded = True
+
                         # check if we have rate limit header information
-                        remaining = response.headers.get("X-Ratelimit-Remaining")
-                        if remaining == "0" and response.status != 429:
-                            # we've depleted our current bucket
-                            delta = utils._parse_ratelimit_header(response, use_clock=self.use_clock)
-                            _log.debug("A rate limit bucket has been exhausted (bucket: %s, retry: %s).", bucket, delta)
-                            maybe_lock.defer()
-                            self.loop.call_later(delta, lock.release)
+                        ratelimit_headers = RatelimitHeaders.from_response(response, use_clock=self.use_clock)
+                        if ratelimit_headers is not None and response.status != 429:
+                            await lease.update(ratelimit_headers)
 
                         # the request was successful so just return the text/json
                         if 300 > response.status >= 200:
@@ -308,28 +649,40 @@ class HTTPClient:
 
                             # sleep a bit
                             retry_after: float = data["retry_after"]
-                            _log.warning(fmt, retry_after, bucket)
-
-                            # check if it's a global rate limit
                             is_global = data.get("global", False)
-                            if is_global:
-                                _log.warning("Global rate limit has been hit. Retrying in %.2f seconds.", retry_after)
-                                self._global_over.clear()
+                            if not is_global:
+                                # hold back the other requests of the bucket until it resets, this one keeps its slot
+                                exhausted = RatelimitHeaders(
+                                    bucket=ratelimit_headers.bucket if ratelimit_headers is not None else None,
+                                    limit=ratelimit_headers.limit if ratelimit_headers is not None else 1,
+                                    remaining=0,
+                                    reset_after=retry_after,
+                                )
+                                await lease.update(exhausted)
+
+                            deadline = retry_policy.deadline
+                            if deadline is not None and loop.time() - started + retry_after > deadline:
+                                raise HTTPException(response, data)
 
-                            await asyncio.sleep(retry_after)
-                            _log.debug("Done sleeping for the rate limit. Retrying...")
+                            _log.warning(fmt, retry_after, lease.key)
 
-                            # release the global lock now that the
-                            # global rate limit has passed
+                            # check if it's a global rate limit
                             if is_global:
-                                self._global_over.set()
-                                _log.debug("Global rate limit is now over.")
+                                # every request, this one included, waits for it to pass before the next attempt
+                                _log.warning("Global rate limit has been hit. Retrying in %.2f seconds.", retry_after)
+                                await ratelimiter.block_global(retry_after)
+                            else:
+                                await asyncio.sleep(retry_after)
+                                _log.debug("Done sleeping for the rate limit. Retrying...")
 
                             continue
 
-                        # we've received a 500, 502, or 504, unconditional retry
-                        if response.status in {500, 502, 504}:
-                            await asyncio.sleep(1 + tries * 2)
+                        delay = retry_policy.next_delay(method, tries, loop.time() - started, status=response.status)
+                        if delay is not None:
+                            _log.debug(
+                                "%s %s has returned %s, retrying in %.2f seconds.", method, url, response.status, delay
+                            )
+                            await asyncio.sleep(delay)
                             continue
 
                         # the usual error cases
@@ -343,12 +696,26 @@ class HTTPClient:
                             raise HTTPException(response, data)
 
                 # This is handling exceptions from the request
-                except OSError as e:
-                    # Connection reset by peer
-                    if tries < 4 and e.errno in (54, 10054):
-                        await asyncio.sleep(1 + tries * 2)
-                        continue
-                    raise
+                except (OSError, aiohttp.ServerDisconnectedError) as e:
+                    if not recorded:
+                        metrics.record(
+                            RequestRecord(
+                                route=route_key,
+                                status=None,
+                                latency=loop.time() - sent_at,
+                                wait=sent_at - waiting_since,
+                                attempt=tries,
+                                ratelimit_scope=None,
+                            )
+                        )
+
+                    delay = retry_policy.next_delay(method, tries, loop.time() - started, error=e)
+                    if delay is None:
+                        raise
+
+                    _log.debug("%s %s has failed with %r, retrying in %.2f seconds.", method, url, e, delay)
+                    await asyncio.sleep(delay)
+                    continue
 
             if response is not None:
                 # We've run out of retries, raise.
@@ -370,19 +737,30 @@ class HTTPClient:
             else:
                 raise HTTPException(resp, "failed to get asset")
 
+    async def stream_from_cdn(self, url: str, *, chunk_size: int = CDN_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        async with self.__session.get(url) as resp:
+            if resp.status == 200:
+                async for chunk in resp.content.iter_chunked(chunk_size):
+                    yield chunk
+            elif resp.status == 404:
+                raise NotFound(resp, "asset not found")
+            elif resp.status == 403:
+                raise Forbidden(resp, "cannot retrieve asset")
+            else:
+                raise HTTPException(resp, "failed to get asset")
+
     # state management
 
     async def close(self) -> None:
         if self.__session:
             await self.__session.close()
+        await self.ratelimiter.close()
 
     # login management
 
     async def static_login(self, token: str) -> user.User:
         # Necessary to get aiohttp to stop complaining about session creation
-        self.__session = aiohttp.ClientSession(
-            connector=self.connector, ws_response_class=DiscordClientWebSocketResponse
-        )
+        self.__session = self._create_session()
         old_token = self.token
         self.token = token
 
@@ -510,8 +888,8 @@ class HTTPClient:
             form.append(
                 {
                     "name": "file",
-                    "value": file.fp,
-                    "filename": file.filename,
+                    "value": file,
+                    "filename": file.filename or "file",
                     "content_type": "application/octet-stream",
                 }
             )
@@ -520,8 +898,8 @@ class HTTPClient:
                 form.append(
                     {
                         "name": f"file{index}",
-                        "value": file.fp,
-                        "filename": file.filename,
+                        "value": file,
+                        "filename": file.filename or f"file{index}",
                         "content_type": "application/octet-stream",
                     }
                 )
@@ -1219,6 +1597,9 @@ class HTTPClient:
     def create_guild_sticker(
         self, guild_id: Snowflake, payload: sticker.CreateGuildSticker, file: File, reason: str
     ) -> Response[sticker.GuildSticker]:
+        if file.fp is None:
+            raise InvalidArgument("Stickers cannot be uploaded from an asynchronous iterable")
+
         initial_bytes = file.fp.read(16)
 
         try:
@@ -1234,8 +1615,8 @@ class HTTPClient:
         form: List[Dict[str, Any]] = [
             {
                 "name": "file",
-                "value": file.fp,
-                "filename": file.filename,
+                "value": file,
+                "filename": file.filename or "file",
                 "content_type": mime_type,
             }
         ]
@@ -1748,8 +2129,8 @@ class HTTPClient:
             form.append(
                 {
                     "name": "file",
-                    "value": file.fp,
-                    "filename": file.filename,
+                    "value": file,
+                    "filename": file.filename or "file",
                     "content_type": "application/octet-stream",
                 }
             )
@@ -1939,28 +2320,30 @@ class HTTPClient:
     def application_info(self) -> Response[appinfo.AppInfo]:
         return self.request(Route("GET", "/oauth2/applications/@me"))
 
-    async def get_gateway(self, *, encoding: str = "json", zlib: bool = True) -> str:
+    def _format_gateway(self, url: str, encoding: str, compress: Optional[str]) -> str:
+        if encoding is MISSING:
+            encoding = self.gateway_encoding
+        if compress is MISSING:
+            compress = self.gateway_compression
+        value = f"{self.gateway_url or url}?encoding={encoding}&v=9"
+        if compress:
+            value += f"&compress={compress}"
+        return value
+
+    async def get_gateway(self, *, encoding: str = MISSING, compress: Optional[str] = MISSING) -> str:
         try:
             data = await self.request(Route("GET", "/gateway"))
         except HTTPException as exc:
             raise GatewayNotFound() from exc
-        if zlib:
-            value = "{0}?encoding={1}&v=9&compress=zlib-stream"
-        else:
-            value = "{0}?encoding={1}&v=9"
-        return value.format(data["url"], encoding)
+        return self._format_gateway(data["url"], encoding, compress)
 
-    async def get_bot_gateway(self, *, encoding: str = "json", zlib: bool = True) -> Tuple[int, str]:
+    async def get_bot_gateway(self, *, encoding: str = MISSING, compress: Optional[str] = MISSING) -> Tuple[int, str]:
         try:
             data = await self.request(Route("GET", "/gateway/bot"))
         except HTTPException as exc:
             raise GatewayNotFound() from exc
 
-        if zlib:
-            value = "{0}?encoding={1}&v=9&compress=zlib-stream"
-        else:
-            value = "{0}?encoding={1}&v=9"
-        return data["shards"], value.format(data["url"], encoding)
+        return data["shards"], self._format_gateway(data["url"], encoding, compress)
 
     def get_user(self, user_id: Snowflake) -> Response[user.User]:
         return self.request(Route("GET", "/users/{user_id}", user_id=user_id))
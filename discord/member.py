@@ -68,6 +68,32 @@ if TYPE_CHECKING:
 
     VocalGuildChannel = Union[VoiceChannel, StageChannel]
 
+# Large guilds have millions of members, so the values most of them have in common are shared
+# and mappings are replaced instead of being modified.
+_OFFLINE: Dict[Optional[str], str] = {None: "offline"}
+_NO_ROLES: utils.SnowflakeList = utils.SnowflakeList((), is_sorted=True)
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+def _parse_timestamp(timestamp: Optional[str]) -> Optional[int]:
+    # timestamps are kept as microseconds since the epoch, smaller than a datetime, until they're accessed
+    if not timestamp:
+        return None
+    return (utils.parse_time(timestamp) - _EPOCH) // _MICROSECOND
+
+
+def _to_datetime(timestamp: Optional[int]) -> Optional[datetime.datetime]:
+    if timestamp is None:
+        return None
+    return _EPOCH + datetime.timedelta(microseconds=timestamp)
+
+
+def _parse_roles(roles: List[str]) -> utils.SnowflakeList:
+    if not roles:
+        return _NO_ROLES
+    return utils.SnowflakeList(map(int, roles))
+
 
 class VoiceState:
     """Represents a Discord user's voice state.
@@ -234,9 +260,6 @@ class Member(discord.abc.Messageable, _UserTag):
 
     Attributes
     ----------
-    joined_at: Optional[:class:`datetime.datetime`]
-        An aware datetime object that specifies the date and time in UTC that the member joined the guild.
-        If the member left and rejoined the guild, this will be the latest date. In certain cases, this can be ``None``.
     activities: Tuple[Union[:class:`BaseActivity`, :class:`Spotify`]]
         The activities that the user is currently doing.
 
@@ -254,23 +277,16 @@ class Member(discord.abc.Messageable, _UserTag):
         Whether the member is pending member verification.
 
         .. versionadded:: 1.6
-    premium_since: Optional[:class:`datetime.datetime`]
-        An aware datetime object that specifies the date and time in UTC when the member used their
-        "Nitro boost" on the guild, if available. This could be ``None``.
-    timeout_until: Optional[:class:`datetime.datetime`]
-        An aware datetime object that specifies the date and time in UTC until the member is timed out.
-
-        .. versionadded:: 2.0
     """
 
     __slots__ = (
-        "joined_at",
-        "premium_since",
+        "_joined_at",
+        "_premium_since",
         "activities",
         "guild",
         "pending",
         "nick",
-        "timeout_until",
+        "_timeout_until",
         "_roles",
         "_client_status",
         "_user",
@@ -298,16 +314,29 @@ class Member(discord.abc.Messageable, _UserTag):
     def __init__(self, *, data: MemberWithUserPayload, guild: Guild, state: ConnectionState):
         self._state: ConnectionState = state
         self._user: User = state.store_user(data["user"])
+        state._ref_user(self._user.id)
         self.guild: Guild = guild
-        self.joined_at: Optional[datetime.datetime] = utils.parse_time(data.get("joined_at"))
-        self.premium_since: Optional[datetime.datetime] = utils.parse_time(data.get("premium_since"))
-        self._roles: utils.SnowflakeList = utils.SnowflakeList(map(int, data["roles"]))
-        self._client_status: Dict[Optional[str], str] = {None: "offline"}
+        self._joined_at: Optional[int] = _parse_timestamp(data.get("joined_at"))
+        self._premium_since: Optional[int] = _parse_timestamp(data.get("premium_since"))
+        self._roles: utils.SnowflakeList = _parse_roles(data["roles"])
+        self._client_status: Dict[Optional[str], str] = _OFFLINE
         self.activities: Tuple[ActivityTypes, ...] = tuple()
         self.nick: Optional[str] = data.get("nick", None)
         self.pending: bool = data.get("pending", False)
         self._avatar: Optional[str] = data.get("avatar")
-        self.timeout_until: Optional[datetime.datetime] = utils.parse_time(data.get("communication_disabled_until"))
+        self._timeout_until: Optional[int] = _parse_timestamp(data.get("communication_disabled_until"))
+
+    def __del__(self) -> None:
+        try:
+            self._state._unref_user(self._user.id)
+        except Exception:
+            pass
+
+    def __setstate__(self, state: Tuple[None, Dict[str, Any]]) -> None:
+        # copies and unpickled members refer to their user as well
+        for attr, value in state[1].items():
+            setattr(self, attr, value)
+        self._state._ref_user(self._user.id)
 
     def __str__(self) -> str:
         return str(self._user)
@@ -337,9 +366,9 @@ class Member(discord.abc.Messageable, _UserTag):
         return cls(data=data, guild=message.guild, state=message._state)  # type: ignore
 
     def _update_from_message(self, data: MemberPayload) -> None:
-        self.joined_at = utils.parse_time(data.get("joined_at"))
-        self.premium_since = utils.parse_time(data.get("premium_since"))
-        self._roles = utils.SnowflakeList(map(int, data["roles"]))
+        self._joined_at = _parse_timestamp(data.get("joined_at"))
+        self._premium_since = _parse_timestamp(data.get("premium_since"))
+        self._roles = _parse_roles(data["roles"])
         self.nick = data.get("nick", None)
         self.pending = data.get("pending", False)
 
@@ -360,21 +389,23 @@ class Member(discord.abc.Messageable, _UserTag):
     def _copy(cls: Type[M], member: M) -> M:
         self: M = cls.__new__(cls)  # to bypass __init__
 
-        self._roles = utils.SnowflakeList(member._roles, is_sorted=True)
-        self.joined_at = member.joined_at
-        self.premium_since = member.premium_since
-        self._client_status = member._client_status.copy()
+        # the roles and client status are replaced rather than modified, so they can be shared
+        self._roles = member._roles
+        self._joined_at = member._joined_at
+        self._premium_since = member._premium_since
+        self._client_status = member._client_status
         self.guild = member.guild
         self.nick = member.nick
         self.pending = member.pending
         self.activities = member.activities
         self._state = member._state
         self._avatar = member._avatar
-        self.timeout_until = member.timeout_until
+        self._timeout_until = member._timeout_until
 
         # Reference will not be copied unless necessary by PRESENCE_UPDATE
         # See below
         self._user = member._user
+        self._state._ref_user(self._user.id)
         return self
 
     async def _get_channel(self):
@@ -394,17 +425,18 @@ class Member(discord.abc.Messageable, _UserTag):
         except KeyError:
             pass
 
-        self.premium_since = utils.parse_time(data.get("premium_since"))
-        self._roles = utils.SnowflakeList(map(int, data["roles"]))
+        self._premium_since = _parse_timestamp(data.get("premium_since"))
+        self._roles = _parse_roles(data["roles"])
         self._avatar = data.get("avatar")
-        self.timeout_until = utils.parse_time(data.get("communication_disabled_until"))
+        self._timeout_until = _parse_timestamp(data.get("communication_disabled_until"))
 
     def _presence_update(self, data: PartialPresenceUpdate, user: UserPayload) -> Optional[Tuple[User, User]]:
         self.activities = tuple(map(create_activity, data["activities"]))
-        self._client_status = {
+        client_status = {
             sys.intern(key): sys.intern(value) for key, value in data.get("client_status", {}).items()  # type: ignore
         }
-        self._client_status[None] = sys.intern(data["status"])
+        client_status[None] = sys.intern(data["status"])
+        self._client_status = _OFFLINE if client_status == _OFFLINE else client_status
 
         if len(user) > 1:
             return self._update_inner_user(user)
@@ -414,7 +446,7 @@ class Member(discord.abc.Messageable, _UserTag):
         u = self._user
         original = (u.name, u._avatar, u.discriminator, u._public_flags)
         # These keys seem to always be available
-        modified = (user["username"], user["avatar"], user["discriminator"], user.get("public_flags", 0))
+        modified = (user["username"], user["avatar"], sys.intern(user["discriminator"]), user.get("public_flags", 0))
         if original != modified:
             to_return = User._copy(self._user)
             u.name, u._avatar, u.discriminator, u._public_flags = modified
@@ -437,7 +469,7 @@ class Member(discord.abc.Messageable, _UserTag):
     @status.setter
     def status(self, value: Status) -> None:
         # internal use only
-        self._client_status[None] = str(value)
+        self._client_status = {**self._client_status, None: str(value)}
 
     @property
     def mobile_status(self) -> Status:
@@ -627,13 +659,38 @@ class Member(discord.abc.Messageable, _UserTag):
         """Optional[:class:`VoiceState`]: Returns the member's current voice state."""
         return self.guild._voice_state_for(self._user.id)
 
+    @property
+    def joined_at(self) -> Optional[datetime.datetime]:
+        """Optional[:class:`datetime.datetime`]: An aware datetime object that specifies the date and time in UTC
+        that the member joined the guild. If the member left and rejoined the guild, this will be the latest date.
+        In certain cases, this can be ``None``.
+        """
+        return _to_datetime(self._joined_at)
+
+    @property
+    def premium_since(self) -> Optional[datetime.datetime]:
+        """Optional[:class:`datetime.datetime`]: An aware datetime object that specifies the date and time in UTC
+        when the member used their "Nitro boost" on the guild, if available. This could be ``None``.
+        """
+        return _to_datetime(self._premium_since)
+
+    @property
+    def timeout_until(self) -> Optional[datetime.datetime]:
+        """Optional[:class:`datetime.datetime`]: An aware datetime object that specifies the date and time in UTC
+        until the member is timed out.
+
+        .. versionadded:: 2.0
+        """
+        return _to_datetime(self._timeout_until)
+
     @property
     def timed_out(self) -> bool:
         """:class:`bool`: Returns whether the member is timed out.
 
         .. versionadded:: 2.0
         """
-        return self.timeout_until is not None and self.timeout_until > utils.utcnow()
+        timeout_until = self.timeout_until
+        return timeout_until is not None and timeout_until > utils.utcnow()
 
     async def ban(
         self,
@@ -36,6 +36,7 @@ from typing import (
     List,
     Optional,
     Any,
+    AsyncIterator,
     Callable,
     Tuple,
     ClassVar,
@@ -206,11 +207,14 @@ class Attachment(Hashable):
         *,
         seek_begin: bool = True,
         use_cached: bool = False,
+        chunk_size: int = 65536,
     ) -> int:
         """|coro|
 
         Saves this attachment into a file-like object.
 
+        The attachment is written as it is downloaded, so it is never held in memory as a whole.
+
         Parameters
         -----------
         fp: Union[:class:`io.BufferedIOBase`, :class:`os.PathLike`]
@@ -227,6 +231,10 @@ class Attachment(Hashable):
             after the message is deleted. Note that this can still fail to download
             deleted attachments if too much time has passed and it does not work
             on some types of attachments.
+        chunk_size: :class:`int`
+            The maximum number of bytes downloaded before being written.
+
+            .. versionadded:: 2.0
 
         Raises
         --------
@@ -240,15 +248,49 @@ class Attachment(Hashable):
         :class:`int`
             The number of bytes written.
         """
-        data = await self.read(use_cached=use_cached)
-        if isinstance(fp, io.BufferedIOBase):
-            written = fp.write(data)
-            if seek_begin:
-                fp.seek(0)
-            return written
-        else:
-            with open(fp, "wb") as f:
-                return f.write(data)
+        chunks = self.iter_chunks(use_cached=use_cached, chunk_size=chunk_size)
+        return await utils._save_chunks(chunks, fp, seek_begin=seek_begin)
+
+    async def iter_chunks(self, *, use_cached: bool = False, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+        """Retrieves the content of this attachment in chunks, without holding all of it in memory.
+
+        The download starts when the iterator is first advanced.
+
+        .. versionadded:: 2.0
+
+        Examples
+        ---------
+
+        Usage ::
+
+            async for chunk in attachment.iter_chunks():
+                await stream.write(chunk)
+
+        Parameters
+        -----------
+        use_cached: :class:`bool`
+            Whether to use :attr:`proxy_url` rather than :attr:`url` when downloading
+            the attachment. See :meth:`read` for more information.
+        chunk_size: :class:`int`
+            The maximum number of bytes in each chunk.
+
+        Raises
+        ------
+        HTTPException
+            Downloading the attachment failed.
+        Forbidden
+            You do not have permissions to access this attachment
+        NotFound
+            The attachment was deleted.
+
+        Yields
+        -------
+        :class:`bytes`
+            A chunk of the contents of the attachment.
+        """
+        url = self.proxy_url if use_cached else self.url
+        async for chunk in self._http.stream_from_cdn(url, chunk_size=chunk_size):
+            yield chunk
 
     async def read(self, *, use_cached: bool = False) -> bytes:
         """|coro|
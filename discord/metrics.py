@@ -0,0 +1,407 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+__all__ = (
+    "LatencyHistogram",
+    "RequestRecord",
+    "RouteMetrics",
+    "HTTPMetrics",
+    "GatewayStats",
+)
+
+_log = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """A histogram of durations with fixed bucket boundaries.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    bounds: Tuple[:class:`float`, ...]
+        The upper bound, in seconds, of every bucket but the last one, which is unbounded.
+    counts: List[:class:`int`]
+        The number of observations in each bucket.
+    count: :class:`int`
+        The total number of observations.
+    total: :class:`float`
+        The sum of every observation.
+    max: :class:`float`
+        The largest observation.
+    """
+
+    DEFAULT_BOUNDS: Tuple[float, ...] = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BOUNDS) -> None:
+        self.bounds: Tuple[float, ...] = bounds
+        self.counts: List[int] = [0] * (len(bounds) + 1)
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def __repr__(self) -> str:
+        return f"<LatencyHistogram count={self.count} mean={self.mean:.4f} max={self.max:.4f}>"
+
+    def observe(self, value: float) -> None:
+        """Records a duration, in seconds."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        """:class:`float`: The average observation, or ``0.0`` if there are none."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Estimates a percentile from the buckets.
+
+        The upper bound of the bucket the percentile falls in is returned,
+        or :attr:`max` for the last bucket.
+
+        Parameters
+        -----------
+        percent: :class:`float`
+            The percentile to compute, between 0 and 100.
+        """
+        if not self.count:
+            return 0.0
+
+        target = self.count * percent / 100
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "buckets": {str(bound): count for bound, count in zip(self.bounds, self.counts)},
+            "overflow": self.counts[-1],
+            "count": self.count,
+            "total": self.total,
+            "mean": self.mean,
+            "max": self.max,
+        }
+
+
+class RequestRecord(NamedTuple):
+    """Describes a single attempt at sending a REST request.
+
+    These are passed to the hooks registered with :meth:`HTTPMetrics.add_hook`.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    route: :class:`str`
+        The method and path template of the route, e.g. ``GET /channels/{channel_id}``.
+    status: Optional[:class:`int`]
+        The status code of the response, or ``None`` if no response was received.
+    latency: :class:`float`
+        The number of seconds between sending the request and reading its response.
+    wait: :class:`float`
+        The number of seconds spent waiting on rate limits before sending the request.
+    attempt: :class:`int`
+        The attempt number, starting at ``0``. Anything above is a retry.
+    ratelimit_scope: Optional[:class:`str`]
+        The scope of the rate limit that was hit if the response was a 429,
+        one of ``'user'``, ``'global'`` or ``'shared'``.
+    """
+
+    route: str
+    status: Optional[int]
+    latency: float
+    wait: float
+    attempt: int
+    ratelimit_scope: Optional[str]
+
+
+class RouteMetrics:
+    """The metrics gathered for a single REST route.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    requests: :class:`int`
+        The number of requests sent, not counting retries.
+    retries: :class:`int`
+        The number of times a request was retried.
+    errors: :class:`int`
+        The number of attempts that failed without a response.
+    statuses: Dict[:class:`int`, :class:`int`]
+        The number of responses for each status code.
+    ratelimited: Dict[:class:`str`, :class:`int`]
+        The number of 429 responses for each rate limit scope.
+    latency: :class:`LatencyHistogram`
+        The time between sending a request and reading its response.
+    wait: :class:`LatencyHistogram`
+        The time spent waiting on rate limits before sending a request.
+    """
+
+    __slots__ = ("requests", "retries", "errors", "statuses", "ratelimited", "latency", "wait")
+
+    def __init__(self) -> None:
+        self.requests: int = 0
+        self.retries: int = 0
+        self.errors: int = 0
+        self.statuses: Dict[int, int] = {}
+        self.ratelimited: Dict[str, int] = {}
+        self.latency: LatencyHistogram = LatencyHistogram()
+        self.wait: LatencyHistogram = LatencyHistogram()
+
+    def __repr__(self) -> str:
+        return f"<RouteMetrics requests={self.requests} retries={self.retries} latency={self.latency!r}>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "errors": self.errors,
+            "statuses": dict(self.statuses),
+            "ratelimited": dict(self.ratelimited),
+            "latency": self.latency.to_dict(),
+            "wait": self.wait.to_dict(),
+        }
+
+
+class HTTPMetrics:
+    """Collects metrics about the REST requests sent by a :class:`Client`.
+
+    This can be retrieved through :attr:`Client.http_metrics`.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    routes: Dict[:class:`str`, :class:`RouteMetrics`]
+        The metrics of every route requests were sent to, keyed by their method and path template.
+    """
+
+    def __init__(self) -> None:
+        self.routes: Dict[str, RouteMetrics] = {}
+        self._hooks: List[Callable[[RequestRecord], Any]] = []
+
+    def __repr__(self) -> str:
+        return f"<HTTPMetrics routes={len(self.routes)}>"
+
+    def add_hook(self, hook: Callable[[RequestRecord], Any]) -> None:
+        """Registers a function called with a :class:`RequestRecord` after every attempt at sending a request.
+
+        Hooks are called synchronously from the request, so they should return quickly.
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[RequestRecord], Any]) -> None:
+        """Removes a hook registered with :meth:`add_hook`. Does nothing if it isn't registered."""
+        try:
+            self._hooks.remove(hook)
+        except ValueError:
+            pass
+
+    def record(self, record: RequestRecord) -> None:
+        try:
+            metrics = self.routes[record.route]
+        except KeyError:
+            metrics = self.routes[record.route] = RouteMetrics()
+
+        if record.attempt == 0:
+            metrics.requests += 1
+        else:
+            metrics.retries += 1
+
+        metrics.wait.observe(record.wait)
+        if record.status is None:
+            metrics.errors += 1
+        else:
+            metrics.statuses[record.status] = metrics.statuses.get(record.status, 0) + 1
+            metrics.latency.observe(record.latency)
+
+        if record.ratelimit_scope is not None:
+            scope = record.ratelimit_scope
+            metrics.ratelimited[scope] = metrics.ratelimited.get(scope, 0) + 1
+
+        for hook in self._hooks:
+            try:
+                hook(record)
+            except Exception:
+                _log.exception("Ignoring exception in HTTP metrics hook %r", hook)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Returns a copy of the metrics of every route as plain dictionaries, suitable for serialising."""
+        return {route: metrics.to_dict() for route, metrics in self.routes.items()}
+
+    def reset(self) -> None:
+        """Clears every metric gathered so far."""
+        self.routes.clear()
+
+
+class GatewayStats:
+    """Counters describing the traffic received and the work done by a single shard's gateway connection.
+
+    They are kept across reconnections. These can be retrieved through
+    :attr:`Client.gateway_stats` or :attr:`ShardInfo.gateway_stats`.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    messages_received: :class:`int`
+        The number of complete messages received.
+    bytes_received: :class:`int`
+        The number of bytes received over the connection, before decompression.
+    bytes_inflated: :class:`int`
+        The number of bytes of the messages once decompressed.
+    inflate_time: :class:`float`
+        The number of seconds spent decompressing messages.
+    decode_time: :class:`float`
+        The number of seconds spent decoding messages from JSON or ETF.
+    events: Dict[:class:`str`, :class:`int`]
+        The number of dispatch events received, keyed by their type, e.g. ``MESSAGE_CREATE``.
+    parse_time: Dict[:class:`str`, :class:`float`]
+        The number of seconds spent processing dispatch events into the cache and models, keyed by their type.
+    handlers: Dict[:class:`str`, :class:`int`]
+        The number of event handlers and listeners that dispatch events were fanned out to, keyed by their type.
+    heartbeat_latencies: Deque[:class:`float`]
+        The latencies of the last 100 heartbeats, in seconds.
+    identifies: :class:`int`
+        The number of times the shard identified, starting a new session.
+    resumes: :class:`int`
+        The number of times the shard tried to resume a session.
+    """
+
+    WINDOW: int = 60
+
+    __slots__ = (
+        "messages_received",
+        "bytes_received",
+        "bytes_inflated",
+        "inflate_time",
+        "decode_time",
+        "events",
+        "parse_time",
+        "handlers",
+        "heartbeat_latencies",
+        "identifies",
+        "resumes",
+        "_window",
+    )
+
+    def __init__(self) -> None:
+        self.messages_received: int = 0
+        self.bytes_received: int = 0
+        self.bytes_inflated: int = 0
+        self.inflate_time: float = 0.0
+        self.decode_time: float = 0.0
+        self.events: Dict[str, int] = {}
+        self.parse_time: Dict[str, float] = {}
+        self.handlers: Dict[str, int] = {}
+        self.heartbeat_latencies: Deque[float] = deque(maxlen=100)
+        self.identifies: int = 0
+        self.resumes: int = 0
+        # the number of events of each type received in each of the last WINDOW seconds
+        self._window: Deque[Tuple[int, Dict[str, int]]] = deque(maxlen=self.WINDOW)
+
+    def __repr__(self) -> str:
+        return (
+            f"<GatewayStats messages_received={self.messages_received} bytes_received={self.bytes_received} "
+            f"bytes_inflated={self.bytes_inflated} events={sum(self.events.values())}>"
+        )
+
+    @property
+    def compression_ratio(self) -> float:
+        """:class:`float`: How many times smaller the traffic was thanks to compression, or ``1.0`` if nothing was received."""
+        return self.bytes_inflated / self.bytes_received if self.bytes_received else 1.0
+
+    @property
+    def latency(self) -> float:
+        """:class:`float`: The latency of the last heartbeat, or ``inf`` if none was acknowledged yet."""
+        return self.heartbeat_latencies[-1] if self.heartbeat_latencies else float("inf")
+
+    def record_event(self, event: str, parse_time: float, handlers: int) -> None:
+        self.events[event] = self.events.get(event, 0) + 1
+        self.parse_time[event] = self.parse_time.get(event, 0.0) + parse_time
+        if handlers:
+            self.handlers[event] = self.handlers.get(event, 0) + handlers
+
+        second = int(time.monotonic())
+        window = self._window
+        if not window or window[-1][0] != second:
+            window.append((second, {}))
+        counts = window[-1][1]
+        counts[event] = counts.get(event, 0) + 1
+
+    def event_rates(self, seconds: int = 10) -> Dict[str, float]:
+        """Computes how many dispatch events of each type were received per second.
+
+        Parameters
+        -----------
+        seconds: :class:`int`
+            The number of full seconds to average over, up to the last 60.
+
+        Returns
+        --------
+        Dict[:class:`str`, :class:`float`]
+            The number of events received per second, keyed by their type.
+        """
+        seconds = max(1, min(seconds, self.WINDOW))
+        now = int(time.monotonic())
+        totals: Dict[str, int] = {}
+        for second, counts in self._window:
+            if now - seconds <= second < now:
+                for event, count in counts.items():
+                    totals[event] = totals.get(event, 0) + count
+        return {event: count / seconds for event, count in totals.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "messages_received": self.messages_received,
+            "bytes_received": self.bytes_received,
+            "bytes_inflated": self.bytes_inflated,
+            "compression_ratio": self.compression_ratio,
+            "inflate_time": self.inflate_time,
+            "decode_time": self.decode_time,
+            "events": dict(self.events),
+            "event_rates": self.event_rates(),
+            "parse_time": dict(self.parse_time),
+            "handlers": dict(self.handlers),
+            "heartbeat_latencies": list(self.heartbeat_latencies),
+            "identifies": self.identifies,
+            "resumes": self.resumes,
+        }
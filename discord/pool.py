@@ -0,0 +1,173 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+from typing import Any, NamedTuple, Optional
+
+import aiohttp
+
+__all__ = (
+    "ConnectionPoolConfig",
+    "ConnectionPoolStats",
+)
+
+
+class ConnectionPoolConfig:
+    """Configures the pool of connections the REST client keeps open to Discord.
+
+    Keeping connections alive lets concurrent requests reuse them rather than
+    paying for a new TCP and TLS handshake each time.
+
+    This can be passed to :class:`Client` through the ``connection_pool`` option.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    limit: :class:`int`
+        The maximum number of simultaneous connections. ``0`` means no limit.
+    limit_per_host: :class:`int`
+        The maximum number of simultaneous connections to a single host. ``0`` means no limit.
+    keepalive_timeout: Optional[:class:`float`]
+        The number of seconds an idle connection is kept open for reuse.
+    dns_cache_ttl: Optional[:class:`int`]
+        The number of seconds resolved addresses are cached for. ``None`` caches them forever.
+    use_dns_cache: :class:`bool`
+        Whether to cache resolved addresses at all.
+    total_timeout: Optional[:class:`float`]
+        The maximum number of seconds a request may take, including reading its response.
+    connect_timeout: Optional[:class:`float`]
+        The maximum number of seconds spent acquiring a connection, including
+        waiting for one to be freed from the pool.
+    sock_connect_timeout: Optional[:class:`float`]
+        The maximum number of seconds spent opening a new connection.
+    sock_read_timeout: Optional[:class:`float`]
+        The maximum number of seconds to wait between two reads of a response.
+    """
+
+    __slots__ = (
+        "limit",
+        "limit_per_host",
+        "keepalive_timeout",
+        "dns_cache_ttl",
+        "use_dns_cache",
+        "total_timeout",
+        "connect_timeout",
+        "sock_connect_timeout",
+        "sock_read_timeout",
+    )
+
+    def __init__(
+        self,
+        *,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: Optional[float] = 15.0,
+        dns_cache_ttl: Optional[int] = 10,
+        use_dns_cache: bool = True,
+        total_timeout: Optional[float] = 300.0,
+        connect_timeout: Optional[float] = None,
+        sock_connect_timeout: Optional[float] = None,
+        sock_read_timeout: Optional[float] = None,
+    ) -> None:
+        self.limit: int = limit
+        self.limit_per_host: int = limit_per_host
+        self.keepalive_timeout: Optional[float] = keepalive_timeout
+        self.dns_cache_ttl: Optional[int] = dns_cache_ttl
+        self.use_dns_cache: bool = use_dns_cache
+        self.total_timeout: Optional[float] = total_timeout
+        self.connect_timeout: Optional[float] = connect_timeout
+        self.sock_connect_timeout: Optional[float] = sock_connect_timeout
+        self.sock_read_timeout: Optional[float] = sock_read_timeout
+
+    def __repr__(self) -> str:
+        return (
+            f"<ConnectionPoolConfig limit={self.limit} limit_per_host={self.limit_per_host} "
+            f"keepalive_timeout={self.keepalive_timeout} dns_cache_ttl={self.dns_cache_ttl}>"
+        )
+
+    def create_connector(self) -> aiohttp.TCPConnector:
+        """Creates a connector with these settings.
+
+        This must be called from a coroutine.
+        """
+        kwargs: Any = {}
+        if self.keepalive_timeout is None:
+            kwargs["force_close"] = True
+        else:
+            kwargs["keepalive_timeout"] = self.keepalive_timeout
+
+        return aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=self.use_dns_cache,
+            **kwargs,
+        )
+
+    def create_timeout(self) -> aiohttp.ClientTimeout:
+        """Creates the request timeouts described by these settings."""
+        return aiohttp.ClientTimeout(
+            total=self.total_timeout,
+            connect=self.connect_timeout,
+            sock_connect=self.sock_connect_timeout,
+            sock_read=self.sock_read_timeout,
+        )
+
+
+class ConnectionPoolStats(NamedTuple):
+    """A snapshot of the utilisation of the REST client's connection pool.
+
+    This can be retrieved through :attr:`Client.connection_pool_stats`.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    limit: :class:`int`
+        The maximum number of simultaneous connections, ``0`` if there is no limit.
+    limit_per_host: :class:`int`
+        The maximum number of simultaneous connections to a single host, ``0`` if there is no limit.
+    active: :class:`int`
+        The number of connections currently in use by a request, from when the request
+        gets one until its response arrives.
+    idle: :class:`int`
+        The number of open connections waiting to be reused. aiohttp doesn't expose
+        this, so it is a best-effort count that is ``0`` if aiohttp's internals change.
+    waiting: :class:`int`
+        The number of requests waiting for a connection to be freed.
+    opened: :class:`int`
+        The number of connections opened since the client was created.
+    reused: :class:`int`
+        The number of times a request reused an idle connection instead of opening one.
+    """
+
+    limit: int
+    limit_per_host: int
+    active: int
+    idle: int
+    waiting: int
+    opened: int
+    reused: int
@@ -0,0 +1,1044 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Deque,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TYPE_CHECKING,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from . import utils
+from .utils import MISSING
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    import aiohttp
+
+__all__ = (
+    "GlobalRatelimit",
+    "RatelimitHeaders",
+    "RatelimitLease",
+    "RatelimitBackend",
+    "MemoryRatelimitBackend",
+    "SocketRatelimitBackend",
+    "RatelimitBroker",
+)
+
+_log = logging.getLogger(__name__)
+
+K = TypeVar("K")
+V = TypeVar("V")
+LeaseT = TypeVar("LeaseT", bound="RatelimitLease")
+
+
+class Ratelimit:
+    """Represents a single Discord rate limit bucket.
+
+    This acts like a semaphore whose value is driven by the ``X-RateLimit-*``
+    headers Discord sends back. Up to :attr:`remaining` requests are allowed
+    to be in flight at once, and once the bucket is exhausted every waiter is
+    held back until the bucket resets.
+
+    A freshly created bucket only allows a single request through, since
+    nothing is known about it until the first response comes back.
+
+    Attributes
+    -----------
+    limit: :class:`int`
+        The number of requests allowed per window.
+    remaining: :class:`int`
+        The number of requests that may still be started in this window.
+    outgoing: :class:`int`
+        The number of requests currently in flight.
+    reset_after: :class:`float`
+        The number of seconds the current window lasts for, as last reported by Discord.
+    expires: Optional[:class:`float`]
+        The loop time at which the current window expires, if known.
+    """
+
+    __slots__ = (
+        "limit",
+        "remaining",
+        "outgoing",
+        "reset_after",
+        "expires",
+        "dirty",
+        "_loop",
+        "_pending",
+        "_refresh_handle",
+    )
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.limit: int = 1
+        self.remaining: int = self.limit
+        self.outgoing: int = 0
+        self.reset_after: float = 0.0
+        self.expires: Optional[float] = None
+        self.dirty: bool = False
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._pending: Deque[asyncio.Future[None]] = deque()
+        self._refresh_handle: Optional[asyncio.TimerHandle] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<Ratelimit limit={self.limit} remaining={self.remaining} "
+            f"outgoing={self.outgoing} pending={len(self._pending)}>"
+        )
+
+    def is_expired(self) -> bool:
+        """:class:`bool`: Whether the current window has passed."""
+        return self.expires is not None and self._loop.time() >= self.expires
+
+    def is_idle(self) -> bool:
+        """:class:`bool`: Whether the bucket has no requests in flight or waiting and is not exhausted.
+
+        An idle bucket can be forgotten without losing any rate limit information
+        that matters, since a new bucket is conservative until Discord tells it otherwise.
+        """
+        if self.outgoing or self._pending or self._refresh_handle is not None:
+            return False
+        return self.remaining > 0 or self.expires is None or self.is_expired()
+
+    def reset(self) -> None:
+        """Starts a new window, refilling the bucket up to :attr:`limit`."""
+        if self._refresh_handle is not None:
+            self._refresh_handle.cancel()
+            self._refresh_handle = None
+
+        self.remaining = max(self.limit - self.outgoing, 0)
+        self.expires = None
+        self.reset_after = 0.0
+        self.dirty = False
+
+    def update(self, limit: int, remaining: int, reset_after: float) -> None:
+        """Updates the bucket from the rate limit headers of a response.
+
+        This must be called while the request that produced the response
+        is still counted in :attr:`outgoing`.
+        """
+        self.limit = limit
+
+        # the other requests that are still in flight will consume tokens
+        # that the remaining count in this response does not know about yet
+        available = max(remaining - (self.outgoing - 1), 0)
+        if self.dirty:
+            self.remaining = min(self.remaining, available)
+        else:
+            self.remaining = available
+            self.dirty = True
+
+        self.reset_after = reset_after
+        self.expires = self._loop.time() + reset_after
+
+    def _wake(self, count: int) -> None:
+        awoken = 0
+        while self._pending and awoken < count:
+            future = self._pending.popleft()
+            if not future.done():
+                future.set_result(None)
+                awoken += 1
+
+    def _refresh(self) -> None:
+        self.reset()
+        self._wake(self.remaining)
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_handle is not None:
+            return
+
+        delay = 0.0 if self.expires is None else max(self.expires - self._loop.time(), 0.0)
+        self._refresh_handle = self._loop.call_later(delay, self._refresh)
+
+    async def acquire(self) -> None:
+        """Waits until a request may be sent under this bucket."""
+        if self.is_expired():
+            self._refresh()
+
+        while self.remaining <= 0:
+            future = self._loop.create_future()
+            self._pending.append(future)
+            try:
+                await future
+            except BaseException:
+                future.cancel()
+                # pass the wake up along if we were woken before being cancelled
+                if self.remaining > 0:
+                    self._wake(1)
+                raise
+
+        self.remaining -= 1
+        self.outgoing += 1
+
+    def release(self) -> None:
+        """Marks an in-flight request as done."""
+        self.outgoing -= 1
+        if self.remaining <= 0:
+            # the bucket is exhausted, the waiters are released once the window resets
+            self._schedule_refresh()
+        elif self._pending:
+            self._wake(self.remaining)
+
+    async def __aenter__(self) -> Ratelimit:
+        await self.acquire()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.release()
+
+
+class BucketStore(Generic[K, V]):
+    """A bounded mapping of rate limit state that evicts idle entries.
+
+    Entries are kept in least recently used order. Whenever a new entry is
+    created, entries that have not been used for :attr:`ttl` seconds are
+    dropped, along with the least recently used ones if the store has grown
+    past :attr:`max_size`. Entries for which ``can_evict`` returns ``False``,
+    such as exhausted buckets, are never dropped, and neither are entries
+    currently held through :meth:`hold`.
+
+    ``len(store)`` gives the number of entries currently held.
+
+    Attributes
+    -----------
+    max_size: :class:`int`
+        The number of entries after which idle entries are evicted regardless of age.
+    ttl: :class:`float`
+        The number of seconds after which an unused entry is evicted.
+    evicted: :class:`int`
+        The total number of entries that have been evicted.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], V],
+        can_evict: Optional[Callable[[V], bool]] = None,
+        *,
+        max_size: int = 4096,
+        ttl: float = 300.0,
+    ) -> None:
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.evicted: int = 0
+        self._factory: Callable[[], V] = factory
+        self._can_evict: Optional[Callable[[V], bool]] = can_evict
+        self._data: OrderedDict[K, Tuple[V, float]] = OrderedDict()
+        # key -> the number of times the entry is currently held
+        self._holds: Dict[K, int] = {}
+
+    def __repr__(self) -> str:
+        return f"<BucketStore size={len(self._data)} max_size={self.max_size} ttl={self.ttl} evicted={self.evicted}>"
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._data)
+
+    def get(self, key: K) -> Optional[V]:
+        try:
+            return self._data[key][0]
+        except KeyError:
+            return None
+
+    def get_or_create(self, key: K) -> V:
+        """Returns the entry for ``key``, creating it if needed, and marks it as recently used."""
+        now = time.monotonic()
+        try:
+            value, _ = self._data[key]
+        except KeyError:
+            self._evict(now)
+            value = self._factory()
+            self._data[key] = (value, now)
+        else:
+            self._data[key] = (value, now)
+            self._data.move_to_end(key)
+        return value
+
+    def hold(self, key: K) -> V:
+        """Like :meth:`get_or_create`, but the entry isn't evicted until it's released as many times."""
+        value = self.get_or_create(key)
+        self._holds[key] = self._holds.get(key, 0) + 1
+        return value
+
+    def release(self, key: K) -> None:
+        """Releases an entry held through :meth:`hold`."""
+        count = self._holds.pop(key, 1) - 1
+        if count > 0:
+            self._holds[key] = count
+
+    def setdefault(self, key: K, value: V) -> V:
+        try:
+            return self._data[key][0]
+        except KeyError:
+            now = time.monotonic()
+            self._evict(now)
+            self._data[key] = (value, now)
+            return value
+
+    def pop(self, key: K) -> Optional[V]:
+        try:
+            return self._data.pop(key)[0]
+        except KeyError:
+            return None
+
+    def _evict(self, now: float) -> None:
+        # called right before a new entry is added, so make room for it
+        deadline = now - self.ttl
+        overflow = len(self._data) + 1 - self.max_size
+        expired: List[K] = []
+        holds = self._holds
+        can_evict = self._can_evict
+        # oldest entries come first, so stop at the first fresh one once we're within bounds
+        for key, (value, last_used) in self._data.items():
+            if overflow <= 0 and last_used > deadline:
+                break
+            if key not in holds and (can_evict is None or can_evict(value)):
+                expired.append(key)
+                overflow -= 1
+
+        for key in expired:
+            del self._data[key]
+        self.evicted += len(expired)
+
+
+class GlobalRatelimit:
+    """A token bucket that pre-emptively enforces the global rate limit.
+
+    Rather than waiting for Discord to answer with a global 429, every request
+    takes a token from this bucket before it is sent. Tokens are refilled
+    continuously at :attr:`rate` per second, allowing short bursts of up to
+    :attr:`rate` requests.
+
+    When requests have to wait for a token, those with a higher priority are
+    served first, and requests of equal priority are served in order.
+
+    Attributes
+    -----------
+    rate: :class:`int`
+        The number of requests allowed per second.
+    throttled: :class:`int`
+        The number of requests that had to wait for a token.
+    throttled_time: :class:`float`
+        The total number of seconds spent waiting for tokens.
+    """
+
+    __slots__ = (
+        "rate",
+        "throttled",
+        "throttled_time",
+        "_tokens",
+        "_last",
+        "_loop",
+        "_waiters",
+        "_counter",
+        "_wakeup",
+    )
+
+    def __init__(self, rate: int, loop: asyncio.AbstractEventLoop) -> None:
+        if rate <= 0:
+            raise ValueError("global rate limit must be greater than 0")
+
+        self.rate: int = rate
+        self.throttled: int = 0
+        self.throttled_time: float = 0.0
+        self._tokens: float = float(rate)
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._last: float = loop.time()
+        # (-priority, arrival, enqueued at, future), a min-heap so the highest priority comes first
+        self._waiters: List[Tuple[int, int, float, asyncio.Future[None]]] = []
+        self._counter: int = 0
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<GlobalRatelimit rate={self.rate} waiting={sum(not w[3].done() for w in self._waiters)} "
+            f"throttled={self.throttled} throttled_time={self.throttled_time:.2f}>"
+        )
+
+    def _refill(self) -> None:
+        now = self._loop.time()
+        self._tokens = min(self.rate, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def is_throttling(self) -> bool:
+        """:class:`bool`: Whether a request sent right now would have to wait."""
+        self._refill()
+        return self._tokens < 1 or bool(self._waiters)
+
+    def _wake(self) -> None:
+        self._wakeup = None
+        self._refill()
+        now = self._loop.time()
+        while self._waiters and self._tokens >= 1:
+            _, _, enqueued, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+
+            self._tokens -= 1
+            self.throttled_time += now - enqueued
+            future.set_result(None)
+
+        if self._waiters:
+            self._wakeup = self._loop.call_later((1 - self._tokens) / self.rate, self._wake)
+
+    async def acquire(self, priority: int = 0) -> None:
+        """Waits until a request may be sent without exceeding the global rate limit.
+
+        Parameters
+        -----------
+        priority: :class:`int`
+            The priority of the request. Higher priorities are served first.
+        """
+        self._refill()
+        if self._tokens >= 1 and not self._waiters:
+            self._tokens -= 1
+            return
+
+        self.throttled += 1
+        self._counter += 1
+        future = self._loop.create_future()
+        heapq.heappush(self._waiters, (-priority, self._counter, self._loop.time(), future))
+        if self._wakeup is None:
+            self._wakeup = self._loop.call_later(max(1 - self._tokens, 0) / self.rate, self._wake)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # the token was handed to us right before the cancellation, give it back
+                self._tokens += 1
+            raise
+
+
+class RatelimitHeaders(NamedTuple):
+    """The rate limit information Discord attaches to a response.
+
+    Attributes
+    -----------
+    bucket: Optional[:class:`str`]
+        The bucket hash of the route, if given.
+    limit: :class:`int`
+        The number of requests allowed per window.
+    remaining: :class:`int`
+        The number of requests remaining in the current window.
+    reset_after: :class:`float`
+        The number of seconds until the current window resets.
+    """
+
+    bucket: Optional[str]
+    limit: int
+    remaining: int
+    reset_after: float
+
+    @classmethod
+    def from_response(cls, response: aiohttp.ClientResponse, *, use_clock: bool = False) -> Optional[RatelimitHeaders]:
+        headers = response.headers
+        if "X-Ratelimit-Remaining" not in headers:
+            return None
+
+        return cls(
+            bucket=headers.get("X-Ratelimit-Bucket"),
+            limit=int(headers.get("X-Ratelimit-Limit", 1)),
+            remaining=int(headers["X-Ratelimit-Remaining"]),
+            reset_after=utils._parse_ratelimit_header(response, use_clock=use_clock),
+        )
+
+
+class RatelimitLease:
+    """A slot in a rate limit bucket handed out by a :class:`RatelimitBackend`.
+
+    A lease must be released exactly once, which can be done by using it
+    as an asynchronous context manager.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    key: :class:`str`
+        The key of the bucket this lease belongs to.
+    """
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: str) -> None:
+        self.key: str = key
+
+    async def update(self, headers: RatelimitHeaders) -> None:
+        """|coro|
+
+        Reports the rate limit headers of a response sent under this lease.
+        """
+        raise NotImplementedError
+
+    async def release(self) -> None:
+        """|coro|
+
+        Gives the slot back to the bucket.
+        """
+        raise NotImplementedError
+
+    async def __aenter__(self: LeaseT) -> LeaseT:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.release()
+
+
+class RatelimitBackend:
+    """The interface :class:`Client` uses to store its REST rate limit state.
+
+    The default is :class:`MemoryRatelimitBackend`, which keeps everything in
+    the current process. Passing a different backend through the ``ratelimit_backend``
+    option of :class:`Client` allows rate limits to be shared, for example
+    between several processes running shards of the same bot.
+
+    .. versionadded:: 2.0
+    """
+
+    async def acquire(self, route_key: str, major_parameters: str) -> RatelimitLease:
+        """|coro|
+
+        Waits until a request may be sent under the bucket of a route.
+
+        Parameters
+        -----------
+        route_key: :class:`str`
+            The method and path template of the route, e.g. ``GET /channels/{channel_id}``.
+        major_parameters: :class:`str`
+            The major parameters of the route, joined together.
+
+        Returns
+        --------
+        :class:`RatelimitLease`
+            The lease to report the response to and release once done.
+        """
+        raise NotImplementedError
+
+    async def acquire_global(self, priority: int = 0) -> None:
+        """|coro|
+
+        Waits until a request may be sent without exceeding the global rate limit.
+        This is called before every attempt at sending a request.
+
+        Parameters
+        -----------
+        priority: :class:`int`
+            The priority of the request. When several requests are waiting,
+            those with a higher priority should be let through first.
+        """
+        raise NotImplementedError
+
+    async def block_global(self, retry_after: float) -> None:
+        """|coro|
+
+        Holds back every request for ``retry_after`` seconds after Discord
+        reported the global rate limit as exceeded.
+        """
+        raise NotImplementedError
+
+    @property
+    def bucket_count(self) -> int:
+        """:class:`int`: The number of buckets tracked by this process. Backends keeping their state elsewhere return ``0``."""
+        return 0
+
+    async def close(self) -> None:
+        """|coro|
+
+        Cleans up any resources held by the backend.
+        """
+        pass
+
+
+class _MemoryLease(RatelimitLease):
+    __slots__ = ("backend", "route_key", "major_parameters", "ratelimit", "released")
+
+    def __init__(
+        self,
+        backend: MemoryRatelimitBackend,
+        route_key: str,
+        major_parameters: str,
+        key: str,
+        ratelimit: Ratelimit,
+    ) -> None:
+        super().__init__(key)
+        self.backend: MemoryRatelimitBackend = backend
+        self.route_key: str = route_key
+        self.major_parameters: str = major_parameters
+        self.ratelimit: Ratelimit = ratelimit
+        self.released: bool = False
+
+    async def update(self, headers: RatelimitHeaders) -> None:
+        self.backend._update(self, headers)
+
+    async def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self.ratelimit.release()
+
+
+class MemoryRatelimitBackend(RatelimitBackend):
+    """A :class:`RatelimitBackend` that keeps rate limits in the current process.
+
+    Routes are mapped to the bucket hash Discord reports for them, and each
+    bucket allows as many concurrent requests as it has remaining. Idle
+    buckets are forgotten over time.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    global_rate_limit: Optional[:class:`int`]
+        The maximum number of requests per second to send across all routes.
+        ``None`` disables the pre-emptive global limit. Defaults to ``50``.
+    loop: Optional[:class:`asyncio.AbstractEventLoop`]
+        The event loop to use. Defaults to :func:`asyncio.get_event_loop`.
+
+    Attributes
+    -----------
+    global_ratelimit: Optional[:class:`GlobalRatelimit`]
+        The pre-emptive global limiter, if enabled.
+    """
+
+    def __init__(
+        self,
+        *,
+        global_rate_limit: Optional[int] = 50,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
+        self.loop: asyncio.AbstractEventLoop = asyncio.get_event_loop() if loop is None else loop
+        # route key -> bucket hash, as reported by X-Ratelimit-Bucket
+        self._bucket_hashes: Dict[str, str] = {}
+        # "bucket hash:major parameters" (or "route key:major parameters" until the hash is known) -> rate limit
+        self._buckets: BucketStore[str, Ratelimit] = BucketStore(lambda: Ratelimit(self.loop), Ratelimit.is_idle)
+        self._global_reset: float = 0.0
+        self.global_ratelimit: Optional[GlobalRatelimit] = (
+            GlobalRatelimit(global_rate_limit, self.loop) if global_rate_limit is not None else None
+        )
+
+    @property
+    def bucket_count(self) -> int:
+        return len(self._buckets)
+
+    def get_ratelimit(self, key: str) -> Ratelimit:
+        return self._buckets.get_or_create(key)
+
+    async def acquire(self, route_key: str, major_parameters: str) -> RatelimitLease:
+        bucket_hash = self._bucket_hashes.get(route_key)
+        key = f"{bucket_hash or route_key}:{major_parameters}"
+        ratelimit = self.get_ratelimit(key)
+        await ratelimit.acquire()
+        return _MemoryLease(self, route_key, major_parameters, key, ratelimit)
+
+    async def acquire_global(self, priority: int = 0) -> None:
+        delay = self._global_reset - self.loop.time()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self._global_reset - self.loop.time()
+
+        if self.global_ratelimit is not None:
+            await self.global_ratelimit.acquire(priority)
+
+    async def block_global(self, retry_after: float) -> None:
+        self._global_reset = max(self._global_reset, self.loop.time() + retry_after)
+
+    def _update(self, lease: _MemoryLease, headers: RatelimitHeaders) -> None:
+        if headers.bucket is not None:
+            self._update_bucket_hash(lease, headers.bucket)
+
+        ratelimit = lease.ratelimit
+        ratelimit.update(headers.limit, headers.remaining, headers.reset_after)
+        if ratelimit.remaining == 0:
+            _log.debug(
+                "A rate limit bucket has been exhausted (bucket: %s, retry: %s).",
+                headers.bucket or lease.key,
+                ratelimit.reset_after,
+            )
+
+    def _update_bucket_hash(self, lease: _MemoryLease, bucket_hash: str) -> None:
+        route_key = lease.route_key
+        old_hash = self._bucket_hashes.get(route_key)
+        if old_hash == bucket_hash:
+            return
+
+        if old_hash is None:
+            _log.debug("%s has found its rate limit bucket hash (%s).", route_key, bucket_hash)
+        else:
+            # either a sub-ratelimit or the bucket genuinely changed, there's no way to tell
+            _log.debug("%s has changed its rate limit bucket hash: %s -> %s.", route_key, old_hash, bucket_hash)
+
+        self._bucket_hashes[route_key] = bucket_hash
+        key = lease.key
+        new_key = f"{bucket_hash}:{lease.major_parameters}"
+        # another route might have already discovered this bucket, in which case that one wins
+        self._buckets.setdefault(new_key, lease.ratelimit)
+        if self._buckets.get(key) is lease.ratelimit and key != new_key:
+            self._buckets.pop(key)
+
+
+# The cross-process backend talks to a RatelimitBroker over a local stream socket
+# using newline delimited JSON. Requests that expect an answer carry an "id" which
+# the broker echoes back; an acquired lease is referred to by the id of its request.
+
+Address = Union[str, Tuple[str, int]]
+
+
+class _SocketLease(RatelimitLease):
+    __slots__ = ("backend", "id", "connection", "released")
+
+    def __init__(self, backend: SocketRatelimitBackend, id: int, key: str, connection: int) -> None:
+        super().__init__(key)
+        self.backend: SocketRatelimitBackend = backend
+        self.id: int = id
+        self.connection: int = connection
+        self.released: bool = False
+
+    async def update(self, headers: RatelimitHeaders) -> None:
+        self.backend._send({"op": "update", "lease": self.id, "headers": list(headers)}, connection=self.connection)
+
+    async def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self.backend._send({"op": "release", "lease": self.id}, connection=self.connection)
+
+
+class SocketRatelimitBackend(RatelimitBackend):
+    """A :class:`RatelimitBackend` that shares rate limits between processes.
+
+    Every rate limit decision is delegated to a :class:`RatelimitBroker`
+    listening on a local socket, so that all processes connected to the
+    same broker share one view of the buckets and of the global limit.
+
+    If the broker cannot be reached, requests fall back to a
+    :class:`MemoryRatelimitBackend` local to this process until the
+    connection can be re-established.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    address: Union[:class:`str`, Tuple[:class:`str`, :class:`int`]]
+        The path of the Unix socket the broker listens on, or a ``(host, port)``
+        tuple if it listens on TCP.
+    global_rate_limit: Optional[:class:`int`]
+        The global limit of the fallback backend used while the broker is unreachable.
+    reconnect_interval: :class:`float`
+        The minimum number of seconds between two attempts at connecting to the broker.
+    loop: Optional[:class:`asyncio.AbstractEventLoop`]
+        The event loop to use. Defaults to :func:`asyncio.get_event_loop`.
+    """
+
+    def __init__(
+        self,
+        address: Address,
+        *,
+        global_rate_limit: Optional[int] = 50,
+        reconnect_interval: float = 5.0,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
+        self.loop: asyncio.AbstractEventLoop = asyncio.get_event_loop() if loop is None else loop
+        self.address: Address = address
+        self.reconnect_interval: float = reconnect_interval
+        self.fallback: MemoryRatelimitBackend = MemoryRatelimitBackend(
+            global_rate_limit=global_rate_limit, loop=self.loop
+        )
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task[None]] = None
+        self._futures: Dict[int, asyncio.Future[Dict[str, Any]]] = {}
+        self._next_id: int = 0
+        # incremented on every new connection so leases from a dead one are ignored
+        self._connection: int = 0
+        self._last_attempt: float = float("-inf")
+        self._connect_lock: asyncio.Lock = asyncio.Lock()
+
+    def is_connected(self) -> bool:
+        """:class:`bool`: Whether the backend is currently connected to its broker."""
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def _connect(self) -> bool:
+        if self.is_connected():
+            return True
+
+        async with self._connect_lock:
+            if self.is_connected():
+                return True
+
+            now = self.loop.time()
+            if now - self._last_attempt < self.reconnect_interval:
+                return False
+            self._last_attempt = now
+
+            try:
+                if isinstance(self.address, str):
+                    reader, writer = await asyncio.open_unix_connection(self.address)
+                else:
+                    reader, writer = await asyncio.open_connection(*self.address)
+            except OSError as exc:
+                _log.warning("Could not connect to the rate limit broker at %s: %s.", self.address, exc)
+                return False
+
+            self._connection += 1
+            self._writer = writer
+            self._reader_task = self.loop.create_task(self._read(reader, self._connection))
+            _log.info("Connected to the rate limit broker at %s.", self.address)
+            return True
+
+    async def _read(self, reader: asyncio.StreamReader, connection: int) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                data = utils._from_json(line)
+                future = self._futures.pop(data["id"], None)
+                if future is None:
+                    continue
+
+                if future.cancelled():
+                    # the caller gave up waiting, give the slot straight back
+                    if "key" in data:
+                        self._send({"op": "release", "lease": data["id"]}, connection=connection)
+                else:
+                    future.set_result(data)
+        except (OSError, ValueError) as exc:
+            _log.warning("Lost the connection to the rate limit broker: %s.", exc)
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+            self._writer = None
+            futures, self._futures = self._futures, {}
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(ConnectionResetError("rate limit broker connection lost"))
+
+    def _send(self, payload: Dict[str, Any], *, connection: Optional[int] = None) -> None:
+        if not self.is_connected() or (connection is not None and connection != self._connection):
+            return
+
+        self._writer.write(utils._to_json(payload).encode("utf-8") + b"\n")  # type: ignore
+
+    async def _call(self, payload: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], int]]:
+        # returns the answer of the broker along with the connection it came from
+        if not await self._connect():
+            return None
+
+        connection = self._connection
+        self._next_id += 1
+        payload["id"] = self._next_id
+        future: asyncio.Future[Dict[str, Any]] = self.loop.create_future()
+        self._futures[payload["id"]] = future
+        self._send(payload)
+        try:
+            return await future, connection
+        except ConnectionResetError:
+            return None
+
+    async def acquire(self, route_key: str, major_parameters: str) -> RatelimitLease:
+        result = await self._call({"op": "acquire", "route": route_key, "major": major_parameters})
+        if result is None:
+            return await self.fallback.acquire(route_key, major_parameters)
+
+        data, connection = result
+        return _SocketLease(self, data["id"], data["key"], connection)
+
+    async def acquire_global(self, priority: int = 0) -> None:
+        result = await self._call({"op": "global", "priority": priority})
+        if result is None:
+            await self.fallback.acquire_global(priority)
+
+    async def block_global(self, retry_after: float) -> None:
+        await self.fallback.block_global(retry_after)
+        self._send({"op": "block_global", "retry_after": retry_after})
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+
+
+class RatelimitBroker:
+    """A server that owns the rate limit state of several processes.
+
+    Each process uses a :class:`SocketRatelimitBackend` pointing at the
+    broker, which keeps the state in a :class:`MemoryRatelimitBackend`.
+    The broker can run in one of the bot processes or in a process of its own:
+
+    .. code-block:: python3
+
+        broker = discord.RatelimitBroker('/tmp/discord-ratelimits.sock')
+        asyncio.run(broker.serve_forever())
+
+    Leases held by a process are released if its connection is lost.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    address: Union[:class:`str`, Tuple[:class:`str`, :class:`int`]]
+        The path of the Unix socket to listen on, or a ``(host, port)`` tuple to
+        listen on TCP instead.
+    global_rate_limit: Optional[:class:`int`]
+        The maximum number of requests per second shared by all connected processes.
+        ``None`` disables the pre-emptive global limit. Defaults to ``50``.
+
+    Attributes
+    -----------
+    backend: :class:`MemoryRatelimitBackend`
+        The backend holding the shared state.
+    """
+
+    def __init__(self, address: Address, *, global_rate_limit: Optional[int] = 50) -> None:
+        self.address: Address = address
+        self._global_rate_limit: Optional[int] = global_rate_limit
+        self.backend: MemoryRatelimitBackend = MISSING
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """|coro|
+
+        Starts listening for connections.
+        """
+        loop = asyncio.get_running_loop()
+        if self.backend is MISSING:
+            self.backend = MemoryRatelimitBackend(global_rate_limit=self._global_rate_limit, loop=loop)
+
+        if isinstance(self.address, str):
+            self._server = await asyncio.start_unix_server(self._handle, self.address)
+        else:
+            self._server = await asyncio.start_server(self._handle, *self.address)
+        _log.info("Rate limit broker listening on %s.", self.address)
+
+    async def serve_forever(self) -> None:
+        """|coro|
+
+        Starts listening for connections if needed and serves them until cancelled.
+        """
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()  # type: ignore
+
+    async def close(self) -> None:
+        """|coro|
+
+        Stops listening for connections.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        backend = self.backend
+        leases: Dict[int, RatelimitLease] = {}
+        tasks: Set[asyncio.Task[None]] = set()
+        closed = False
+
+        def reply(payload: Dict[str, Any]) -> None:
+            if not writer.is_closing():
+                writer.write(utils._to_json(payload).encode("utf-8") + b"\n")
+
+        async def acquire(id: int, route_key: str, major_parameters: str) -> None:
+            lease = await backend.acquire(route_key, major_parameters)
+            if closed:
+                await lease.release()
+                return
+            leases[id] = lease
+            reply({"id": id, "key": lease.key})
+
+        async def acquire_global(id: int, priority: int) -> None:
+            await backend.acquire_global(priority)
+            reply({"id": id})
+
+        def spawn(coro: Coroutine[Any, Any, None]) -> None:
+            task = asyncio.get_running_loop().create_task(coro)
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                data = utils._from_json(line)
+                op = data["op"]
+                if op == "acquire":
+                    spawn(acquire(data["id"], data["route"], data["major"]))
+                elif op == "global":
+                    spawn(acquire_global(data["id"], data.get("priority", 0)))
+                elif op == "update":
+                    lease = leases.get(data["lease"])
+                    if lease is not None:
+                        await lease.update(RatelimitHeaders(*data["headers"]))
+                elif op == "release":
+                    lease = leases.pop(data["lease"], None)
+                    if lease is not None:
+                        await lease.release()
+                elif op == "block_global":
+                    await backend.block_global(data["retry_after"])
+        except (OSError, ValueError, KeyError) as exc:
+            _log.warning("Dropping rate limit broker connection: %s.", exc)
+        finally:
+            closed = True
+            for task in tasks:
+                task.cancel()
+            for lease in leases.values():
+                await lease.release()
+            leases.clear()
+            writer.close()
@@ -0,0 +1,261 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import errno
+import random
+import time
+from typing import Collection, FrozenSet, Optional
+
+import aiohttp
+
+from .utils import MISSING
+
+__all__ = (
+    "RetryBudget",
+    "RetryPolicy",
+)
+
+# errno values meaning the connection was reset by the peer, including the
+# ones Windows and macOS use
+_CONNECTION_RESET_ERRNOS: FrozenSet[int] = frozenset({errno.ECONNRESET, 54, 104, 10054})
+
+
+class RetryBudget:
+    """Limits how many retries can be made in proportion to the number of requests.
+
+    Every request deposits a fraction of a token and every retry withdraws one.
+    When the budget runs dry, failed requests are no longer retried, so an outage
+    on Discord's end doesn't get amplified by every request being retried at once.
+
+    A small number of retries is always allowed through so that a client sending
+    few requests can still retry them.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    ratio: :class:`float`
+        The number of retries allowed for every request, e.g. ``0.2`` allows one retry every five requests.
+    min_per_second: :class:`float`
+        The number of retries allowed every second regardless of the number of requests.
+    max_tokens: :class:`float`
+        The maximum number of retries that can be saved up.
+    exhausted: :class:`int`
+        The number of retries denied because the budget was empty.
+    """
+
+    __slots__ = ("ratio", "min_per_second", "max_tokens", "exhausted", "_tokens", "_last_refill")
+
+    def __init__(self, *, ratio: float = 0.2, min_per_second: float = 1.0, max_tokens: float = 50.0) -> None:
+        self.ratio: float = ratio
+        self.min_per_second: float = min_per_second
+        self.max_tokens: float = max_tokens
+        self.exhausted: int = 0
+        self._tokens: float = max_tokens
+        self._last_refill: float = time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"<RetryBudget ratio={self.ratio} min_per_second={self.min_per_second} tokens={self.tokens:.2f}>"
+
+    @property
+    def tokens(self) -> float:
+        """:class:`float`: The number of retries currently available."""
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._last_refill) * self.min_per_second)
+        self._last_refill = now
+
+    def deposit(self) -> None:
+        """Records that a request is being sent for the first time."""
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Attempts to take a retry from the budget, returning whether it was allowed."""
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+
+        self.exhausted += 1
+        return False
+
+
+class RetryPolicy:
+    """Decides whether and when a failed REST request is retried.
+
+    Failed requests are retried with an exponential backoff. By default the
+    backoff uses "full jitter", where the delay is picked at random between zero
+    and the backoff, so that clients failing at the same moment don't retry in lockstep.
+
+    Only requests sent with an idempotent method are retried after a server error
+    or a dropped connection, since a request like sending a message may have gone
+    through even though no successful response was received. Requests that
+    could not connect at all are always retried.
+
+    Requests that were rate limited are always retried after the delay given by
+    Discord and are not subject to the backoff or the budget, but still count as attempts.
+
+    The behaviour can be customised further by subclassing and overriding
+    :meth:`should_retry` or :meth:`compute_delay`.
+
+    This can be passed to :class:`Client` through the ``retry_policy`` option.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    max_attempts: :class:`int`
+        The maximum number of times a request is sent, including the first attempt.
+    base_delay: :class:`float`
+        The backoff before the first retry, in seconds.
+    max_delay: :class:`float`
+        The largest backoff between two attempts, in seconds.
+    multiplier: :class:`float`
+        The factor the backoff grows by after every attempt.
+    jitter: :class:`bool`
+        Whether to randomise the backoff.
+    deadline: Optional[:class:`float`]
+        The number of seconds after which a request is no longer retried,
+        counted from its first attempt. ``None`` means no deadline.
+    retry_statuses: FrozenSet[:class:`int`]
+        The status codes of the responses that are retried.
+    idempotent_methods: FrozenSet[:class:`str`]
+        The HTTP methods that can be retried after a server error or a dropped connection.
+    budget: Optional[:class:`RetryBudget`]
+        The budget limiting the number of retries, or ``None`` for no limit.
+    """
+
+    DEFAULT_IDEMPOTENT_METHODS: FrozenSet[str] = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "PATCH", "DELETE"})
+    DEFAULT_RETRY_STATUSES: FrozenSet[int] = frozenset({500, 502, 503, 504})
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        multiplier: float = 2.0,
+        jitter: bool = True,
+        deadline: Optional[float] = None,
+        retry_statuses: Collection[int] = DEFAULT_RETRY_STATUSES,
+        idempotent_methods: Collection[str] = DEFAULT_IDEMPOTENT_METHODS,
+        budget: Optional[RetryBudget] = MISSING,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+
+        self.max_attempts: int = max_attempts
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.multiplier: float = multiplier
+        self.jitter: bool = jitter
+        self.deadline: Optional[float] = deadline
+        self.retry_statuses: FrozenSet[int] = frozenset(retry_statuses)
+        self.idempotent_methods: FrozenSet[str] = frozenset(m.upper() for m in idempotent_methods)
+        self.budget: Optional[RetryBudget] = RetryBudget() if budget is MISSING else budget
+
+        # Use our own random instance to avoid messing with global one
+        self._random = random.Random()
+
+    def __repr__(self) -> str:
+        return (
+            f"<RetryPolicy max_attempts={self.max_attempts} base_delay={self.base_delay} "
+            f"max_delay={self.max_delay} deadline={self.deadline}>"
+        )
+
+    def is_idempotent(self, method: str) -> bool:
+        """Whether requests sent with the given HTTP method can safely be sent more than once."""
+        return method.upper() in self.idempotent_methods
+
+    def should_retry(self, method: str, *, status: Optional[int] = None, error: Optional[BaseException] = None) -> bool:
+        """Whether a failed attempt should be retried, not taking the attempt count, deadline or budget into account.
+
+        Parameters
+        -----------
+        method: :class:`str`
+            The HTTP method of the request.
+        status: Optional[:class:`int`]
+            The status code of the response, if one was received.
+        error: Optional[:exc:`BaseException`]
+            The error raised while sending the request, if no response was received.
+        """
+        if error is not None:
+            # the request never reached Discord, so it's safe to send again
+            if isinstance(error, aiohttp.ClientConnectorError):
+                return True
+            if not self.is_idempotent(method):
+                return False
+            if isinstance(error, aiohttp.ServerDisconnectedError):
+                return True
+            return isinstance(error, OSError) and error.errno in _CONNECTION_RESET_ERRNOS
+
+        return status in self.retry_statuses and self.is_idempotent(method)
+
+    def compute_delay(self, attempt: int) -> float:
+        """Returns the number of seconds to wait before retrying after the given attempt, starting at ``0``."""
+        delay = min(self.max_delay, self.base_delay * self.multiplier**attempt)
+        if self.jitter:
+            return self._random.uniform(0, delay)
+        return delay
+
+    def next_delay(
+        self,
+        method: str,
+        attempt: int,
+        elapsed: float,
+        *,
+        status: Optional[int] = None,
+        error: Optional[BaseException] = None,
+    ) -> Optional[float]:
+        """Returns the number of seconds to wait before retrying a failed attempt, or ``None`` if it shouldn't be retried.
+
+        Parameters
+        -----------
+        method: :class:`str`
+            The HTTP method of the request.
+        attempt: :class:`int`
+            The attempt that failed, starting at ``0``.
+        elapsed: :class:`float`
+            The number of seconds since the first attempt was sent.
+        status: Optional[:class:`int`]
+            The status code of the response, if one was received.
+        error: Optional[:exc:`BaseException`]
+            The error raised while sending the request, if no response was received.
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+        if not self.should_retry(method, status=status, error=error):
+            return None
+
+        delay = self.compute_delay(attempt)
+        if self.deadline is not None and elapsed + delay > self.deadline:
+            return None
+        if self.budget is not None and not self.budget.withdraw():
+            return None
+        return delay
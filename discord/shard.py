@@ -42,6 +42,7 @@ from .errors import (
 )
 
 from .enums import Status
+from .metrics import GatewayStats
 
 from typing import TYPE_CHECKING, Any, Callable, Tuple, Type, Optional, List, Dict, TypeVar
 
@@ -123,9 +124,9 @@ class Shard:
         if self._task is not None and not self._task.done():
             self._task.cancel()
 
-    async def close(self) -> None:
+    async def close(self, *, code: int = 1000) -> None:
         self._cancel_task()
-        await self.ws.close(code=1000)
+        await self.ws.close(code=code)
 
     async def disconnect(self) -> None:
         await self.close()
@@ -279,6 +280,14 @@ class ShardInfo:
         """:class:`float`: Measures latency between a HEARTBEAT and a HEARTBEAT_ACK in seconds for this shard."""
         return self._parent.ws.latency
 
+    @property
+    def gateway_stats(self) -> GatewayStats:
+        """:class:`GatewayStats`: The statistics of this shard's gateway connection.
+
+        .. versionadded:: 2.0
+        """
+        return self._parent._client._get_gateway_stats(self.id)
+
     def is_ws_ratelimited(self) -> bool:
         """:class:`bool`: Whether the websocket is currently rate limited.
 
@@ -388,9 +397,17 @@ class AutoShardedClient(Client):
         """Mapping[int, :class:`ShardInfo`]: Returns a mapping of shard IDs to their respective info object."""
         return {shard_id: ShardInfo(parent, self.shard_count) for shard_id, parent in self.__shards.items()}
 
-    async def launch_shard(self, gateway: str, shard_id: int, *, initial: bool = False) -> None:
+    async def launch_shard(
+        self, gateway: str, shard_id: int, *, initial: bool = False, session: Optional[Tuple[str, int]] = None
+    ) -> None:
         try:
-            coro = DiscordWebSocket.from_client(self, initial=initial, gateway=gateway, shard_id=shard_id)
+            if session is not None:
+                session_id, sequence = session
+                coro = DiscordWebSocket.from_client(
+                    self, gateway=gateway, shard_id=shard_id, session=session_id, sequence=sequence, resume=True
+                )
+            else:
+                coro = DiscordWebSocket.from_client(self, initial=initial, gateway=gateway, shard_id=shard_id)
             ws = await asyncio.wait_for(coro, timeout=180.0)
         except Exception:
             _log.exception("Failed to connect for shard_id: %s. Retrying...", shard_id)
@@ -402,6 +419,11 @@ class AutoShardedClient(Client):
         ret.launch()
 
     async def launch_shards(self) -> None:
+        sessions = self._restore_sessions()
+        if sessions and self.shard_count is None:
+            # sessions can only be resumed by as many shards as they were created with
+            self.shard_count = self._connection.shard_count
+
         if self.shard_count is None:
             self.shard_count, gateway = await self.http.get_bot_gateway()
         else:
@@ -414,7 +436,7 @@ class AutoShardedClient(Client):
 
         for shard_id in shard_ids:
             initial = shard_id == shard_ids[0]
-            await self.launch_shard(gateway, shard_id, initial=initial)
+            await self.launch_shard(gateway, shard_id, initial=initial, session=sessions.get(shard_id))
 
         self._connection.shards_launched.set()
 
@@ -458,10 +480,19 @@ class AutoShardedClient(Client):
             except Exception:
                 pass
 
-        to_close = [asyncio.ensure_future(shard.close(), loop=self.loop) for shard in self.__shards.values()]
+        sessions: Dict[Optional[int], Tuple[str, int]] = {}
+        if self._session_file is not None:
+            for shard_id, shard in self.__shards.items():
+                if shard.ws.session_id is not None:
+                    sessions[shard_id] = (shard.ws.session_id, shard.ws.sequence)  # type: ignore
+
+        # closing with any code but 1000 keeps the sessions resumable
+        code = 4000 if sessions else 1000
+        to_close = [asyncio.ensure_future(shard.close(code=code), loop=self.loop) for shard in self.__shards.values()]
         if to_close:
             await asyncio.wait(to_close)
 
+        self._save_sessions(sessions)
         await self.http.close()
         self.__queue.put_nowait(EventItem(EventType.clean_close, None, None))
 
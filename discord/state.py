@@ -25,16 +25,18 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import asyncio
-from collections import deque, OrderedDict
+from collections import OrderedDict
 import copy
 import datetime
 import itertools
 import logging
-from typing import Dict, Optional, TYPE_CHECKING, Union, Callable, Any, List, TypeVar, Coroutine, Sequence, Tuple, Deque
+from typing import Dict, Optional, TYPE_CHECKING, Union, Callable, Any, List, Set, TypeVar, Coroutine, Sequence, Tuple
 import inspect
-
+import io
 import os
+import pickle
 
+from .cache import CacheStore, LRUStore, MemoryStore, MessageCache
 from .guild import Guild
 from .activity import BaseActivity
 from .user import User, ClientUser
@@ -81,6 +83,101 @@ if TYPE_CHECKING:
     Channel = Union[GuildChannel, VocalGuildChannel, PrivateChannel, PartialMessageable]
 
 
+# The gateway events that can be skipped by lazy dispatch, with the events they dispatch
+# and the name of a method keeping the cache coherent when they are skipped.
+# That method returns whether the event should be fully parsed anyway.
+_LAZY_EVENTS: Dict[str, Tuple[Tuple[str, ...], Optional[str]]] = {
+    "TYPING_START": (("raw_typing", "typing"), None),
+    "PRESENCE_UPDATE": (("presence_update", "user_update"), "_lazy_presence_update"),
+    "MESSAGE_UPDATE": (("raw_message_edit", "message_edit"), "_lazy_message_update"),
+    "MESSAGE_DELETE": (("raw_message_delete", "message_delete"), "_lazy_message_delete"),
+    "MESSAGE_DELETE_BULK": (("raw_bulk_message_delete", "bulk_message_delete"), "_lazy_message_delete_bulk"),
+    "MESSAGE_REACTION_ADD": (("raw_reaction_add", "reaction_add"), "_lazy_reaction"),
+    "MESSAGE_REACTION_REMOVE": (("raw_reaction_remove", "reaction_remove"), "_lazy_reaction"),
+    "MESSAGE_REACTION_REMOVE_ALL": (("raw_reaction_clear", "reaction_clear"), "_lazy_reaction"),
+    "MESSAGE_REACTION_REMOVE_EMOJI": (("raw_reaction_clear_emoji", "reaction_clear_emoji"), "_lazy_reaction"),
+    "CHANNEL_PINS_UPDATE": (("private_channel_pins_update", "guild_channel_pins_update"), None),
+    "INVITE_CREATE": (("invite_create",), None),
+    "INVITE_DELETE": (("invite_delete",), None),
+    "GUILD_BAN_ADD": (("member_ban",), None),
+    "GUILD_BAN_REMOVE": (("member_unban",), None),
+    "GUILD_INTEGRATIONS_UPDATE": (("guild_integrations_update",), None),
+    "INTEGRATION_CREATE": (("integration_create",), None),
+    "INTEGRATION_UPDATE": (("integration_update",), None),
+    "INTEGRATION_DELETE": (("raw_integration_delete",), None),
+    "WEBHOOKS_UPDATE": (("webhooks_update",), None),
+}
+
+
+class _CachePickler(pickle.Pickler):
+    # the connection state and HTTP client are swapped for those of the process loading the snapshot
+    def __init__(self, file: io.BytesIO, state: ConnectionState) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._state = state
+
+    def persistent_id(self, obj: Any) -> Optional[str]:
+        if obj is self._state:
+            return "state"
+        if obj is self._state.http:
+            return "http"
+        return None
+
+
+class _CacheUnpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, state: ConnectionState) -> None:
+        super().__init__(file)
+        self._state = state
+
+    def persistent_load(self, pid: str) -> Any:
+        if pid == "state":
+            return self._state
+        if pid == "http":
+            return self._state.http
+        raise pickle.UnpicklingError(f"Unknown persistent ID {pid!r}")
+
+
+_PLAIN_TYPES = frozenset((str, int, float, bool, type(None), bytes, tuple, list, dict))
+
+
+class _ModelPickler(_CachePickler):
+    # models moved out of the heap by a cache store refer to the guild and users they belong to by ID
+    def __init__(self, file: io.BytesIO, state: ConnectionState, model: Any) -> None:
+        super().__init__(file, state)
+        self._model = model
+
+    def persistent_id(self, obj: Any) -> Any:
+        # called for every object, most of which are plain values
+        if type(obj) in _PLAIN_TYPES or obj is self._model:
+            return None
+        if isinstance(obj, Guild):
+            return ("guild", obj.id)
+        if isinstance(obj, (User, ClientUser)):
+            payload = {
+                "id": obj.id,
+                "username": obj.name,
+                "discriminator": obj.discriminator,
+                "avatar": obj._avatar,
+                "banner": obj._banner,
+                "accent_color": obj._accent_colour,
+                "public_flags": obj._public_flags,
+                "bot": obj.bot,
+                "system": obj.system,
+            }
+            return ("user", payload)
+        return super().persistent_id(obj)
+
+
+class _ModelUnpickler(_CacheUnpickler):
+    def persistent_load(self, pid: Any) -> Any:
+        if isinstance(pid, tuple):
+            kind, value = pid
+            if kind == "guild":
+                return self._state._get_guild(value) or Object(id=value)
+            if kind == "user":
+                return self._state.store_user(value)
+        return super().persistent_load(pid)
+
+
 class ChunkRequest:
     def __init__(
         self,
@@ -161,6 +258,15 @@ class ConnectionState:
         self.max_messages: Optional[int] = options.get("max_messages", 1000)
         if self.max_messages is not None and self.max_messages <= 0:
             self.max_messages = 1000
+        self.max_messages_per_channel: Optional[int] = options.get("max_messages_per_channel")
+        self.max_messages_per_guild: Optional[int] = options.get("max_messages_per_guild")
+        self.max_message_age: Optional[float] = options.get("max_message_age")
+        self._cache_stores: Dict[str, Callable[[Optional[int]], CacheStore]] = options.get("cache_stores") or {}
+        # the number of members referring to each user, only counted for a users cache that pins them
+        self._user_refs: Optional[Dict[int, int]] = None
+        max_users: Optional[int] = options.get("max_users")
+        if max_users is not None and "users" not in self._cache_stores:
+            self._cache_stores = {**self._cache_stores, "users": lambda _: LRUStore(max_users, pin_referenced=True)}
 
         self.dispatch: Callable = dispatch
         self.handlers: Dict[str, Callable] = handlers
@@ -202,6 +308,7 @@ class ConnectionState:
             _log.warning("Guilds intent seems to be disabled. This may cause state related issues.")
 
         self._chunk_guilds: bool = options.get("chunk_guilds_at_startup", intents.members)
+        self._chunk_guilds_given: bool = "chunk_guilds_at_startup" in options
 
         # Ensure these two are set properly
         if not intents.members and self._chunk_guilds:
@@ -217,9 +324,14 @@ class ConnectionState:
             cache_flags._verify_intents(intents)
 
         self.member_cache_flags: MemberCacheFlags = cache_flags
+        self._member_cache_flags_given: bool = options.get("member_cache_flags") is not None
         self._activity: Optional[ActivityPayload] = activity
         self._status: Optional[str] = status
         self._intents: Intents = intents
+        # the shards resuming sessions restored from a snapshot, which dispatch ready once resumed
+        self._warm_shards: Set[Optional[int]] = set()
+        # whether ready was dispatched for the shards launched, so that a late resume doesn't do it again
+        self._ready_dispatched: bool = False
 
         if not intents.members or cache_flags._empty:
             self.store_user = self.create_user  # type: ignore
@@ -230,6 +342,12 @@ class ConnectionState:
             if attr.startswith("parse_"):
                 parsers[attr[6:].upper()] = func
 
+        self.lazy_dispatch: bool = options.get("lazy_dispatch", False)
+        self.events_skipped: Dict[str, int] = {}
+        if self.lazy_dispatch:
+            for event, (events, cache) in _LAZY_EVENTS.items():
+                parsers[event] = self._lazy_parser(event, parsers[event], events, cache and getattr(self, cache))
+
         self.clear()
 
     def clear(self, *, views: bool = True) -> None:
@@ -246,10 +364,10 @@ class ConnectionState:
         # references now using a regular dictionary with eviction being done
         # using __del__. Testing this for memory leaks led to no discernable leaks,
         # though more testing will have to be done.
-        self._users: Dict[int, User] = {}
-        self._emojis: Dict[int, Emoji] = {}
-        self._stickers: Dict[int, GuildSticker] = {}
-        self._guilds: Dict[int, Guild] = {}
+        self._users: CacheStore[User] = self._create_store("users")
+        self._emojis: CacheStore[Emoji] = self._create_store("emojis")
+        self._stickers: CacheStore[GuildSticker] = self._create_store("stickers")
+        self._guilds: CacheStore[Guild] = self._create_store("guilds")
         if views:
             self._view_store: ViewStore = ViewStore(self)
 
@@ -260,9 +378,14 @@ class ConnectionState:
         # extra dict to look up private channels by user id
         self._private_channels_by_user: Dict[int, DMChannel] = {}
         if self.max_messages is not None:
-            self._messages: Optional[Deque[Message]] = deque(maxlen=self.max_messages)
+            self._messages: Optional[MessageCache] = MessageCache(
+                self.max_messages,
+                max_per_channel=self.max_messages_per_channel,
+                max_per_guild=self.max_messages_per_guild,
+                max_age=self.max_message_age,
+            )
         else:
-            self._messages: Optional[Deque[Message]] = None
+            self._messages: Optional[MessageCache] = None
 
     def process_chunk_requests(
         self, guild_id: int, nonce: Optional[str], members: List[Member], complete: bool
@@ -278,6 +401,167 @@ class ConnectionState:
         for key in removed:
             del self._chunk_requests[key]
 
+    def _dump_session(self, sessions: Dict[Optional[int], Tuple[str, int]]) -> bytes:
+        header = {
+            "version": 1,
+            "user_id": self.self_id,
+            "shard_count": self.shard_count,
+            "intents": self._intents.value,
+            "application_id": self.application_id,
+            "sessions": sessions,
+        }
+        # copied first, as users being garbage collected while pickling remove themselves from the cache
+        cache = (
+            self.user,
+            dict(self._users.items()),
+            dict(self._guilds.items()),
+            dict(self._emojis.items()),
+            dict(self._stickers.items()),
+            OrderedDict(self._private_channels),
+            dict(self._private_channels_by_user),
+            list(self._messages) if self._messages is not None else None,
+        )
+        buffer = io.BytesIO()
+        pickle.dump(header, buffer, protocol=pickle.HIGHEST_PROTOCOL)
+        _CachePickler(buffer, self).dump(cache)
+        return buffer.getvalue()
+
+    def _load_session(self, data: bytes) -> Dict[Optional[int], Tuple[str, int]]:
+        buffer = io.BytesIO(data)
+        header = pickle.load(buffer)
+        if header.get("version") != 1 or header["user_id"] != self.self_id or header["intents"] != self._intents.value:
+            _log.info("Ignoring a session snapshot of a different bot or configuration.")
+            return {}
+        if self.shard_count is not None and header["shard_count"] != self.shard_count:
+            _log.info("Ignoring a session snapshot made with %s shards.", header["shard_count"])
+            return {}
+
+        (
+            self.user,
+            self._users,
+            self._guilds,
+            self._emojis,
+            self._stickers,
+            self._private_channels,
+            self._private_channels_by_user,
+            messages,
+        ) = _CacheUnpickler(buffer, self).load()
+        if self._cache_stores:
+            self._users = self._adopt_store("users", self._users)
+            self._guilds = self._adopt_store("guilds", self._guilds)
+            self._emojis = self._adopt_store("emojis", self._emojis)
+            self._stickers = self._adopt_store("stickers", self._stickers)
+            for guild in self._guilds.values():
+                guild._members = self._adopt_store("members", guild._members, guild.id)
+                guild._channels = self._adopt_store("channels", guild._channels, guild.id)
+        if self._messages is not None and messages is not None:
+            self._messages.clear()
+            self._messages.extend(messages)
+
+        self.shard_count = header["shard_count"]
+        self.application_id = self.application_id or header["application_id"]
+        self._warm_shards = set(header["sessions"])
+        self._ready_dispatched = False
+        return header["sessions"]
+
+    def _create_store(self, name: str, guild_id: Optional[int] = None) -> CacheStore:
+        try:
+            factory = self._cache_stores[name]
+        except KeyError:
+            return MemoryStore()
+        store = factory(guild_id)
+        store._bind(self)
+        return store
+
+    def _adopt_store(self, name: str, loaded: CacheStore, guild_id: Optional[int] = None) -> CacheStore:
+        # snapshots hold plain mappings, these are moved to the configured store
+        if name not in self._cache_stores:
+            return loaded
+        store = self._create_store(name, guild_id)
+        store.update(loaded)
+        return store
+
+    def _dump_model(self, model: Any) -> bytes:
+        if isinstance(model, User):
+            # the stored copy takes over from the live user, which must no longer remove it when collected
+            model._stored = False
+        buffer = io.BytesIO()
+        _ModelPickler(buffer, self, model).dump(model)
+        return buffer.getvalue()
+
+    def _load_model(self, data: bytes) -> Any:
+        return _ModelUnpickler(io.BytesIO(data), self).load()
+
+    def _set_intents(self, intents: Intents) -> None:
+        # the defaults derived from the intents in __init__ are derived again
+        if not self._member_cache_flags_given:
+            self.member_cache_flags = MemberCacheFlags.from_intents(intents)
+        if not self._chunk_guilds_given:
+            self._chunk_guilds = intents.members
+
+        self.member_cache_flags._verify_intents(intents)
+        if self._chunk_guilds and not intents.members:
+            raise ValueError("Intents.members must be enabled to chunk guilds at startup.")
+
+        self._intents = intents
+        if not intents.members or self.member_cache_flags._empty:
+            self.store_user = self.create_user  # type: ignore
+            self.deref_user = self.deref_user_no_intents  # type: ignore
+        else:
+            self.__dict__.pop("store_user", None)
+            self.__dict__.pop("deref_user", None)
+
+    def _lazy_parser(
+        self,
+        event: str,
+        parser: Callable[[Dict[str, Any]], None],
+        events: Tuple[str, ...],
+        cache: Optional[Callable[[Dict[str, Any]], bool]],
+    ) -> Callable[[Dict[str, Any]], None]:
+        skipped = self.events_skipped
+
+        def parse(data: Dict[str, Any]) -> None:
+            client = self._get_client()
+            if any(client._is_listening(name) for name in events) or (cache is not None and cache(data)):
+                parser(data)
+            else:
+                skipped[event] = skipped.get(event, 0) + 1
+
+        return parse
+
+    def _lazy_presence_update(self, data) -> bool:
+        guild = self._get_guild(utils._get_as_snowflake(data, "guild_id"))
+        if guild is not None:
+            user = data["user"]
+            member = guild.get_member(int(user["id"]))
+            if member is not None:
+                member._presence_update(data=data, user=user)
+        return False
+
+    def _lazy_message_update(self, data) -> bool:
+        message_id = int(data["id"])
+        message = self._get_message(message_id)
+        if message is not None:
+            message._update(data)
+        if "components" in data and self._view_store.is_message_tracked(message_id):
+            self._view_store.update_from_message(message_id, data["components"])
+        return False
+
+    def _lazy_message_delete(self, data) -> bool:
+        if self._messages is not None:
+            self._messages.pop(int(data["id"]))
+        return False
+
+    def _lazy_message_delete_bulk(self, data) -> bool:
+        if self._messages is not None:
+            for message_id in data["ids"]:
+                self._messages.pop(int(message_id))
+        return False
+
+    def _lazy_reaction(self, data) -> bool:
+        # reactions only change the cache through cached messages, which are rare enough to fully parse
+        return self._get_message(int(data["message_id"])) is not None
+
     def call_handlers(self, key: str, *args: Any, **kwargs: Any) -> None:
         try:
             func = self.handlers[key]
@@ -330,17 +614,43 @@ class ConnectionState:
         except KeyError:
             user = User(state=self, data=data)
             if user.discriminator != "0000":
-                self._users[user_id] = user
+                # set first, as stores that move users off the heap clear it again
                 user._stored = True
+                # keyed by the user's own ID object rather than a second equal int
+                self._users[user.id] = user
             return user
 
-    def deref_user(self, user_id: int) -> None:
-        self._users.pop(user_id, None)
+    def deref_user(self, user: User) -> None:
+        # the cache might hold a newer copy of the user by now
+        if self._users.get(user.id) is user:
+            self._users.pop(user.id, None)
+
+    def _track_user_refs(self) -> Dict[int, int]:
+        # kept across stores, as the members counted in it outlive the cache being cleared
+        if self._user_refs is None:
+            self._user_refs = {}
+        return self._user_refs
+
+    def _ref_user(self, user_id: int) -> None:
+        refs = self._user_refs
+        if refs is not None:
+            refs[user_id] = refs.get(user_id, 0) + 1
+
+    def _unref_user(self, user_id: int) -> None:
+        refs = self._user_refs
+        if refs is None:
+            return
+        count = refs.get(user_id, 0) - 1
+        if count > 0:
+            refs[user_id] = count
+        else:
+            refs.pop(user_id, None)
+            self._users._release(user_id)
 
     def create_user(self, data: UserPayload) -> User:
         return User(state=self, data=data)
 
-    def deref_user_no_intents(self, user_id: int) -> None:
+    def deref_user_no_intents(self, user: User) -> None:
         return
 
     def get_user(self, id: Optional[int]) -> Optional[User]:
@@ -450,7 +760,7 @@ class ConnectionState:
                 self._private_channels_by_user.pop(recipient.id, None)
 
     def _get_message(self, msg_id: Optional[int]) -> Optional[Message]:
-        return utils.find(lambda m: m.id == msg_id, reversed(self._messages)) if self._messages else None
+        return self._messages.get(msg_id) if self._messages is not None else None
 
     def _add_guild_from_data(self, data: GuildPayload) -> Guild:
         guild = Guild(data=data, state=self)
@@ -553,6 +863,7 @@ class ConnectionState:
             self._ready_task.cancel()
 
         self._ready_state = asyncio.Queue()
+        self._warm_shards.clear()
         self.clear(views=False)
         self.user = ClientUser(state=self, data=data["user"])
         self.store_user(data["user"])
@@ -575,6 +886,11 @@ class ConnectionState:
 
     def parse_resumed(self, data) -> None:
         self.dispatch("resumed")
+        if self._warm_shards:
+            # the session was restored from a snapshot, so the cache is ready already
+            self._warm_shards.clear()
+            self.call_handlers("ready")
+            self.dispatch("ready")
 
     def parse_message_create(self, data) -> None:
         channel, _ = self._get_guild_channel(data)
@@ -598,17 +914,16 @@ class ConnectionState:
 
     def parse_message_delete_bulk(self, data) -> None:
         raw = RawBulkMessageDeleteEvent(data)
-        if self._messages:
-            found_messages = [message for message in self._messages if message.id in raw.message_ids]
-        else:
-            found_messages = []
+        found_messages = []
+        if self._messages is not None:
+            for message_id in raw.message_ids:
+                message = self._messages.pop(message_id)
+                if message is not None:
+                    found_messages.append(message)
         raw.cached_messages = found_messages
         self.dispatch("raw_bulk_message_delete", raw)
         if found_messages:
             self.dispatch("bulk_message_delete", found_messages)
-            for msg in found_messages:
-                # self._messages won't be None here
-                self._messages.remove(msg)  # type: ignore
 
     def parse_message_update(self, data) -> None:
         raw = RawMessageUpdateEvent(data)
@@ -1125,9 +1440,7 @@ class ConnectionState:
 
         # do a cleanup of the messages cache
         if self._messages is not None:
-            self._messages: Optional[Deque[Message]] = deque(
-                (msg for msg in self._messages if msg.guild != guild), maxlen=self.max_messages
-            )
+            self._messages.remove_guild(guild.id)
 
         self._remove_guild(guild)
         self.dispatch("guild_remove", guild)
@@ -1505,12 +1818,14 @@ class AutoShardedConnectionState(ConnectionState):
         self._ready_task = None
 
         # dispatch the event
+        self._ready_dispatched = True
         self.call_handlers("ready")
         self.dispatch("ready")
 
     def parse_ready(self, data) -> None:
         if not hasattr(self, "_ready_state"):
             self._ready_state = asyncio.Queue()
+        self._warm_shards.discard(data["__shard_id__"])
 
         self.user = user = ClientUser(state=self, data=data["user"])
         # self._users is a list of Users, we're setting a ClientUser
@@ -1540,3 +1855,11 @@ class AutoShardedConnectionState(ConnectionState):
     def parse_resumed(self, data) -> None:
         self.dispatch("resumed")
         self.dispatch("shard_resumed", data["__shard_id__"])
+        shard_id = data["__shard_id__"]
+        if shard_id in self._warm_shards:
+            self._warm_shards.discard(shard_id)
+            # shards identifying instead dispatch ready once they're done
+            if not self._warm_shards and self._ready_task is None and not self._ready_dispatched:
+                self._ready_dispatched = True
+                self.call_handlers("ready")
+                self.dispatch("ready")
@@ -28,6 +28,7 @@ from typing import Any, Optional, TYPE_CHECKING
 from .utils import parse_time, _get_as_snowflake, _bytes_to_base64_data, MISSING
 from .enums import VoiceRegion
 from .guild import Guild
+from .cache import MemoryStore
 
 __all__ = ("Template",)
 
@@ -81,6 +82,9 @@ class _PartialTemplateState:
     async def query_members(self, **kwargs: Any):
         return []
 
+    def _create_store(self, name, guild_id=None):
+        return MemoryStore()
+
     def __getattr__(self, attr):
         raise AttributeError(f"PartialTemplateState does not support {attr!r}.")
 
@@ -0,0 +1,904 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import hashlib
+import itertools
+import logging
+import re
+import time
+import zlib
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+from aiohttp import WSMsgType, web
+
+from . import etf, utils
+
+__all__ = (
+    "MockDiscordServer",
+    "MockGatewaySession",
+    "user_payload",
+    "guild_payload",
+    "message_payload",
+)
+
+_log = logging.getLogger(__name__)
+
+RouteHandler = Callable[[web.Request, Dict[str, str], Any], Union[Any, Awaitable[Any]]]
+
+_snowflakes = itertools.count()
+
+
+def _snowflake() -> str:
+    # unique and increasing, with a timestamp close enough to now for the library's purposes
+    return str(((int(time.time() * 1000) - utils.DISCORD_EPOCH) << 22) | (next(_snowflakes) & 0x3FFFFF))
+
+
+def _timestamp() -> str:
+    return utils.utcnow().isoformat()
+
+
+def user_payload(user_id: Optional[int] = None, *, username: Optional[str] = None, bot: bool = False) -> Dict[str, Any]:
+    """Creates the payload of a user.
+
+    Parameters
+    -----------
+    user_id: Optional[:class:`int`]
+        The ID of the user. A new one is generated if this isn't given.
+    username: Optional[:class:`str`]
+        The name of the user. Defaults to one derived from the ID.
+    bot: :class:`bool`
+        Whether the user is a bot.
+    """
+    snowflake = str(user_id) if user_id is not None else _snowflake()
+    return {
+        "id": snowflake,
+        "username": username or f"user-{snowflake[-6:]}",
+        "discriminator": f"{int(snowflake) % 10000:04}",
+        "avatar": None,
+        "bot": bot,
+        "public_flags": 0,
+    }
+
+
+def guild_payload(
+    guild_id: Optional[int] = None,
+    *,
+    name: Optional[str] = None,
+    owner_id: Optional[int] = None,
+    channels: int = 1,
+    members: int = 0,
+) -> Dict[str, Any]:
+    """Creates the payload of a guild, as sent in ``GUILD_CREATE``.
+
+    Parameters
+    -----------
+    guild_id: Optional[:class:`int`]
+        The ID of the guild. A new one is generated if this isn't given.
+    name: Optional[:class:`str`]
+        The name of the guild. Defaults to one derived from the ID.
+    owner_id: Optional[:class:`int`]
+        The ID of the owner of the guild. Defaults to the first member, if any.
+    channels: :class:`int`
+        The number of text channels to create.
+    members: :class:`int`
+        The number of members to create.
+    """
+    snowflake = str(guild_id) if guild_id is not None else _snowflake()
+    member_list = [
+        {
+            "user": user_payload(),
+            "roles": [],
+            "joined_at": _timestamp(),
+            "nick": None,
+            "deaf": False,
+            "mute": False,
+        }
+        for _ in range(members)
+    ]
+    if owner_id is None and member_list:
+        owner_id = int(member_list[0]["user"]["id"])
+
+    return {
+        "id": snowflake,
+        "name": name or f"guild-{snowflake[-6:]}",
+        "owner_id": str(owner_id or 0),
+        "icon": None,
+        "region": "us-east",
+        "afk_timeout": 300,
+        "verification_level": 0,
+        "default_message_notifications": 0,
+        "explicit_content_filter": 0,
+        "mfa_level": 0,
+        "features": [],
+        "roles": [
+            {
+                "id": snowflake,
+                "name": "@everyone",
+                "color": 0,
+                "hoist": False,
+                "position": 0,
+                "permissions": "104324673",
+                "managed": False,
+                "mentionable": False,
+            }
+        ],
+        "emojis": [],
+        "stickers": [],
+        "channels": [
+            {
+                "id": _snowflake(),
+                "type": 0,
+                "guild_id": snowflake,
+                "name": f"channel-{index}",
+                "position": index,
+                "permission_overwrites": [],
+                "nsfw": False,
+                "topic": None,
+                "last_message_id": None,
+                "parent_id": None,
+                "rate_limit_per_user": 0,
+            }
+            for index in range(channels)
+        ],
+        "threads": [],
+        "members": member_list,
+        "member_count": members,
+        "presences": [],
+        "voice_states": [],
+        "stage_instances": [],
+        "large": members > 250,
+        "unavailable": False,
+        "joined_at": _timestamp(),
+        "premium_tier": 0,
+        "system_channel_flags": 0,
+        "nsfw_level": 0,
+    }
+
+
+def message_payload(
+    channel_id: Union[int, str],
+    *,
+    guild_id: Optional[Union[int, str]] = None,
+    author: Optional[Dict[str, Any]] = None,
+    content: str = "",
+    message_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Creates the payload of a message, as sent in ``MESSAGE_CREATE``.
+
+    Parameters
+    -----------
+    channel_id: Union[:class:`int`, :class:`str`]
+        The ID of the channel the message was sent in.
+    guild_id: Optional[Union[:class:`int`, :class:`str`]]
+        The ID of the guild the message was sent in, if any.
+    author: Optional[:class:`dict`]
+        The payload of the author, see :func:`user_payload`. A new user is created if this isn't given.
+    content: :class:`str`
+        The content of the message.
+    message_id: Optional[:class:`int`]
+        The ID of the message. A new one is generated if this isn't given.
+    """
+    payload: Dict[str, Any] = {
+        "id": str(message_id) if message_id is not None else _snowflake(),
+        "channel_id": str(channel_id),
+        "author": author or user_payload(),
+        "content": content,
+        "timestamp": _timestamp(),
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+    }
+    if guild_id is not None:
+        payload["guild_id"] = str(guild_id)
+    return payload
+
+
+class _Bucket:
+    __slots__ = ("remaining", "reset_at")
+
+    def __init__(self, limit: int, reset_at: float) -> None:
+        self.remaining: int = limit
+        self.reset_at: float = reset_at
+
+
+class MockGatewaySession:
+    """A gateway session opened on a :class:`MockDiscordServer`.
+
+    A session outlives the connection that identified it, so that it can be resumed.
+
+    Attributes
+    -----------
+    session_id: :class:`str`
+        The ID of the session.
+    shard_id: :class:`int`
+        The shard this session was identified as.
+    sequence: :class:`int`
+        The sequence number of the last event dispatched.
+    intents: :class:`int`
+        The intents the session was identified with.
+    identified_at: :class:`float`
+        When the session was identified, as a Unix timestamp.
+    resumes: :class:`int`
+        The number of times the session was resumed.
+    """
+
+    def __init__(self, server: MockDiscordServer, session_id: str, shard_id: int, intents: int) -> None:
+        self.server: MockDiscordServer = server
+        self.session_id: str = session_id
+        self.shard_id: int = shard_id
+        self.sequence: int = 0
+        self.intents: int = intents
+        self.identified_at: float = time.time()
+        self.resumes: int = 0
+        self._history: Deque[Tuple[int, Dict[str, Any]]] = collections.deque(maxlen=server.history_size)
+        self._connection: Optional[_GatewayConnection] = None
+
+    def __repr__(self) -> str:
+        return f"<MockGatewaySession session_id={self.session_id!r} shard_id={self.shard_id} sequence={self.sequence}>"
+
+    @property
+    def connected(self) -> bool:
+        """:class:`bool`: Whether a connection is currently attached to the session."""
+        return self._connection is not None and not self._connection.ws.closed
+
+    async def dispatch(self, event: str, data: Any) -> None:
+        """Dispatches an event to the session.
+
+        The event is kept so that it can be replayed if the session is resumed,
+        and is only sent right away if the session is connected.
+        """
+        self.sequence += 1
+        payload = {"op": 0, "t": event, "s": self.sequence, "d": data}
+        self._history.append((self.sequence, payload))
+        if self.connected:
+            await self._connection.send(payload)  # type: ignore
+
+    async def _replay(self, since: int) -> None:
+        for sequence, payload in list(self._history):
+            if sequence > since:
+                await self._connection.send(payload)  # type: ignore
+
+
+def _etf_snowflakes(value: Any, key: str = "") -> Any:
+    # over ETF Discord sends snowflakes as integers rather than strings
+    if type(value) is dict:
+        return {k: _etf_snowflakes(v, k) for k, v in value.items()}
+    if type(value) is list:
+        return [_etf_snowflakes(v, key) for v in value]
+    if type(value) is str and value.isdigit() and key != "session_id":
+        if key == "id" or key.endswith("_id") or key in ("roles", "mentions"):
+            return int(value)
+    return value
+
+
+class _GatewayConnection:
+    def __init__(self, ws: web.WebSocketResponse, compress: Optional[str], encoding: str = "json") -> None:
+        self.ws: web.WebSocketResponse = ws
+        self.compress: Optional[str] = compress
+        self.encoding: str = encoding
+        self.compressor: Optional[Any] = None
+        if compress == "zlib-stream":
+            self.compressor = zlib.compressobj()
+        elif compress == "zstd-stream":
+            self.compressor = utils.zstandard.ZstdCompressor().compressobj()
+        self.bytes_sent: int = 0
+
+    async def send(self, payload: Dict[str, Any]) -> None:
+        if self.encoding == "etf":
+            raw = etf.encode(_etf_snowflakes(payload))
+        elif self.compressor is None:
+            data = utils._to_json(payload)
+            self.bytes_sent += len(data)
+            await self.ws.send_str(data)
+            return
+        else:
+            raw = utils._to_json(payload).encode("utf-8")
+
+        if self.compressor is None:
+            self.bytes_sent += len(raw)
+            await self.ws.send_bytes(raw)
+            return
+
+        # every message ends with a flush so the client can decompress it right away,
+        # for zlib this also appends the suffix the client looks for
+        if self.compress == "zlib-stream":
+            compressed = self.compressor.compress(raw) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+        else:
+            flush = utils.zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            compressed = self.compressor.compress(raw) + self.compressor.flush(flush)
+        self.bytes_sent += len(compressed)
+        await self.ws.send_bytes(compressed)
+
+
+class MockDiscordServer:
+    """A local server speaking enough of Discord's REST and gateway protocols to
+    load test and profile the library offline.
+
+    The REST API sends rate limit headers and 429 responses the way Discord does,
+    both per bucket and globally. The gateway supports the ``json`` and ``etf`` encodings,
+    ``zlib-stream`` and ``zstd-stream`` compression, heartbeats, identifying, resuming and requesting guild members, and events can
+    be dispatched to the connected sessions from a script.
+
+    A :class:`Client` is pointed at the server through its ``api_base`` and ``gateway_url`` options.
+
+    .. versionadded:: 2.0
+
+    Examples
+    ---------
+
+    Usage ::
+
+        async with MockDiscordServer(guilds=[guild_payload(members=1000)]) as server:
+            client = discord.Client(intents=intents, api_base=server.api_base, gateway_url=server.gateway_url)
+            asyncio.create_task(client.start('token'))
+            await client.wait_until_ready()
+
+            guild = client.guilds[0]
+            events = [('MESSAGE_CREATE', message_payload(guild.text_channels[0].id, guild_id=guild.id))] * 10000
+            await server.play(events)
+
+    Parameters
+    -----------
+    host: :class:`str`
+        The host to listen on.
+    port: :class:`int`
+        The port to listen on. ``0`` picks a free one.
+    user: Optional[:class:`dict`]
+        The payload of the user the client logs in as, see :func:`user_payload`.
+    guilds: Optional[List[:class:`dict`]]
+        The payloads of the guilds the client is in, see :func:`guild_payload`.
+    shard_count: :class:`int`
+        The number of shards recommended by ``/gateway/bot``.
+    bucket_limit: :class:`int`
+        The number of requests allowed per rate limit bucket and window.
+    bucket_reset_after: :class:`float`
+        The duration of a rate limit bucket's window, in seconds.
+    global_rate_limit: Optional[:class:`int`]
+        The number of requests allowed per second across every route. ``None`` disables it.
+    heartbeat_interval: :class:`float`
+        The heartbeat interval sent in ``HELLO``, in seconds.
+    latency: :class:`float`
+        The number of seconds every REST response is delayed by.
+    history_size: :class:`int`
+        The number of events kept per session to replay when it is resumed.
+
+    Attributes
+    -----------
+    user: :class:`dict`
+        The payload of the user the client logs in as.
+    guilds: List[:class:`dict`]
+        The payloads of the guilds the client is in.
+    sessions: Dict[:class:`str`, :class:`MockGatewaySession`]
+        The gateway sessions identified so far, keyed by session ID.
+    requests: :class:`int`
+        The number of REST requests received.
+    ratelimited: :class:`int`
+        The number of REST requests answered with a 429.
+    """
+
+    API_PATH = "/api/v9"
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        user: Optional[Dict[str, Any]] = None,
+        guilds: Optional[List[Dict[str, Any]]] = None,
+        shard_count: int = 1,
+        bucket_limit: int = 5,
+        bucket_reset_after: float = 1.0,
+        global_rate_limit: Optional[int] = 50,
+        heartbeat_interval: float = 41.25,
+        latency: float = 0.0,
+        history_size: int = 1000,
+    ) -> None:
+        self.host: str = host
+        self.port: int = port
+        self.user: Dict[str, Any] = user or user_payload(bot=True)
+        self.guilds: List[Dict[str, Any]] = guilds or []
+        self.shard_count: int = shard_count
+        self.bucket_limit: int = bucket_limit
+        self.bucket_reset_after: float = bucket_reset_after
+        self.global_rate_limit: Optional[int] = global_rate_limit
+        self.heartbeat_interval: float = heartbeat_interval
+        self.latency: float = latency
+        self.history_size: int = history_size
+        self.sessions: Dict[str, MockGatewaySession] = {}
+        self.requests: int = 0
+        self.ratelimited: int = 0
+
+        self._buckets: Dict[Tuple[str, str], _Bucket] = {}
+        self._global_window: float = 0.0
+        self._global_count: int = 0
+        self._errors: Deque[Tuple[int, Optional[str]]] = collections.deque()
+        self._messages: Dict[str, Dict[str, Any]] = {}
+        self._routes: Dict[Tuple[str, str], Tuple[re.Pattern, RouteHandler]] = {}
+        self._runner: Optional[web.AppRunner] = None
+
+        self.app: web.Application = web.Application(client_max_size=1024 ** 3)
+        self.app.router.add_get("/gateway", self._gateway)
+        self.app.router.add_route("*", self.API_PATH + "/{path:.*}", self._handle)
+        self._add_default_routes()
+
+    def __repr__(self) -> str:
+        return f"<MockDiscordServer api_base={self.api_base!r} sessions={len(self.sessions)}>"
+
+    async def __aenter__(self) -> MockDiscordServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    @property
+    def api_base(self) -> str:
+        """:class:`str`: The base URL of the REST API, to pass as the ``api_base`` option of :class:`Client`."""
+        return f"http://{self.host}:{self.port}{self.API_PATH}"
+
+    @property
+    def gateway_url(self) -> str:
+        """:class:`str`: The URL of the gateway, to pass as the ``gateway_url`` option of :class:`Client`."""
+        return f"ws://{self.host}:{self.port}/gateway"
+
+    async def start(self) -> None:
+        """|coro|
+
+        Starts listening for requests.
+        """
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self.port == 0:
+            self.port = site._server.sockets[0].getsockname()[1]  # type: ignore
+
+    async def close(self) -> None:
+        """|coro|
+
+        Closes every connection and stops listening.
+        """
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # REST
+
+    def add_route(self, method: str, path: str, handler: RouteHandler) -> None:
+        """Adds or replaces a REST route. Requests to unknown routes are answered with a 404.
+
+        The handler is called with the request, the parameters of the path and the
+        JSON body, or the ``payload_json`` field of a multipart body. It returns
+        the JSON response, or a tuple of the status code and the JSON response,
+        and may be a coroutine.
+
+        Parameters
+        -----------
+        method: :class:`str`
+            The HTTP method of the route.
+        path: :class:`str`
+            The path template of the route, e.g. ``/channels/{channel_id}``.
+        handler
+            The function answering requests to the route.
+        """
+
+        pattern = re.sub(r"\\\{(\w+)\\\}", r"(?P<\1>[^/]+)", re.escape(path))
+        self._routes[(method.upper(), path)] = (re.compile(pattern), handler)
+
+    def _match(self, method: str, path: str) -> Optional[Tuple[str, Dict[str, str], RouteHandler]]:
+        best = None
+        for (route_method, template), (pattern, handler) in self._routes.items():
+            if route_method != method:
+                continue
+            match = pattern.fullmatch(path)
+            # literal routes such as /users/@me win over templated ones such as /users/{user_id}
+            if match is not None and (best is None or len(match.groupdict()) < len(best[1])):
+                best = (template, match.groupdict(), handler)
+        return best
+
+    def route(self, method: str, path: str) -> Callable[[RouteHandler], RouteHandler]:
+        """A decorator that registers its function with :meth:`add_route`."""
+
+        def decorator(handler: RouteHandler) -> RouteHandler:
+            self.add_route(method, path, handler)
+            return handler
+
+        return decorator
+
+    def inject_errors(self, status: int, count: int = 1, *, path: Optional[str] = None) -> None:
+        """Answers the next ``count`` requests with the given status code instead of handling them.
+
+        Parameters
+        -----------
+        status: :class:`int`
+            The status code to answer with, e.g. ``502``.
+        count: :class:`int`
+            The number of requests to fail.
+        path: Optional[:class:`str`]
+            Only fail requests to this path template.
+        """
+        self._errors.extend((status, path) for _ in range(count))
+
+    def _take_error(self, path: str) -> Optional[int]:
+        for index, (status, error_path) in enumerate(self._errors):
+            if error_path is None or error_path == path:
+                del self._errors[index]
+                return status
+        return None
+
+    def _json(self, data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> web.Response:
+        # passing text would add a charset to the content type, which the client doesn't expect
+        body = utils._to_json(data).encode("utf-8")
+        return web.Response(body=body, status=status, headers=headers, content_type="application/json")
+
+    def _ratelimit(
+        self, request: web.Request, path: str, params: Dict[str, str]
+    ) -> Tuple[Optional[web.Response], Dict[str, str]]:
+        now = time.time()
+
+        if self.global_rate_limit is not None:
+            if now - self._global_window >= 1.0:
+                self._global_window = now
+                self._global_count = 0
+            self._global_count += 1
+            if self._global_count > self.global_rate_limit:
+                retry_after = self._global_window + 1.0 - now
+                headers = {"X-RateLimit-Global": "true", "X-RateLimit-Scope": "global", "Retry-After": str(retry_after)}
+                body = {"message": "You are being rate limited.", "retry_after": retry_after, "global": True}
+                return self._json(body, 429, headers), {}
+
+        route = f"{request.method} {path}"
+        major = "+".join(
+            params[key] for key in ("channel_id", "guild_id", "webhook_id", "webhook_token") if key in params
+        )
+        bucket_hash = hashlib.md5(route.encode()).hexdigest()[:16]
+        bucket = self._buckets.get((bucket_hash, major))
+        if bucket is None or bucket.reset_at <= now:
+            bucket = self._buckets[(bucket_hash, major)] = _Bucket(self.bucket_limit, now + self.bucket_reset_after)
+
+        reset_after = bucket.reset_at - now
+        headers = {
+            "X-RateLimit-Bucket": bucket_hash,
+            "X-RateLimit-Limit": str(self.bucket_limit),
+            "X-RateLimit-Reset": f"{bucket.reset_at:.3f}",
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+        }
+        if bucket.remaining <= 0:
+            headers["X-RateLimit-Remaining"] = "0"
+            headers["X-RateLimit-Scope"] = "user"
+            headers["Retry-After"] = f"{reset_after:.3f}"
+            body = {"message": "You are being rate limited.", "retry_after": reset_after, "global": False}
+            return self._json(body, 429, headers), headers
+
+        bucket.remaining -= 1
+        headers["X-RateLimit-Remaining"] = str(bucket.remaining)
+        return None, headers
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        matched = self._match(request.method, "/" + request.match_info["path"])
+        if matched is None:
+            return self._json({"message": "404: Not Found", "code": 0}, 404, {"Via": "1.1 google"})
+
+        path, params, handler = matched
+        limited, headers = self._ratelimit(request, path, params)
+        # Discord's responses pass through a proxy, which the client checks for to tell them apart from Cloudflare's
+        if limited is not None:
+            self.ratelimited += 1
+            limited.headers["Via"] = "1.1 google"
+            return limited
+        headers["Via"] = "1.1 google"
+
+        status = self._take_error(path)
+        if status is not None:
+            return web.Response(text="Injected error", status=status, headers=headers)
+
+        body: Any = None
+        if request.content_type == "application/json":
+            body = await request.json(loads=utils._from_json)
+        elif request.content_type == "multipart/form-data":
+            reader = await request.multipart()
+            async for part in reader:
+                if part.name == "payload_json":  # type: ignore
+                    body = utils._from_json(await part.text())  # type: ignore
+                else:
+                    # drain the uploaded files without keeping them around
+                    while await part.read_chunk():  # type: ignore
+                        pass
+
+        result = handler(request, params, body)
+        if asyncio.iscoroutine(result):
+            result = await result
+
+        status = 200
+        if isinstance(result, tuple):
+            status, result = result
+        if result is None:
+            return web.Response(status=204, headers=headers)
+        return self._json(result, status, headers)
+
+    def _find_guild(self, guild_id: str) -> Optional[Dict[str, Any]]:
+        return utils.find(lambda g: g["id"] == guild_id, self.guilds)
+
+    def _find_channel(self, channel_id: str) -> Optional[Dict[str, Any]]:
+        for guild in self.guilds:
+            for channel in guild["channels"]:
+                if channel["id"] == channel_id:
+                    return channel
+        return None
+
+    def _add_default_routes(self) -> None:
+        not_found = (404, {"message": "404: Not Found", "code": 0})
+
+        @self.route("GET", "/gateway")
+        def get_gateway(request, params, body):
+            return {"url": self.gateway_url}
+
+        @self.route("GET", "/gateway/bot")
+        def get_bot_gateway(request, params, body):
+            return {
+                "url": self.gateway_url,
+                "shards": self.shard_count,
+                "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1},
+            }
+
+        @self.route("GET", "/users/@me")
+        def get_current_user(request, params, body):
+            return self.user
+
+        @self.route("GET", "/users/{user_id}")
+        def get_user(request, params, body):
+            return user_payload(int(params["user_id"]))
+
+        @self.route("GET", "/guilds/{guild_id}")
+        def get_guild(request, params, body):
+            guild = self._find_guild(params["guild_id"])
+            return not_found if guild is None else guild
+
+        @self.route("GET", "/channels/{channel_id}")
+        def get_channel(request, params, body):
+            channel = self._find_channel(params["channel_id"])
+            return not_found if channel is None else channel
+
+        @self.route("GET", "/channels/{channel_id}/messages")
+        def get_messages(request, params, body):
+            limit = int(request.query.get("limit", 50))
+            channel_id = params["channel_id"]
+            messages = [m for m in reversed(self._messages.values()) if m["channel_id"] == channel_id]
+            return messages[:limit]
+
+        @self.route("POST", "/channels/{channel_id}/messages")
+        def send_message(request, params, body):
+            channel = self._find_channel(params["channel_id"])
+            message = message_payload(
+                params["channel_id"],
+                guild_id=channel and channel.get("guild_id"),
+                author=self.user,
+                content=(body or {}).get("content") or "",
+            )
+            self._messages[message["id"]] = message
+            return message
+
+        @self.route("GET", "/channels/{channel_id}/messages/{message_id}")
+        def get_message(request, params, body):
+            message = self._messages.get(params["message_id"])
+            return not_found if message is None else message
+
+        @self.route("PATCH", "/channels/{channel_id}/messages/{message_id}")
+        def edit_message(request, params, body):
+            message = self._messages.get(params["message_id"])
+            if message is None:
+                return not_found
+            message.update(body or {})
+            message["edited_timestamp"] = _timestamp()
+            return message
+
+        @self.route("DELETE", "/channels/{channel_id}/messages/{message_id}")
+        def delete_message(request, params, body):
+            return not_found if self._messages.pop(params["message_id"], None) is None else None
+
+    # gateway
+
+    async def dispatch(self, event: str, data: Any, *, shard_id: Optional[int] = None) -> None:
+        """|coro|
+
+        Dispatches an event to every session, or to the sessions of a single shard.
+
+        If no shard is given and the event belongs to a guild, it is only
+        dispatched to the shard that guild belongs to.
+
+        Parameters
+        -----------
+        event: :class:`str`
+            The name of the event, e.g. ``MESSAGE_CREATE``.
+        data: :class:`dict`
+            The payload of the event.
+        shard_id: Optional[:class:`int`]
+            The shard to dispatch the event to.
+        """
+        if shard_id is None and isinstance(data, dict) and "guild_id" in data:
+            shard_id = (int(data["guild_id"]) >> 22) % self.shard_count
+
+        for session in list(self.sessions.values()):
+            if session.connected and (shard_id is None or session.shard_id == shard_id):
+                await session.dispatch(event, data)
+
+    async def play(self, events: Iterable[Tuple[str, Any]], *, rate: Optional[float] = None) -> int:
+        """|coro|
+
+        Dispatches a script of events in order with :meth:`dispatch`.
+
+        Parameters
+        -----------
+        events: Iterable[Tuple[:class:`str`, :class:`dict`]]
+            The names and payloads of the events.
+        rate: Optional[:class:`float`]
+            The number of events to dispatch per second. ``None`` dispatches them as fast as possible.
+
+        Returns
+        --------
+        :class:`int`
+            The number of events dispatched.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        count = 0
+        for event, data in events:
+            if rate is not None:
+                delay = started + count / rate - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await self.dispatch(event, data)
+            count += 1
+            if rate is None and count % 100 == 0:
+                # give the connections a chance to flush
+                await asyncio.sleep(0)
+        return count
+
+    async def reconnect(self, *, shard_id: Optional[int] = None) -> None:
+        """|coro|
+
+        Asks connected sessions to reconnect and resume, as Discord does when a gateway server restarts.
+        """
+        await self._broadcast_op(7, None, shard_id)
+
+    async def invalidate_sessions(self, *, resumable: bool = False, shard_id: Optional[int] = None) -> None:
+        """|coro|
+
+        Invalidates the connected sessions, forcing them to identify again unless ``resumable`` is ``True``.
+        """
+        await self._broadcast_op(9, resumable, shard_id)
+        if not resumable:
+            for session_id, session in list(self.sessions.items()):
+                if shard_id is None or session.shard_id == shard_id:
+                    del self.sessions[session_id]
+
+    async def _broadcast_op(self, op: int, data: Any, shard_id: Optional[int]) -> None:
+        for session in list(self.sessions.values()):
+            if session.connected and (shard_id is None or session.shard_id == shard_id):
+                await session._connection.send({"op": op, "d": data})  # type: ignore
+
+    def _shard_guilds(self, shard_id: int) -> List[Dict[str, Any]]:
+        return [g for g in self.guilds if (int(g["id"]) >> 22) % self.shard_count == shard_id]
+
+    async def _gateway(self, request: web.Request) -> web.StreamResponse:
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        compress = request.query.get("compress")
+        if compress not in ("zlib-stream", "zstd-stream") or (compress == "zstd-stream" and not utils.HAS_ZSTD):
+            compress = None
+        encoding = "etf" if request.query.get("encoding") == "etf" else "json"
+        connection = _GatewayConnection(ws, compress, encoding)
+        session: Optional[MockGatewaySession] = None
+
+        await connection.send({"op": 10, "d": {"heartbeat_interval": int(self.heartbeat_interval * 1000)}})
+        async for msg in ws:
+            if msg.type is WSMsgType.TEXT:
+                payload = utils._from_json(msg.data)
+            elif msg.type is WSMsgType.BINARY and encoding == "etf":
+                payload = etf.decode(msg.data)
+            else:
+                continue
+
+            op = payload.get("op")
+            data = payload.get("d")
+            if op == 1:
+                await connection.send({"op": 11})
+            elif op == 2:
+                shard_id = data.get("shard", [0, 1])[0]
+                session = MockGatewaySession(self, _snowflake(), shard_id, data.get("intents", 0))
+                session._connection = connection
+                self.sessions[session.session_id] = session
+                await self._identify(session)
+            elif op == 6:
+                session = self.sessions.get(data.get("session_id"))
+                if session is None:
+                    await connection.send({"op": 9, "d": False})
+                    continue
+                session._connection = connection
+                session.resumes += 1
+                await session._replay(data.get("seq") or 0)
+                await session.dispatch("RESUMED", {"_trace": ["mock-gateway"]})
+            elif op == 8 and session is not None:
+                await self._send_members(session, data)
+            # presence and voice state updates are accepted and ignored
+
+        if session is not None and session._connection is connection:
+            session._connection = None
+        return ws
+
+    async def _identify(self, session: MockGatewaySession) -> None:
+        guilds = self._shard_guilds(session.shard_id)
+        await session.dispatch(
+            "READY",
+            {
+                "v": 9,
+                "user": self.user,
+                "guilds": [{"id": g["id"], "unavailable": True} for g in guilds],
+                "session_id": session.session_id,
+                "shard": [session.shard_id, self.shard_count],
+                "application": {"id": self.user["id"], "flags": 0},
+                "_trace": ["mock-gateway"],
+            },
+        )
+        for guild in guilds:
+            await session.dispatch("GUILD_CREATE", guild)
+
+    async def _send_members(self, session: MockGatewaySession, data: Dict[str, Any]) -> None:
+        guild = self._find_guild(str(data["guild_id"]))
+        members = guild["members"] if guild is not None else []
+        user_ids = data.get("user_ids")
+        if user_ids:
+            wanted = {str(user_id) for user_id in user_ids}
+            members = [m for m in members if m["user"]["id"] in wanted]
+        elif data.get("query"):
+            query = data["query"].lower()
+            members = [m for m in members if m["user"]["username"].lower().startswith(query)]
+        if data.get("limit"):
+            members = members[: data["limit"]]
+
+        chunks = [members[i : i + 1000] for i in range(0, len(members), 1000)] or [[]]
+        for index, chunk in enumerate(chunks):
+            payload = {
+                "guild_id": str(data["guild_id"]),
+                "members": chunk,
+                "chunk_index": index,
+                "chunk_count": len(chunks),
+            }
+            if data.get("nonce") is not None:
+                payload["nonce"] = data["nonce"]
+            await session.dispatch("GUILD_MEMBERS_CHUNK", payload)
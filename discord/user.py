@@ -24,6 +24,7 @@ DEALINGS IN THE SOFTWARE.
 
 from __future__ import annotations
 
+import sys
 from typing import Any, Dict, List, Optional, Type, TypeVar, TYPE_CHECKING
 
 import discord.abc
@@ -111,7 +112,8 @@ class BaseUser(_UserTag):
     def _update(self, data: UserPayload) -> None:
         self.name = data["username"]
         self.id = int(data["id"])
-        self.discriminator = data["discriminator"]
+        # there are only 10,000 discriminators, shared by the users that have them
+        self.discriminator = sys.intern(data["discriminator"])
         self._avatar = data["avatar"]
         self._banner = data.get("banner", None)
         self._accent_colour = data.get("accent_color", None)
@@ -448,7 +450,7 @@ class User(BaseUser, discord.abc.Messageable):
     def __del__(self) -> None:
         try:
             if self._stored:
-                self._state.deref_user(self.id)
+                self._state.deref_user(self)
         except Exception:
             pass
 
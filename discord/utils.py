@@ -53,6 +53,7 @@ from base64 import b64encode
 from bisect import bisect_left
 import datetime
 import functools
+import io
 from inspect import isawaitable as _isawaitable, signature as _signature
 from operator import attrgetter
 import json
@@ -70,6 +71,13 @@ except ModuleNotFoundError:
 else:
     HAS_ORJSON = True
 
+try:
+    import zstandard
+except ModuleNotFoundError:
+    HAS_ZSTD = False
+else:
+    HAS_ZSTD = True
+
 
 __all__ = (
     "oauth_url",
@@ -838,6 +846,29 @@ async def _achunk(iterator: AsyncIterator[T], max_size: int) -> AsyncIterator[Li
         yield ret
 
 
+async def _save_chunks(chunks: AsyncIterator[bytes], fp: Any, *, seek_begin: bool = True) -> int:
+    # writes each chunk as it arrives, so the whole download is never held in memory
+    written = 0
+    if isinstance(fp, io.BufferedIOBase):
+        async for chunk in chunks:
+            written += fp.write(chunk)
+        if seek_begin:
+            fp.seek(0)
+    else:
+        # the file is only opened once the download has started, so that a failed
+        # request doesn't truncate an existing file or leave an empty one behind
+        chunks = chunks.__aiter__()
+        try:
+            first = await chunks.__anext__()
+        except StopAsyncIteration:
+            first = b""
+        with open(fp, "wb") as f:
+            written += f.write(first)
+            async for chunk in chunks:
+                written += f.write(chunk)
+    return written
+
+
 @overload
 def as_chunks(iterator: Iterator[T], max_size: int) -> Iterator[List[T]]:
     ...
@@ -42,6 +42,7 @@ from ..enums import try_enum, WebhookType
 from ..user import BaseUser, User
 from ..asset import Asset
 from ..http import Route
+from ..ratelimits import BucketStore
 from ..mixins import Hashable
 from ..channel import PartialMessageable
 
@@ -76,26 +77,36 @@ MISSING = utils.MISSING
 
 
 class AsyncDeferredLock:
-    def __init__(self, lock: asyncio.Lock):
-        self.lock = lock
+    def __init__(self, locks: BucketStore[Any, asyncio.Lock], bucket: Any):
+        # the lock is held in the store from now on, so that it isn't evicted while waited on or locked
+        self.locks = locks
+        self.bucket = bucket
+        self.lock = locks.hold(bucket)
         self.delta: Optional[float] = None
 
     async def __aenter__(self):
-        await self.lock.acquire()
+        try:
+            await self.lock.acquire()
+        except BaseException:
+            self.locks.release(self.bucket)
+            raise
         return self
 
     def delay_by(self, delta: float) -> None:
         self.delta = delta
 
     async def __aexit__(self, type, value, traceback):
-        if self.delta:
-            await asyncio.sleep(self.delta)
-        self.lock.release()
+        try:
+            if self.delta:
+                await asyncio.sleep(self.delta)
+        finally:
+            self.lock.release()
+            self.locks.release(self.bucket)
 
 
 class AsyncWebhookAdapter:
     def __init__(self):
-        self._locks: Dict[Any, asyncio.Lock] = {}
+        self._locks: BucketStore[Any, asyncio.Lock] = BucketStore(asyncio.Lock)
 
     async def request(
         self,
@@ -114,11 +125,6 @@ class AsyncWebhookAdapter:
         to_send: Optional[Union[str, aiohttp.FormData]] = None
         bucket = (route.webhook_id, route.webhook_token)
 
-        try:
-            lock = self._locks[bucket]
-        except KeyError:
-            self._locks[bucket] = lock = asyncio.Lock()
-
         if payload is not None:
             headers["Content-Type"] = "application/json"
             to_send = utils._to_json(payload)
@@ -135,7 +141,7 @@ class AsyncWebhookAdapter:
         url = route.url
         webhook_id = route.webhook_id
 
-        async with AsyncDeferredLock(lock) as lock:
+        async with AsyncDeferredLock(self._locks, bucket) as lock:
             for attempt in range(5):
                 for file in files:
                     file.reset(seek=attempt)
@@ -497,8 +503,8 @@ def handle_message_parameters(
             multipart.append(
                 {
                     "name": "file",
-                    "value": file.fp,
-                    "filename": file.filename,
+                    "value": file,
+                    "filename": file.filename or "file",
                     "content_type": "application/octet-stream",
                 }
             )
@@ -507,8 +513,8 @@ def handle_message_parameters(
                 multipart.append(
                     {
                         "name": f"file{index}",
-                        "value": file.fp,
-                        "filename": file.filename,
+                        "value": file,
+                        "filename": file.filename or f"file{index}",
                         "content_type": "application/octet-stream",
                     }
                 )
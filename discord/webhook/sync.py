@@ -43,6 +43,7 @@ from .. import utils
 from ..errors import InvalidArgument, HTTPException, Forbidden, NotFound, DiscordServerError
 from ..message import Message
 from ..http import Route
+from ..ratelimits import BucketStore
 from ..channel import PartialMessageable
 
 from .async_ import BaseWebhook, handle_message_parameters, _WebhookState
@@ -72,26 +73,44 @@ MISSING = utils.MISSING
 
 
 class DeferredLock:
-    def __init__(self, lock: threading.Lock):
-        self.lock = lock
+    def __init__(self, locks: BucketStore[Any, threading.Lock], bucket: Any, guard: threading.Lock):
+        # the lock is held in the store from now on, so that it isn't evicted while waited on or locked
+        self.locks = locks
+        self.bucket = bucket
+        self.guard = guard
+        with guard:
+            self.lock = locks.hold(bucket)
         self.delta: Optional[float] = None
 
     def __enter__(self):
-        self.lock.acquire()
+        try:
+            self.lock.acquire()
+        except BaseException:
+            self._release()
+            raise
         return self
 
     def delay_by(self, delta: float) -> None:
         self.delta = delta
 
     def __exit__(self, type, value, traceback):
-        if self.delta:
-            time.sleep(self.delta)
-        self.lock.release()
+        try:
+            if self.delta:
+                time.sleep(self.delta)
+        finally:
+            self.lock.release()
+            self._release()
+
+    def _release(self) -> None:
+        with self.guard:
+            self.locks.release(self.bucket)
 
 
 class WebhookAdapter:
     def __init__(self):
-        self._locks: Dict[Any, threading.Lock] = {}
+        self._locks: BucketStore[Any, threading.Lock] = BucketStore(threading.Lock)
+        # the store is shared by every thread using the adapter
+        self._locks_guard: threading.Lock = threading.Lock()
 
     def request(
         self,
@@ -107,14 +126,12 @@ class WebhookAdapter:
     ) -> Any:
         headers: Dict[str, str] = {}
         files = files or []
+        if any(file.fp is None for file in files):
+            raise InvalidArgument("Files from asynchronous iterables cannot be uploaded with a SyncWebhook")
+
         to_send: Optional[Union[str, Dict[str, Any]]] = None
         bucket = (route.webhook_id, route.webhook_token)
 
-        try:
-            lock = self._locks[bucket]
-        except KeyError:
-            self._locks[bucket] = lock = threading.Lock()
-
         if payload is not None:
             headers["Content-Type"] = "application/json"
             to_send = utils._to_json(payload)
@@ -132,7 +149,7 @@ class WebhookAdapter:
         url = route.url
         webhook_id = route.webhook_id
 
-        with DeferredLock(lock) as lock:
+        with DeferredLock(self._locks, bucket, self._locks_guard) as lock:
             for attempt in range(5):
                 for file in files:
                     file.reset(seek=attempt)
@@ -144,7 +161,7 @@ class WebhookAdapter:
                         if name == "payload_json":
                             to_send = {"payload_json": p["value"]}
                         else:
-                            file_data[name] = (p["filename"], p["value"], p["content_type"])
+                            file_data[name] = (p["filename"], p["value"].fp, p["content_type"])
 
                 try:
                     with session.request(
@@ -41,6 +41,7 @@ extras_require = {
     ],
     "speed": [
         "orjson>=3.5.4",
+        "zstandard>=0.15.0",
     ],
 }
 
@@ -0,0 +1,87 @@
+import gc
+
+import discord
+from discord.cache import LRUStore
+
+
+def user_payload(user_id):
+    return {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0001", "avatar": None}
+
+
+def make_state(**options):
+    client = discord.Client(intents=discord.Intents.all(), **options)
+    return client._connection
+
+
+def test_evicted_user_does_not_remove_newer_copy():
+    state = make_state(cache_stores={"users": lambda _: LRUStore(2)})
+
+    first = state.store_user(user_payload(1))
+    state.store_user(user_payload(2))
+    state.store_user(user_payload(3))
+    # still referenced here, but evicted from the cache
+    assert state.get_user(1) is None
+
+    second = state.store_user(user_payload(1))
+    assert second is not first
+
+    del first
+    gc.collect()
+    assert state.get_user(1) is second
+
+
+def make_guild(state, guild_id=1):
+    data = {"id": str(guild_id), "name": "guild", "members": [], "roles": [], "channels": []}
+    guild = discord.Guild(data=data, state=state)
+    state._add_guild(guild)
+    return guild
+
+
+def member_payload(user_id):
+    return {"user": user_payload(user_id), "roles": [], "joined_at": None}
+
+
+def test_users_of_members_are_pinned():
+    state = make_state(max_users=2)
+    guild = make_guild(state)
+    users = state._users
+
+    member = discord.Member(data=member_payload(1), guild=guild, state=state)
+    user = member._user
+    del member
+    member = discord.Member(data=member_payload(1), guild=guild, state=state)
+    copy = discord.Member._copy(member)
+    for user_id in range(2, 6):
+        state.store_user(user_payload(user_id))
+
+    assert users.pinned == 1
+    assert len(users) == 3
+    assert state.get_user(1) is user
+
+    del member
+    gc.collect()
+    # the copy still refers to the user
+    assert users.pinned == 1
+
+    del copy
+    gc.collect()
+    assert users.pinned == 0
+    assert len(users) == 2
+    assert state.get_user(1) is None
+
+
+def test_unpickled_members_pin_their_user():
+    state = make_state(max_users=1)
+    guild = make_guild(state)
+
+    member = discord.Member(data=member_payload(1), guild=guild, state=state)
+    loaded = state._load_model(state._dump_model(member))
+    del member
+    gc.collect()
+    state.store_user(user_payload(2))
+    state.store_user(user_payload(3))
+
+    assert state.get_user(1) is loaded._user
+    del loaded
+    gc.collect()
+    assert state._user_refs == {}
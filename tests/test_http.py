@@ -0,0 +1,145 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from discord.http import HTTPClient, Route
+from discord.pool import ConnectionPoolConfig
+
+
+async def start_server(handler):
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+async def login(server, **options):
+    http = HTTPClient(api_base=str(server.make_url("/api/v10")), **options)
+    await http.static_login("token")
+    return http
+
+
+def test_interaction_routes_skip_the_global_rate_limit():
+    async def handler(request):
+        return web.json_response({"id": "1"})
+
+    async def main():
+        server = await start_server(handler)
+        http = await login(server)
+        priorities = []
+        acquire_global = http.ratelimiter.acquire_global
+
+        async def record(priority=0):
+            priorities.append(priority)
+            await acquire_global(priority)
+
+        http.ratelimiter.acquire_global = record
+        try:
+            route = Route(
+                "POST",
+                "/interactions/{interaction_id}/{interaction_token}/callback",
+                interaction_id=1,
+                interaction_token="abc",
+            )
+            await http.request(route, json={"type": 1})
+            assert priorities == []
+
+            await http.request(Route("GET", "/channels/{channel_id}", channel_id=1), priority=5)
+            assert priorities == [5]
+        finally:
+            await http.close()
+            await server.close()
+
+    asyncio.run(main())
+
+
+def test_coalesced_cached_requests_count_one_miss():
+    sent = []
+
+    async def handler(request):
+        sent.append(request.path)
+        await asyncio.sleep(0.05)
+        return web.json_response({"id": "1"})
+
+    async def main():
+        server = await start_server(handler)
+        http = await login(server, coalesce_requests=True, response_cache_ttls={"/channels/{channel_id}": 60})
+        sent.clear()
+        try:
+            route = Route("GET", "/channels/{channel_id}", channel_id=1)
+            await asyncio.gather(*(http.request(route) for _ in range(10)))
+            cache = http.response_cache
+            assert len(sent) == 1
+            assert (cache.hits, cache.misses) == (0, 1)
+
+            await http.request(route)
+            assert len(sent) == 1
+            assert (cache.hits, cache.misses) == (1, 1)
+        finally:
+            await http.close()
+            await server.close()
+
+    asyncio.run(main())
+
+
+def test_cancelled_fetch_does_not_discard_concurrent_fetch():
+    async def handler(request):
+        await asyncio.sleep(0.05)
+        return web.json_response({"id": "1"})
+
+    async def main():
+        server = await start_server(handler)
+        http = await login(server, response_cache_ttls={"/channels/{channel_id}": 60})
+        try:
+            route = Route("GET", "/channels/{channel_id}", channel_id=1)
+            cancelled = asyncio.ensure_future(http.request(route))
+            fetch = asyncio.ensure_future(http.request(route))
+            await asyncio.sleep(0.01)
+            cancelled.cancel()
+            await fetch
+
+            cache = http.response_cache
+            assert cache.misses == 2
+            assert len(cache) == 1
+        finally:
+            await http.close()
+            await server.close()
+
+    asyncio.run(main())
+
+
+def test_pool_stats_count_active_and_waiting_requests():
+    release = asyncio.Event()
+
+    async def handler(request):
+        if request.path.endswith("/slow"):
+            await release.wait()
+        return web.json_response({"id": "1"})
+
+    async def main():
+        server = await start_server(handler)
+        http = await login(server, connection_pool=ConnectionPoolConfig(limit=1))
+        try:
+            # separate rate limit buckets, so that the requests only wait on the pool
+            routes = [Route("GET", "/channels/{channel_id}/slow", channel_id=i) for i in range(3)]
+            requests = [asyncio.ensure_future(http.request(route)) for route in routes]
+            await asyncio.sleep(0.05)
+            stats = http.pool_stats()
+            assert (stats.active, stats.waiting) == (1, 2)
+
+            requests[-1].cancel()
+            await asyncio.sleep(0.01)
+            assert http.pool_stats().waiting == 1
+
+            release.set()
+            await asyncio.gather(*requests[:-1])
+            stats = http.pool_stats()
+            assert (stats.active, stats.waiting, stats.idle) == (0, 0, 1)
+        finally:
+            release.set()
+            await http.close()
+            await server.close()
+
+    asyncio.run(main())
@@ -0,0 +1,42 @@
+import asyncio
+import threading
+
+from discord.ratelimits import BucketStore
+from discord.webhook.async_ import AsyncDeferredLock
+from discord.webhook.sync import DeferredLock
+
+
+def test_held_entries_are_not_evicted():
+    store = BucketStore(object, max_size=2, ttl=0)
+    held = store.hold("a")
+    store.get_or_create("b")
+    store.get_or_create("c")
+    assert store.get("a") is held
+
+    store.release("a")
+    store.get_or_create("d")
+    assert "a" not in store
+
+
+def test_webhook_locks_are_held_while_in_use():
+    async def main():
+        locks = BucketStore(asyncio.Lock, max_size=1, ttl=0)
+        async with AsyncDeferredLock(locks, "a") as deferred:
+            locks.get_or_create("b")
+            assert locks.get("a") is deferred.lock
+
+        locks.get_or_create("c")
+        assert "a" not in locks
+
+    asyncio.run(main())
+
+
+def test_sync_webhook_locks_are_held_while_in_use():
+    locks = BucketStore(threading.Lock, max_size=1, ttl=0)
+    guard = threading.Lock()
+    with DeferredLock(locks, "a", guard) as deferred:
+        locks.get_or_create("b")
+        assert locks.get("a") is deferred.lock
+
+    locks.get_or_create("c")
+    assert "a" not in locks